@@ -0,0 +1,55 @@
+# archive_worker.py - Moves old sent campaigns, their leads and history into campaign_archive
+import argparse
+import asyncio
+from datetime import datetime
+
+from services.archive_service import ArchiveService
+
+class ArchiveWorker:
+    def __init__(self, args):
+        self.args = args
+        self.service = ArchiveService()
+
+    async def run_once(self):
+        if self.args.restore:
+            print(f"[{datetime.utcnow().isoformat()}] Restoring campaign {self.args.restore}.")
+            stats = await self.service.restore_campaign(self.args.restore, self.args.user_id)
+            print(f"[{datetime.utcnow().isoformat()}] Restore completed: {stats if stats is not None else 'not archived'}")
+            return
+        print(f"[{datetime.utcnow().isoformat()}] Campaign archival started{' (dry run)' if self.args.dry_run else ''}.")
+        stats = await self.service.archive_old_campaigns(
+            older_than_days=self.args.older_than_days,
+            batch_size=self.args.batch_size,
+            dry_run=self.args.dry_run
+        )
+        print(
+            f"[{datetime.utcnow().isoformat()}] Campaign archival completed: "
+            f"{stats['campaigns']} campaigns, {stats['leads']} leads, {stats['revisions']} revisions"
+        )
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Archive worker error: {str(e)}")
+            if not self.args.interval or self.args.restore or self.args.dry_run:
+                return
+            await asyncio.sleep(self.args.interval * 60)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Archive old sent campaigns, or restore one")
+    parser.add_argument("--older-than-days", type=int, default=None,
+                        help="Archive campaigns created before this many days ago (defaults to ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Campaigns selected per round trip")
+    parser.add_argument("--dry-run", action="store_true", help="Count campaigns due for archival without moving them")
+    parser.add_argument("--restore", metavar="CAMPAIGN_ID", help="Restore this campaign instead of archiving (needs --user-id)")
+    parser.add_argument("--user-id", help="Owner of the campaign to restore")
+    parser.add_argument("--interval", type=float, default=0, help="Minutes between cycles; 0 runs once")
+    args = parser.parse_args(argv)
+    if args.restore and not args.user_id:
+        parser.error("--restore needs --user-id")
+    return args
+
+if __name__ == "__main__":
+    asyncio.run(ArchiveWorker(parse_args()).run())
@@ -0,0 +1,29 @@
+# backfill_content_analytics.py - Stores preview and content analytics on existing campaigns
+import argparse
+import asyncio
+from datetime import datetime
+
+from services.campaign_service import CampaignService
+
+class AnalyticsBackfill:
+    def __init__(self, args):
+        self.args = args
+        self.service = CampaignService()
+
+    async def run(self):
+        print(f"[{datetime.utcnow().isoformat()}] Content analytics backfill started.")
+        stats = await self.service.backfill_content_analytics(batch_size=self.args.batch_size, force=self.args.force)
+        print(
+            f"[{datetime.utcnow().isoformat()}] Content analytics backfill completed: "
+            f"{stats['scanned']} scanned, {stats['updated']} updated"
+        )
+        return stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute stored content analytics for campaigns that lack current ones")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents read and written per round trip")
+    parser.add_argument("--force", action="store_true", help="Recompute every campaign, not just outdated ones")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(AnalyticsBackfill(parse_args()).run())
@@ -0,0 +1,13 @@
+# benchmarks/__init__.py
+import os
+
+# Settings requires these at import time; benchmarks never talk to Google
+for _key, _value in {
+    "MONGO_URL": "mongodb://localhost:27017",
+    "DB_NAME": "marketing_bench",
+    "GOOGLE_CLIENT_ID": "bench",
+    "GOOGLE_CLIENT_SECRET": "bench",
+    "GOOGLE_REDIRECT_URI": "http://localhost/callback",
+    "FRONTEND_URL": "http://localhost:3000",
+}.items():
+    os.environ.setdefault(_key, _value)
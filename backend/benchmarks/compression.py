@@ -0,0 +1,146 @@
+# benchmarks/compression.py - CPU cost vs. bytes saved for response compression
+"""
+Serializes representative API payloads (a campaign with long generated
+content, lead list pages, the dashboard) exactly as the routes do, then
+compresses each one with gzip and brotli at several levels and reports
+size, ratio, time per response and bytes saved per millisecond of CPU.
+Needs no database.
+
+Usage (from the backend directory):
+    python -m benchmarks.compression --gzip-levels 1,6,9 --brotli-qualities 1,4,6,11
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from utils.compression import compress
+from utils.serialization import dumps_json, dumps_msgpack
+
+WORDS = (
+    "campaign launch offer audience growth brand customers product email social "
+    "engagement discount limited time exclusive update newsletter subscribe team "
+    "results insights strategy content marketing conversion value new today"
+).split()
+
+
+def paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def campaign(rng: random.Random, content_words: int) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    content = "\n\n".join(paragraph(rng, 60) for _ in range(max(1, content_words // 60)))
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "title": "Email Campaign",
+        "campaign_type": "email",
+        "content": content,
+        "preview": content[:200],
+        "style": "professional",
+        "status": "sent",
+        "created_at": now,
+        "scheduled_at": None,
+        "performance": {"sent_count": rng.randint(10, 5000), "open_count": rng.randint(0, 500)}
+    }
+
+
+def lead(rng: random.Random, index: int) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "campaign_id": str(uuid.uuid4()),
+        "email": f"lead{index}@example.test",
+        "name": f"Lead {index}",
+        "status": rng.choice(["cold", "warm", "hot"]),
+        "interaction_type": rng.choice(["email_sent", "opened", "clicked", "replied"]),
+        "created_at": datetime.utcnow() - timedelta(minutes=index)
+    }
+
+
+def envelope(data: Any, message: str) -> Dict[str, Any]:
+    return {"success": True, "message": message, "timestamp": datetime.utcnow().isoformat(), "data": data}
+
+
+def payloads(seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    return {
+        "campaign_detail": envelope(campaign(rng, 1200), "Campaign fetched successfully"),
+        "leads_page_50": envelope([lead(rng, i) for i in range(50)], "Leads fetched successfully"),
+        "leads_page_200": envelope([lead(rng, i) for i in range(200)], "Leads fetched successfully"),
+        "dashboard": {
+            "campaigns_count": 120, "leads_count": 48000, "total_sent": 91000,
+            "leads_by_status": {"cold": 30000, "warm": 12000, "hot": 6000},
+            "recent_campaigns": [{**campaign(rng, 60), "content": None} for _ in range(5)]
+        }
+    }
+
+
+def measure(body: bytes, encoding: str, level: int, repeat: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    compressed = b""
+    for _ in range(repeat):
+        started = time.process_time()
+        compressed = compress(body, encoding, level)
+        timings.append(time.process_time() - started)
+    cpu_ms = statistics.median(timings) * 1000
+    saved = len(body) - len(compressed)
+    return {
+        "encoding": encoding,
+        "level": level,
+        "bytes": len(compressed),
+        "ratio": round(len(compressed) / len(body), 3) if body else 1.0,
+        "cpu_ms": round(cpu_ms, 3),
+        "saved_bytes": saved,
+        "saved_per_cpu_ms": round(saved / cpu_ms) if cpu_ms else None
+    }
+
+
+def run(args) -> List[Dict[str, Any]]:
+    results = []
+    for name, payload in payloads(args.seed).items():
+        for format_name, encoder in (("json", dumps_json), ("msgpack", dumps_msgpack)):
+            body = encoder(payload)
+            print(f"\n{name} ({format_name}): {len(body)} bytes uncompressed")
+            print(f"{'encoding':>9} {'level':>5} {'bytes':>8} {'ratio':>6} {'cpu ms':>8} {'saved/ms':>9}")
+            levels = [("gzip", level) for level in args.gzip_levels] + [("br", level) for level in args.brotli_qualities]
+            for encoding, level in levels:
+                result = measure(body, encoding, level, args.repeat)
+                results.append({"payload": name, "format": format_name, "uncompressed": len(body), **result})
+                print(f"{encoding:>9} {level:>5} {result['bytes']:>8} {result['ratio']:>6} "
+                      f"{result['cpu_ms']:>8} {result['saved_per_cpu_ms'] or '-':>9}")
+    return results
+
+
+def parse_levels(value: str) -> List[int]:
+    return [int(level) for level in value.split(",") if level.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Response compression CPU/size benchmark")
+    parser.add_argument("--gzip-levels", type=parse_levels, default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=parse_levels, default=[1, 4, 6, 11])
+    parser.add_argument("--repeat", type=int, default=20, help="Compressions per measurement (median is reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = run(args)
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
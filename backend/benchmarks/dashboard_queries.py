@@ -0,0 +1,144 @@
+# benchmarks/dashboard_queries.py - Query-count check for the dashboard read path
+"""
+Seeds a scratch MongoDB database, then records every command the server
+receives while StatsService builds the dashboard and campaign statistics
+from the user_stats counters. Fails when either path issues more than
+--max-commands commands. The figures themselves and the covered lead
+aggregation are checked in tests/test_stats_service.py.
+
+Usage (from the backend directory):
+    python -m benchmarks.dashboard_queries --campaigns 200 --leads 50000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+import config.database as database_module
+from services.stats_service import StatsService
+
+# Commands issued by drivers for housekeeping rather than by the code under test
+IGNORED_COMMANDS = {"isMaster", "hello", "ping", "endSessions", "saslStart", "saslContinue"}
+
+
+class CommandRecorder(monitoring.CommandListener):
+    """Collects the names of commands sent to the server while enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.commands: List[str] = []
+
+    def started(self, event):
+        if self.enabled and event.command_name not in IGNORED_COMMANDS:
+            self.commands.append(event.command_name)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(database, user_id: str, campaigns: int, leads: int):
+    now = datetime.utcnow()
+    rng = random.Random(7)
+    campaign_docs = []
+    for i in range(campaigns):
+        status = rng.choice(["draft", "sent", "scheduled"])
+        campaign_docs.append({
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "title": f"Campaign {i}",
+            "campaign_type": rng.choice(["email", "social_media", "direct_message"]),
+            "content": "Benchmark content",
+            "status": status,
+            "created_at": now - timedelta(minutes=i),
+            "performance": {"sent_count": rng.randint(1, 500)} if status == "sent" else {}
+        })
+    if campaign_docs:
+        await database.campaigns.insert_many(campaign_docs)
+
+    for start in range(0, leads, 5000):
+        await database.leads.insert_many([
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "campaign_id": rng.choice(campaign_docs)["id"] if campaign_docs else None,
+                "email": f"lead{i}@example.test",
+                "status": rng.choice(["cold", "warm", "hot"]),
+                "created_at": now
+            }
+            for i in range(start, min(start + 5000, leads))
+        ])
+
+
+async def run_check(args) -> int:
+    recorder = CommandRecorder()
+    client = AsyncIOMotorClient(args.mongo_url, event_listeners=[recorder])
+    db_name = f"marketing_bench_{uuid.uuid4().hex[:8]}"
+    database = client[db_name]
+    failures = []
+    try:
+        # create_indexes works on the configured database, so point it at the scratch one
+        original_db = database_module.db
+        database_module.db = database
+        try:
+            await database_module.create_indexes()
+        finally:
+            database_module.db = original_db
+
+        user_id = f"bench-{uuid.uuid4()}"
+        await seed(database, user_id, args.campaigns, args.leads)
+        service = StatsService(database)
+        # Seeding bypasses the write paths, so build the counters the way reconciliation would
+        await service.rebuild_user_stats(user_id)
+
+        for name, call in (
+            ("dashboard", lambda: service.get_dashboard(user_id)),
+            ("campaign_stats", lambda: service.get_campaign_stats(user_id))
+        ):
+            recorder.commands = []
+            recorder.enabled = True
+            started = time.perf_counter()
+            await call()
+            elapsed = time.perf_counter() - started
+            recorder.enabled = False
+            print(f"{name:>15}: {len(recorder.commands)} command(s) {recorder.commands} in {elapsed * 1000:.1f}ms")
+            if len(recorder.commands) > args.max_commands:
+                failures.append(f"{name} issued {len(recorder.commands)} commands (limit {args.max_commands})")
+    finally:
+        if not args.keep_db:
+            await client.drop_database(db_name)
+        client.close()
+
+    for failure in failures:
+        print(f"Regression: {failure}")
+    return 1 if failures else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard query-count check")
+    parser.add_argument("--campaigns", type=int, default=200, help="Campaigns to seed")
+    parser.add_argument("--leads", type=int, default=50000, help="Leads to seed")
+    parser.add_argument("--max-commands", type=int, default=2,
+                        help="Exit non-zero if a stats call sends more commands than this")
+    parser.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--keep-db", action="store_true", help="Do not drop the scratch database afterwards")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    return asyncio.run(run_check(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# benchmarks/email_throughput.py - Offline send-path benchmark
+"""
+Drives EmailService.send_campaign_emails against a local SMTP sink and a
+scratch MongoDB database, reporting messages/sec, event-loop lag and
+database writes per message.
+
+Usage (from the backend directory):
+    python -m benchmarks.email_throughput --sizes 10,1000,100000 --latency 0.005 --failure-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from services.email_service import EmailService
+from .smtp_sink import SMTPSink
+
+WRITE_METHODS = {
+    "insert_one", "insert_many", "update_one", "update_many", "replace_one",
+    "delete_one", "delete_many", "bulk_write", "find_one_and_update",
+    "find_one_and_replace", "find_one_and_delete"
+}
+
+
+class CountingCollection:
+    """Collection proxy that counts write round trips"""
+
+    def __init__(self, collection, counter: Counter):
+        self._collection = collection
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name not in WRITE_METHODS:
+            return attr
+
+        async def counted(*args, **kwargs):
+            self._counter[name] += 1
+            return await attr(*args, **kwargs)
+
+        return counted
+
+
+class CountingDatabase:
+    """Database proxy handing out CountingCollection instances"""
+
+    def __init__(self, database):
+        self._database = database
+        self.writes = Counter()
+
+    def __getattr__(self, name):
+        return CountingCollection(getattr(self._database, name), self.writes)
+
+    def __getitem__(self, name):
+        return CountingCollection(self._database[name], self.writes)
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up a periodic timer"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"max_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0}
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "mean_ms": round(statistics.mean(ordered) * 1000, 2)
+        }
+
+
+def synthetic_recipients(count: int) -> List[str]:
+    return [f"bench.user{i}@example.test" for i in range(count)]
+
+
+async def run_once(size: int, sink: SMTPSink, database) -> Dict[str, Any]:
+    counting_db = CountingDatabase(database)
+    service = EmailService(database=counting_db)
+    service.smtp_server = sink.host
+    service.smtp_port = sink.port
+    service.smtp_use_tls = False
+    service.sender_email = "bench@example.test"
+    service.sender_password = "bench"
+
+    user_id = f"bench-{uuid.uuid4()}"
+    campaign = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "title": "Benchmark Campaign",
+        "campaign_type": "email",
+        "content": "Hello from the benchmark.\n" * 40,
+        "status": "draft",
+    }
+    await database.campaigns.insert_one(dict(campaign))
+
+    sink_before = sink.stats.messages
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    result = await service.send_campaign_emails(campaign, synthetic_recipients(size), user_id)
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    total_writes = sum(counting_db.writes.values())
+    return {
+        "recipients": size,
+        "sent": result.get("sent_count", 0),
+        "failed": result.get("failed_count", 0),
+        "delivered_to_sink": sink.stats.messages - sink_before,
+        "seconds": round(elapsed, 3),
+        "messages_per_sec": round(size / elapsed, 1) if elapsed else 0.0,
+        "loop_lag": monitor.summary(),
+        "db_writes": dict(counting_db.writes),
+        "db_writes_per_message": round(total_writes / size, 3) if size else 0.0
+    }
+
+
+async def run_benchmark(args) -> List[Dict[str, Any]]:
+    client = AsyncIOMotorClient(args.mongo_url)
+    db_name = f"marketing_bench_{uuid.uuid4().hex[:8]}"
+    database = client[db_name]
+    results = []
+    try:
+        with SMTPSink(
+            latency=args.latency,
+            failure_rate=args.failure_rate,
+            max_connections=args.max_connections,
+            seed=args.seed
+        ) as sink:
+            for size in args.sizes:
+                results.append(await run_once(size, sink, database))
+    finally:
+        if not args.keep_db:
+            await client.drop_database(db_name)
+        client.close()
+    return results
+
+
+def print_report(results: List[Dict[str, Any]]):
+    header = f"{'recipients':>10} {'sent':>8} {'failed':>7} {'seconds':>9} {'msg/s':>9} {'lag max':>9} {'lag p99':>9} {'writes/msg':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['recipients']:>10} {row['sent']:>8} {row['failed']:>7} {row['seconds']:>9} "
+            f"{row['messages_per_sec']:>9} {row['loop_lag']['max_ms']:>8}ms {row['loop_lag']['p99_ms']:>8}ms "
+            f"{row['db_writes_per_message']:>10}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline email send-path benchmark")
+    parser.add_argument("--sizes", default="10,1000,100000",
+                        type=lambda value: [int(part) for part in value.split(",") if part],
+                        help="Comma-separated recipient counts to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-message sink latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability of an injected 451 per message")
+    parser.add_argument("--max-connections", type=int, default=None, help="Concurrent SMTP sessions the sink accepts")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for failure injection")
+    parser.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--keep-db", action="store_true", help="Do not drop the scratch database afterwards")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write results to this JSON file")
+    parser.add_argument("--min-rate", type=float, default=None,
+                        help="Exit non-zero if any run falls below this many messages/sec")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run_benchmark(args))
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.min_rate is not None:
+        slow = [row for row in results if row["messages_per_sec"] < args.min_rate]
+        if slow:
+            print(f"Regression: {len(slow)} run(s) below {args.min_rate} msg/s")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
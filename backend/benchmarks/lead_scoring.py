@@ -0,0 +1,108 @@
+# benchmarks/lead_scoring.py - Vectorized vs. per-lead scoring cost
+"""
+Builds synthetic lead documents shaped like the ones ScoringService reads,
+then scores all of them twice: once per document with score_lead (what a
+per-lead rescoring loop would do before its update_one) and once with the
+array conversion and single NumPy pass of ScoringService. Reports the time
+of each and fails when the two disagree on any score or status.
+Needs no database.
+
+Usage (from the backend directory):
+    python -m benchmarks.lead_scoring --leads 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+
+from services.scoring_service import ScoringService
+from utils.lead_scoring import SCORED_STATUSES, ScoringWeights, score_lead
+
+
+def lead_documents(count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    documents = []
+    for _ in range(count):
+        opens = rng.choice([0, 0, 0, 1, 1, 2, 5])
+        clicks = rng.choice([0, 0, 0, 1]) if opens else 0
+        created_at = now - timedelta(days=rng.uniform(0, 120))
+        documents.append({
+            "id": str(uuid.uuid4()),
+            "campaign_id": str(uuid.uuid4()),
+            "status": rng.choice(SCORED_STATUSES),
+            "open_count": opens,
+            "click_count": clicks,
+            "reply_count": 1 if clicks and rng.random() < 0.2 else 0,
+            "last_interaction_at": created_at + timedelta(days=rng.uniform(0, 10)) if opens else None,
+            "created_at": created_at
+        })
+    return documents
+
+
+def to_features(documents: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Same conversion ScoringService.load_features applies to its cursor"""
+    return {
+        "id": np.array([lead["id"] for lead in documents], dtype=object),
+        "status": np.array([SCORED_STATUSES.index(lead["status"]) for lead in documents], dtype=np.int8),
+        "open_count": np.array([lead["open_count"] for lead in documents], dtype=np.float64),
+        "click_count": np.array([lead["click_count"] for lead in documents], dtype=np.float64),
+        "reply_count": np.array([lead["reply_count"] for lead in documents], dtype=np.float64),
+        "last_interaction_at": np.array(
+            [lead["last_interaction_at"] or lead["created_at"] for lead in documents], dtype="datetime64[ms]"
+        )
+    }
+
+
+def run(args) -> int:
+    weights = ScoringWeights.from_settings()
+    documents = lead_documents(args.leads, args.seed)
+    now = datetime.utcnow()
+
+    started = time.perf_counter()
+    per_lead = [score_lead(lead, weights, now) for lead in documents]
+    per_lead_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    features = to_features(documents)
+    convert_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    scored = ScoringService.score_features(features, weights, np.datetime64(now, "ms"))
+    vector_seconds = time.perf_counter() - started
+
+    changed = int(np.count_nonzero(scored["status"] != features["status"]))
+    print(f"{args.leads} leads, {changed} status changes")
+    print(f"per-lead score_lead:     {per_lead_seconds * 1000:9.1f} ms")
+    print(f"array conversion:        {convert_seconds * 1000:9.1f} ms")
+    print(f"vectorized scoring pass: {vector_seconds * 1000:9.1f} ms")
+
+    mismatches = sum(
+        1 for index, result in enumerate(per_lead)
+        if abs(result["score"] - scored["score"][index]) > 0.011
+        or result["status"] != SCORED_STATUSES[scored["status"][index]]
+    )
+    if mismatches:
+        print(f"FAIL: {mismatches} leads scored differently by the two paths")
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lead scoring throughput benchmark")
+    parser.add_argument("--leads", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    return run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# benchmarks/smtp_sink.py
+import asyncio
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class SinkStats:
+    """Counters collected by the SMTP sink while it runs"""
+    connections: int = 0
+    rejected_connections: int = 0
+    messages: int = 0
+    failed_messages: int = 0
+    recipients: int = 0
+    bytes_received: int = 0
+    peak_connections: int = 0
+    active_connections: int = field(default=0, repr=False)
+
+
+class SMTPSink:
+    """Minimal in-process SMTP server that accepts and discards mail.
+
+    The sink runs its own event loop on a background thread so that callers
+    using blocking ``smtplib`` from the main loop cannot deadlock it.
+
+    - ``latency``: seconds to wait before acknowledging each message body
+    - ``failure_rate``: probability (0-1) that a message is rejected at DATA
+    - ``max_connections``: concurrent sessions allowed before replying 421
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        max_connections: Optional[int] = None,
+        seed: Optional[int] = None
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.max_connections = max_connections
+        self.stats = SinkStats()
+        self._random = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def start(self) -> "SMTPSink":
+        """Start the sink on a background thread and wait until it is bound"""
+        self._thread = threading.Thread(target=self._run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        """Stop the sink and join its thread"""
+        if self._loop and self._server:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "SMTPSink":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle_session, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        await self._server.wait_closed()
+        sessions = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in sessions:
+            task.cancel()
+        await asyncio.gather(*sessions, return_exceptions=True)
+
+    async def _handle_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        stats = self.stats
+        if self.max_connections is not None and stats.active_connections >= self.max_connections:
+            stats.rejected_connections += 1
+            await self._reply(writer, "421 4.7.0 Too many connections, try again later")
+            writer.close()
+            return
+
+        stats.connections += 1
+        stats.active_connections += 1
+        stats.peak_connections = max(stats.peak_connections, stats.active_connections)
+        try:
+            await self._reply(writer, "220 smtp-sink ESMTP ready")
+            await self._converse(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            stats.active_connections -= 1
+            writer.close()
+
+    async def _converse(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command[:4].upper()
+
+            if verb == "EHLO":
+                await self._reply(writer, "250-smtp-sink\r\n250-8BITMIME\r\n250-AUTH PLAIN LOGIN\r\n250 SIZE 52428800")
+            elif verb == "HELO":
+                await self._reply(writer, "250 smtp-sink")
+            elif verb == "AUTH":
+                await self._authenticate(command, reader, writer)
+            elif verb == "STAR":
+                await self._reply(writer, "454 4.7.0 TLS not available")
+            elif verb in ("MAIL", "RSET", "NOOP"):
+                await self._reply(writer, "250 2.0.0 OK")
+            elif verb == "RCPT":
+                self.stats.recipients += 1
+                await self._reply(writer, "250 2.1.5 OK")
+            elif verb == "DATA":
+                await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                await self._receive_body(reader, writer)
+            elif verb == "QUIT":
+                await self._reply(writer, "221 2.0.0 Bye")
+                return
+            else:
+                await self._reply(writer, "502 5.5.2 Command not implemented")
+
+    async def _authenticate(self, command: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        parts = command.split()
+        mechanism = parts[1].upper() if len(parts) > 1 else ""
+        if mechanism == "PLAIN" and len(parts) < 3:
+            await self._reply(writer, "334 ")
+            await reader.readline()
+        elif mechanism == "LOGIN":
+            if len(parts) < 3:
+                await self._reply(writer, "334 VXNlcm5hbWU6")
+                await reader.readline()
+            await self._reply(writer, "334 UGFzc3dvcmQ6")
+            await reader.readline()
+        await self._reply(writer, "235 2.7.0 Authentication successful")
+
+    async def _receive_body(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        size = 0
+        while True:
+            line = await reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            size += len(line)
+        self.stats.bytes_received += size
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.stats.failed_messages += 1
+            await self._reply(writer, "451 4.3.0 Injected failure")
+        else:
+            self.stats.messages += 1
+            await self._reply(writer, "250 2.0.0 Queued")
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, text: str):
+        writer.write(text.encode("utf-8") + b"\r\n")
+        await writer.drain()
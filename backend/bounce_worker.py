@@ -0,0 +1,56 @@
+# bounce_worker.py - Applies DSN bounces from a mailbox drop to leads and suppressions
+import argparse
+import asyncio
+from datetime import datetime
+
+from services.bounce_service import BounceProcessor
+from services.mailbox_source import MboxSource, MaildirSource, IMAPSource
+
+class BounceWorker:
+    def __init__(self, args):
+        self.args = args
+        self.processor = BounceProcessor(batch_size=args.batch_size)
+
+    def _open_source(self):
+        if self.args.mbox:
+            return MboxSource(self.args.mbox)
+        if self.args.maildir:
+            return MaildirSource(self.args.maildir, remove_processed=not self.args.keep)
+        return IMAPSource(
+            host=self.args.imap_host,
+            port=self.args.imap_port,
+            folder=self.args.imap_folder,
+            use_ssl=False if self.args.imap_plain else None
+        )
+
+    async def run_once(self):
+        print(f"[{datetime.utcnow().isoformat()}] Bounce cycle started.")
+        stats = await self.processor.process_source(self._open_source())
+        print(f"[{datetime.utcnow().isoformat()}] Bounce cycle completed: {stats}")
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Bounce worker error: {str(e)}")
+            if not self.args.interval:
+                return
+            await asyncio.sleep(self.args.interval * 60)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Process bounce (DSN) messages")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--mbox", help="Path to an mbox file of bounce messages")
+    source.add_argument("--maildir", help="Path to a Maildir of bounce messages")
+    parser.add_argument("--keep", action="store_true", help="Leave processed Maildir messages in place")
+    parser.add_argument("--imap-host", help="IMAP host (defaults to IMAP_SERVER)")
+    parser.add_argument("--imap-port", type=int, help="IMAP port (defaults to IMAP_PORT)")
+    parser.add_argument("--imap-folder", help="IMAP folder (defaults to IMAP_FOLDER)")
+    parser.add_argument("--imap-plain", action="store_true", help="Use plain IMAP instead of IMAPS (local stand-ins)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Bounce records per bulk write")
+    parser.add_argument("--interval", type=float, default=0, help="Minutes between cycles; 0 runs once")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(BounceWorker(parse_args()).run())
@@ -1,5 +1,6 @@
 # config/database.py
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
 import logging
 from .settings import settings
 
@@ -27,6 +28,39 @@ async def close_mongo_connection():
     except Exception as e:
         logger.error(f"Error closing MongoDB connection: {e}")
 
+# Lead list views: the index serving each filter combination, chosen by LeadService.list_index.
+# Equality filters lead, then (created_at, id) for the range and keyset order; filters that
+# are not a prefix come last so they are matched on index keys and only hits are fetched.
+# interaction_type changes on every tracked open or click, so it is a key of one index only:
+# combinations with it use the interaction index, which carries the other two filters.
+LEAD_LIST_INDEXES = {
+    "all": [("user_id", 1), ("created_at", -1), ("id", -1)],
+    "campaign": [("user_id", 1), ("campaign_id", 1), ("created_at", -1), ("id", -1), ("status", 1)],
+    "status": [("user_id", 1), ("status", 1), ("created_at", -1), ("id", -1)],
+    "interaction": [("user_id", 1), ("interaction_type", 1), ("created_at", -1), ("id", -1), ("campaign_id", 1), ("status", 1)]
+}
+
+# Lead indexes replaced by the ones above (or covered by a longer prefix), dropped on startup
+RETIRED_LEAD_INDEXES = [
+    "campaign_id_1",
+    "user_id_1_status_1",
+    "user_id_1_campaign_id_1_created_at_-1_id_-1_status_1_interaction_type_1",
+    "user_id_1_status_1_created_at_-1_id_-1_interaction_type_1",
+    "user_id_1_interaction_type_1_created_at_-1_id_-1"
+]
+
+# One lead per recipient of a campaign; leads without an address are not constrained
+LEAD_IDENTITY_INDEX = "lead_identity"
+
+async def create_lead_identity_index():
+    """Unique (user_id, campaign_id, email) index; fails while duplicate leads exist"""
+    await db.leads.create_index(
+        [("user_id", 1), ("campaign_id", 1), ("email", 1)],
+        unique=True,
+        partialFilterExpression={"email": {"$type": "string"}},
+        name=LEAD_IDENTITY_INDEX
+    )
+
 async def create_indexes():
     """Create database indexes for better performance"""
     try:
@@ -40,14 +74,86 @@ async def create_indexes():
         await db.oauth_states.create_index([("expires_at", 1)], expireAfterSeconds=0)  # Auto-delete expired states
         
         # Campaign indexes
-        await db.campaigns.create_index([("user_id", 1), ("created_at", -1)])
+        await db.campaigns.create_index("id", unique=True)
+        await db.campaigns.create_index([("user_id", 1), ("created_at", -1), ("id", -1)])  # Keyset pagination order
         await db.campaigns.create_index("status")
+        await db.campaigns.create_index([("user_id", 1), ("analytics.hashtags", 1), ("created_at", -1), ("id", -1)])  # Hashtag filter, same order
+        await db.campaigns.create_index(
+            [("user_id", 1), ("title", "text"), ("analytics.hashtags", "text"), ("search_terms", "text")],
+            weights={"title": 10, "analytics.hashtags": 5, "search_terms": 1},
+            name="campaign_search"
+        )
+        
+        # Archived campaigns (one campaign entry plus lead/revision chunks each)
+        await db.campaign_archive.create_index([("campaign_id", 1), ("kind", 1)])
+        await db.campaigns.create_index([("status", 1), ("archived", 1), ("created_at", 1)])  # Archival job selection
+        
+        # Campaign content history (deltas and snapshots)
+        await db.campaign_revisions.create_index([("campaign_id", 1), ("revision", 1)], unique=True)
+        await db.campaign_revisions.create_index([("campaign_id", 1), ("kind", 1), ("revision", -1)])  # Nearest snapshot lookup
         
         # Lead indexes
-        await db.leads.create_index([("user_id", 1), ("status", 1)])
-        await db.leads.create_index("campaign_id")
-        await db.leads.create_index("email")
+        await db.leads.create_index("id", unique=True)  # Tracking flushes update leads by id
+        for keys in LEAD_LIST_INDEXES.values():
+            await db.leads.create_index(keys)  # The status one also serves the dashboard's (user_id, status) aggregation
+        await db.leads.create_index([("email", 1), ("soft_bounce_count", 1)])
+        await db.leads.create_index([("campaign_id", 1), ("email", 1)])  # Also serves campaign_id-only lookups
+        existing = await db.leads.index_information()
+        for name in RETIRED_LEAD_INDEXES:
+            if name in existing:
+                await db.leads.drop_index(name)
+        await db.leads.create_index([("user_id", 1), ("tags", 1)], sparse=True)  # Bulk selection by tag
+        await db.leads.create_index(
+            [("user_id", 1), ("email", "text"), ("name", "text"), ("notes", "text")],
+            weights={"email": 10, "name": 5, "notes": 1},
+            default_language="none",  # Addresses and names should not be stemmed
+            name="lead_search"
+        )
+        
+        await db.leads.create_index("message_id", sparse=True)  # Reply sync matches In-Reply-To against this
+        
+        # Mailbox sync high-water marks
+        await db.mailbox_sync_state.create_index("mailbox", unique=True)
+        
+        # Materialized per-user dashboard counters
+        await db.user_stats.create_index("user_id", unique=True)
+        
+        # Hourly/daily analytics buckets
+        await db.analytics_rollups.create_index([("scope", 1), ("scope_id", 1), ("granularity", 1), ("bucket", 1)], unique=True)
+        await db.analytics_rollups.create_index([("granularity", 1), ("bucket", 1)])  # Compaction sweeps
+        await db.analytics_rollups.create_index("compaction_run", sparse=True)
+        
+        # Suppression list indexes
+        await db.suppressions.create_index([("user_id", 1), ("email", 1)], unique=True)
+        await db.suppressions.create_index([("user_id", 1), ("created_at", -1)])
+        
+        # Sender quota usage (one document per sender per day)
+        await db.sender_usage.create_index([("sender", 1), ("day", 1)], unique=True)
+        await db.sender_usage.create_index([("created_at", 1)], expireAfterSeconds=7 * 24 * 3600)
+        
+        # Audience list indexes
+        await db.audience_lists.create_index("id", unique=True)
+        await db.audience_lists.create_index([("user_id", 1), ("created_at", -1)])
+        await db.audience_list_chunks.create_index([("list_id", 1), ("seq", 1)], unique=True)
         
         logger.info("Database indexes created successfully")
     except Exception as e:
-        logger.error(f"Error creating indexes: {e}")
\ No newline at end of file
+        logger.error(f"Error creating indexes: {e}")
+
+    # Last and on its own, so leads that still break uniqueness cannot keep any other index from being created
+    try:
+        await create_lead_identity_index()
+    except DuplicateKeyError:
+        await merge_duplicate_leads()
+    except Exception as e:
+        logger.error(f"Lead identity index not created: {e}")
+
+async def merge_duplicate_leads():
+    """Merge legacy duplicate leads (safe to rerun), then retry the identity index once"""
+    from services.lead_service import LeadService  # services import this module
+    try:
+        stats = await LeadService(db).merge_duplicates()
+        logger.warning(f"Merged duplicate leads before creating the lead identity index: {stats}")
+        await create_lead_identity_index()
+    except Exception as e:
+        logger.error(f"Lead identity index not created, run migrate_lead_duplicates.py: {e}")
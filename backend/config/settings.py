@@ -116,8 +116,66 @@ class Settings(BaseSettings):
     # Email Configuration
     sender_email: Optional[str] = os.environ.get("SENDER_EMAIL")
     email_app_password: Optional[str] = os.environ.get("EMAIL_APP_PASSWORD")
-    smtp_server: str = "smtp.gmail.com"
-    smtp_port: int = 587
+    smtp_server: str = os.environ.get("SMTP_SERVER", "smtp.gmail.com")
+    smtp_port: int = int(os.environ.get("SMTP_PORT", "587"))
+    smtp_use_tls: bool = os.environ.get("SMTP_USE_TLS", "True") == "True"
+    sender_pool: str = os.environ.get("SENDER_POOL", "")  # JSON list of {email, password, host, port, use_tls, weight, daily_quota}
+    sender_daily_quota: int = int(os.environ.get("SENDER_DAILY_QUOTA", "500"))  # Gmail's per-account daily cap
+
+    # Inbound Mailbox Configuration (bounce and reply processing)
+    imap_server: str = os.environ.get("IMAP_SERVER", "imap.gmail.com")
+    imap_port: int = int(os.environ.get("IMAP_PORT", "993"))
+    imap_use_ssl: bool = os.environ.get("IMAP_USE_SSL", "True") == "True"
+    imap_user: Optional[str] = os.environ.get("IMAP_USER", os.environ.get("SENDER_EMAIL"))
+    imap_password: Optional[str] = os.environ.get("IMAP_PASSWORD", os.environ.get("EMAIL_APP_PASSWORD"))
+    imap_folder: str = os.environ.get("IMAP_FOLDER", "INBOX")
+    message_id_domain: str = os.environ.get("MESSAGE_ID_DOMAIN", "")  # Defaults to the sender's domain
+    reply_sync_lookback_days: int = int(os.environ.get("REPLY_SYNC_LOOKBACK_DAYS", "14"))  # First sync only
+    bounce_soft_threshold: int = int(os.environ.get("BOUNCE_SOFT_THRESHOLD", "3"))  # Soft bounces before suppressing
+
+    # Open/Click Tracking Configuration
+    tracking_base_url: str = os.environ.get("TRACKING_BASE_URL", "")  # Public API base, e.g. https://host/api; empty disables tracking
+    tracking_secret: str = os.environ.get("TRACKING_SECRET", "")  # HMAC key for tracking links; empty disables tracking
+    tracking_flush_interval: float = float(os.environ.get("TRACKING_FLUSH_INTERVAL", "5"))
+    tracking_max_buffer: int = int(os.environ.get("TRACKING_MAX_BUFFER", "10000"))
+    tracking_write_concern: str = os.environ.get("TRACKING_WRITE_CONCERN", "1")  # "0", "1", "majority"
+
+    # GET Response Caching (ETags and per-process LRU)
+    response_cache_ttl: float = float(os.environ.get("RESPONSE_CACHE_TTL", "30"))  # Max staleness from writes in other processes
+    response_cache_max_entries: int = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "2000"))  # 0 keeps ETags but no bodies
+    response_cache_max_versions: int = int(os.environ.get("RESPONSE_CACHE_MAX_VERSIONS", "20000"))  # Per-user version counters kept
+
+    # Response Compression (brotli/gzip)
+    compression_min_size: int = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))  # Smaller bodies are sent as-is
+    compression_gzip_level: int = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+    compression_brotli_quality: int = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+    compression_threadpool_min_size: int = int(os.environ.get("COMPRESSION_THREADPOOL_MIN_SIZE", "65536"))  # Larger bodies are compressed off the event loop
+
+    # Campaign Content Storage
+    content_compression_threshold: int = int(os.environ.get("CONTENT_COMPRESSION_THRESHOLD", "2048"))  # Bytes; 0 stores all content as text
+    content_compression_level: int = int(os.environ.get("CONTENT_COMPRESSION_LEVEL", "6"))
+    content_snapshot_interval: int = int(os.environ.get("CONTENT_SNAPSHOT_INTERVAL", "10"))  # Full copy every N revisions, deltas between
+
+    # Streaming Exports
+    export_batch_size: int = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))  # Documents per cursor round trip
+    export_chunk_rows: int = int(os.environ.get("EXPORT_CHUNK_ROWS", "500"))  # Rows encoded per response chunk
+
+    # Lead Scoring (points per signal; repeats count logarithmically, the total halves every half-life)
+    lead_score_sent_weight: float = float(os.environ.get("LEAD_SCORE_SENT_WEIGHT", "5"))
+    lead_score_open_weight: float = float(os.environ.get("LEAD_SCORE_OPEN_WEIGHT", "15"))
+    lead_score_click_weight: float = float(os.environ.get("LEAD_SCORE_CLICK_WEIGHT", "45"))
+    lead_score_reply_weight: float = float(os.environ.get("LEAD_SCORE_REPLY_WEIGHT", "80"))
+    lead_score_half_life_days: float = float(os.environ.get("LEAD_SCORE_HALF_LIFE_DAYS", "14"))
+    lead_score_warm_threshold: float = float(os.environ.get("LEAD_SCORE_WARM_THRESHOLD", "20"))  # One open
+    lead_score_hot_threshold: float = float(os.environ.get("LEAD_SCORE_HOT_THRESHOLD", "50"))  # One click or reply
+    lead_score_write_batch_size: int = int(os.environ.get("LEAD_SCORE_WRITE_BATCH_SIZE", "1000"))  # Status updates per bulk_write
+
+    # Campaign Archival (old sent campaigns, their leads and history move to campaign_archive)
+    archive_after_days: int = int(os.environ.get("ARCHIVE_AFTER_DAYS", "365"))
+    archive_chunk_size: int = int(os.environ.get("ARCHIVE_CHUNK_SIZE", "1000"))  # Leads/revisions per compressed archive document
+
+    # Analytics Rollups
+    rollup_hourly_retention_hours: int = int(os.environ.get("ROLLUP_HOURLY_RETENTION_HOURS", "48"))  # Older hours are compacted to days
 
     # Frontend Configuration
     frontend_url: str = os.environ["FRONTEND_URL"]  # Must be set in .env
@@ -88,12 +88,23 @@ import time
 
 from config.settings import settings
 from config.database import connect_to_mongo, close_mongo_connection, create_indexes
+from utils.compression import CompressionMiddleware
+from utils.upload_limit import UploadLimitMiddleware
+from utils.serialization import FastJSONResponse
 from routes.auth import router as auth_router
 from routes.campaigns import router as campaigns_router
+from routes.leads import router as leads_router
 from routes.dashboard import router as dashboard_router
 from routes.domain import router as domain_router
 from routes.seo import router as seo_router
 from routes.system import router as system_router
+from routes.suppressions import router as suppressions_router
+from routes.audiences import router as audiences_router
+from routes.tracking import router as tracking_router, tracking_service
+from services.tracking_service import tracking_enabled
+from routes.analytics import router as analytics_router
+from routes.search import router as search_router
+from routes.exports import router as exports_router
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -111,11 +122,15 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="AI-powered marketing campaign generator and management system",
+    default_response_class=FastJSONResponse,
     docs_url="/docs" if settings.debug else None,  # Disable docs in production
     redoc_url="/redoc" if settings.debug else None  # Disable redoc in production
 )
 
 # ===== Middleware Enhancements =====
+# Upload size limit; added first so it sits inside CORS and its 413 still carries CORS headers
+app.add_middleware(UploadLimitMiddleware)
+
 # CORS - Production hardened
 app.add_middleware(
     CORSMiddleware,
@@ -126,6 +141,9 @@ app.add_middleware(
     expose_headers=["X-Response-Time"]
 )
 
+# Brotli/gzip for large bodies; must be added before the http middleware below, which re-streams bodies
+app.add_middleware(CompressionMiddleware)
+
 # Add request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -139,10 +157,17 @@ async def add_process_time_header(request: Request, call_next):
 api_router = APIRouter(prefix="/api")
 api_router.include_router(auth_router, tags=["Authentication"])
 api_router.include_router(campaigns_router, tags=["Campaigns"])
+api_router.include_router(leads_router, tags=["Leads"])
 api_router.include_router(dashboard_router, tags=["Dashboard"])
 api_router.include_router(domain_router, tags=["Domain"])
 api_router.include_router(seo_router, tags=["SEO"])
 api_router.include_router(system_router, tags=["System"])
+api_router.include_router(suppressions_router, tags=["Suppressions"])
+api_router.include_router(audiences_router, tags=["Audiences"])
+api_router.include_router(tracking_router, tags=["Tracking"])
+api_router.include_router(analytics_router, tags=["Analytics"])
+api_router.include_router(search_router, tags=["Search"])
+api_router.include_router(exports_router, tags=["Exports"])
 app.include_router(api_router)
 
 # ===== Event Handlers =====
@@ -151,12 +176,15 @@ async def startup_event():
     logger.info(f"🚀 Starting {settings.app_name} v{settings.app_version} in {settings.environment} mode")
     logger.info(f"🔒 Allowed Origins: {settings.allowed_origins}")
     logger.info(f"🔑 Using Google Redirect: {settings.google_redirect_uri}")
+    if settings.tracking_base_url and not tracking_enabled():
+        logger.warning("⚠️ TRACKING_BASE_URL is set but TRACKING_SECRET is not; open/click tracking is disabled")
     
     try:
         await connect_to_mongo()
         logger.info("✅ Connected to MongoDB")
         await create_indexes()
         logger.info("✅ Created database indexes")
+        tracking_service.start()
     except Exception as e:
         logger.critical(f"❌ MongoDB connection failed: {str(e)}")
         # Rethrow to prevent app from starting with bad DB connection
@@ -164,6 +192,10 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    try:
+        await tracking_service.stop()
+    except Exception as e:
+        logger.error(f"⚠️ Error flushing tracking events: {str(e)}")
     try:
         await close_mongo_connection()
         logger.info("✅ Closed MongoDB connection")
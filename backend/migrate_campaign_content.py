@@ -0,0 +1,37 @@
+# migrate_campaign_content.py - Packs (or unpacks) stored campaign content in batches
+import argparse
+import asyncio
+from datetime import datetime
+
+from services.campaign_service import CampaignService
+
+class ContentMigration:
+    def __init__(self, args):
+        self.args = args
+        self.service = CampaignService()
+
+    async def run(self):
+        mode = "unpack" if self.args.unpack else "pack"
+        print(f"[{datetime.utcnow().isoformat()}] Campaign content {mode} started{' (dry run)' if self.args.dry_run else ''}.")
+        stats = await self.service.pack_stored_content(
+            batch_size=self.args.batch_size,
+            dry_run=self.args.dry_run,
+            unpack=self.args.unpack
+        )
+        saved = stats["bytes_before"] - stats["bytes_after"]
+        print(
+            f"[{datetime.utcnow().isoformat()}] Campaign content {mode} completed: "
+            f"{stats['scanned']} scanned, {stats['updated']} updated, "
+            f"{stats['bytes_before']} -> {stats['bytes_after']} bytes ({saved} saved)"
+        )
+        return stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compress existing campaign content above CONTENT_COMPRESSION_THRESHOLD")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents read and written per round trip")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--unpack", action="store_true", help="Store all content as plain text again (rollback)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(ContentMigration(parse_args()).run())
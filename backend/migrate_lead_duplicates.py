@@ -0,0 +1,34 @@
+# migrate_lead_duplicates.py - Merges duplicate leads, then adds the unique (user_id, campaign_id, email) index
+import argparse
+import asyncio
+from datetime import datetime
+
+from config.database import create_lead_identity_index
+from services.lead_service import LeadService
+
+class LeadDeduplication:
+    def __init__(self, args):
+        self.args = args
+        self.service = LeadService()
+
+    async def run(self):
+        print(f"[{datetime.utcnow().isoformat()}] Lead deduplication started{' (dry run)' if self.args.dry_run else ''}.")
+        stats = await self.service.merge_duplicates(batch_size=self.args.batch_size, dry_run=self.args.dry_run)
+        print(
+            f"[{datetime.utcnow().isoformat()}] Lead deduplication completed: "
+            f"{stats['groups']} duplicated recipients, {stats['duplicates']} duplicates, {stats['deleted']} deleted"
+        )
+        if not self.args.dry_run:
+            # Safe to rerun: an interrupted merge leaves duplicates the index would reject, so it is only built at the end
+            await create_lead_identity_index()
+            print(f"[{datetime.utcnow().isoformat()}] Unique lead identity index is in place.")
+        return stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Merge leads sharing (user_id, campaign_id, email) and enforce uniqueness")
+    parser.add_argument("--batch-size", type=int, default=500, help="Duplicate groups merged per round trip")
+    parser.add_argument("--dry-run", action="store_true", help="Count duplicates without merging them")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(LeadDeduplication(parse_args()).run())
@@ -1,6 +1,8 @@
 from .user import User, OnboardingData, SimpleAuthRequest
-from .campaign import Campaign, CampaignRequest, EmailSendRequest
-from .lead import Lead, LeadStatusUpdate
+from .campaign import Campaign, CampaignSummary, CampaignRequest, EmailSendRequest
+from .lead import Lead, LeadStatusUpdate, LeadFilter, LeadBulkRequest, LeadBulkStatusRequest, LeadBulkTagRequest
+from .suppression import Suppression, SuppressionRequest
+from .audience import AudienceList
 from .e3t_model import E3TModel
 from .domain import DomainModel
 
@@ -12,12 +14,24 @@ __all__ = [
 
     # Campaign models
     "Campaign",
+    "CampaignSummary",
     "CampaignRequest",
     "EmailSendRequest",
 
     # Lead models
     "Lead",
     "LeadStatusUpdate",
+    "LeadFilter",
+    "LeadBulkRequest",
+    "LeadBulkStatusRequest",
+    "LeadBulkTagRequest",
+
+    # Suppression models
+    "Suppression",
+    "SuppressionRequest",
+
+    # Audience models
+    "AudienceList",
 
     # E3T
     "E3TModel",
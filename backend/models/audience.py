@@ -0,0 +1,19 @@
+# models/audience.py
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+import uuid
+
+class AudienceList(BaseModel):
+    """Reusable recipient list; members live in audience_list_chunks"""
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    name: str
+    status: str = "importing"  # importing, ready, failed
+    source_filename: Optional[str] = None
+    member_count: int = 0
+    invalid_count: int = 0
+    duplicate_count: int = 0
+    chunk_count: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
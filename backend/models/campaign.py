@@ -1,9 +1,11 @@
 # models/campaign.py
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
+from utils.content_codec import unpack_content
+
 class Campaign(BaseModel):
     """Campaign model for marketing campaigns"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -16,6 +18,45 @@ class Campaign(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     scheduled_at: Optional[datetime] = None
     performance: dict = Field(default_factory=dict)
+    preview: Optional[str] = None  # Short plain-text snippet of content for list views
+    revision: int = 1  # Current content revision; history lives in campaign_revisions
+    analytics: Optional[dict] = None  # utils.content_analysis results, recomputed whenever content is written
+    archived: bool = False  # Full document, leads and history live in campaign_archive; the hot row is a stub
+
+    @field_validator("content", mode="before")
+    @classmethod
+    def unpack_stored_content(cls, value):
+        # Large content is stored zlib-packed; it is only decoded when a query actually returns it
+        return unpack_content(value)
+
+class CampaignSummary(BaseModel):
+    """Campaign list row: everything but the full content"""
+    id: str
+    user_id: str
+    title: str
+    campaign_type: str
+    style: Optional[str] = "persuasive"
+    status: str = "draft"
+    created_at: datetime
+    scheduled_at: Optional[datetime] = None
+    performance: dict = Field(default_factory=dict)
+    preview: str = ""
+    analytics: Optional[dict] = None
+    archived: bool = False
+
+    @classmethod
+    def projection(cls, preview_length: int = 200) -> Dict[str, Any]:
+        """Mongo projection returning exactly this shape; content never leaves the server"""
+        fields: Dict[str, Any] = {name: 1 for name in cls.model_fields}
+        # Documents written before previews existed fall back to a server-side substring; packed
+        # content always has a stored preview, and $substrCP only accepts strings
+        fields["preview"] = {"$ifNull": ["$preview", {"$cond": [
+            {"$eq": [{"$type": "$content"}, "string"]},
+            {"$substrCP": ["$content", 0, preview_length]},
+            ""
+        ]}]}
+        fields["_id"] = 0
+        return fields
 
 class CampaignRequest(BaseModel):
     """Model for campaign generation requests"""
@@ -24,5 +65,6 @@ class CampaignRequest(BaseModel):
     custom_prompt: Optional[str] = None
 
 class EmailSendRequest(BaseModel):
-    """Model for sending email campaigns"""
-    recipients: List[str]
\ No newline at end of file
+    """Model for sending email campaigns to raw recipients or a stored audience list"""
+    recipients: List[str] = Field(default_factory=list)
+    audience_list_id: Optional[str] = None
\ No newline at end of file
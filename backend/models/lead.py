@@ -1,6 +1,6 @@
 # models/lead.py
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
@@ -13,9 +13,38 @@ class Lead(BaseModel):
     name: Optional[str] = None
     interaction_type: str  # opened, clicked, replied, sent
     status: str = "cold"  # cold, warm, hot
+    status_source: Optional[str] = None  # "manual" once a user sets the status; batch rescoring leaves those alone
     created_at: datetime = Field(default_factory=datetime.utcnow)
     notes: Optional[str] = None
+    open_count: int = 0
+    click_count: int = 0
+    last_interaction_at: Optional[datetime] = None
+    message_id: Optional[str] = None  # Message-ID stamped on the outgoing email, matched by reply sync and bounces
+    sender: Optional[str] = None  # Sender account of the latest send; scopes bounces that carry no Message-ID
+    send_count: int = 1  # Sends to this address for the campaign; one lead per (user, campaign, email)
+    tags: List[str] = Field(default_factory=list)
+    score: Optional[float] = None  # Set by interactions and batch rescoring, see utils.lead_scoring
+    scored_at: Optional[datetime] = None
 
 class LeadStatusUpdate(BaseModel):
     """Model for updating lead status"""
-    status: str
\ No newline at end of file
+    status: str
+
+class LeadFilter(BaseModel):
+    """Lead selection by field values, e.g. all cold leads of one campaign"""
+    campaign_id: Optional[str] = None
+    status: Optional[str] = None
+    interaction_type: Optional[str] = None
+    tag: Optional[str] = None
+
+class LeadBulkRequest(BaseModel):
+    """Leads to act on: explicit ids or a filter (exactly one of the two)"""
+    ids: Optional[List[str]] = None
+    filter: Optional[LeadFilter] = None
+
+class LeadBulkStatusRequest(LeadBulkRequest):
+    status: str
+
+class LeadBulkTagRequest(LeadBulkRequest):
+    add: List[str] = Field(default_factory=list)
+    remove: List[str] = Field(default_factory=list)
@@ -0,0 +1,19 @@
+# models/suppression.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+class Suppression(BaseModel):
+    """Address that must never be mailed again for a user"""
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    email: str
+    reason: str  # bounce, unsubscribe, complaint
+    source: Optional[str] = None  # e.g. campaign id or DSN message id
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class SuppressionRequest(BaseModel):
+    """Model for adding addresses to the suppression list"""
+    emails: List[str]
+    reason: str = "unsubscribe"
@@ -0,0 +1,42 @@
+# reconcile_worker.py - Rebuilds user_stats counters and reports drift
+import argparse
+import asyncio
+from datetime import datetime
+
+from services.stats_service import StatsService
+
+class ReconcileWorker:
+    def __init__(self, args):
+        self.args = args
+        self.service = StatsService()
+
+    async def run_once(self):
+        print(f"[{datetime.utcnow().isoformat()}] Stats reconciliation started.")
+        report = await self.service.reconcile(self.args.user or None)
+        for user_id, drift in report["drift"].items():
+            for entry in drift:
+                print(f"  drift {user_id} {entry['field']}: stored={entry['stored']} actual={entry['actual']}")
+        print(
+            f"[{datetime.utcnow().isoformat()}] Stats reconciliation completed: "
+            f"{report['users']} users, {report['drifted_users']} with drift"
+        )
+        return report
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Reconcile worker error: {str(e)}")
+            if not self.args.interval:
+                return
+            await asyncio.sleep(self.args.interval * 60)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild per-user dashboard counters and report drift")
+    parser.add_argument("--user", action="append", help="Only reconcile this user id (repeatable)")
+    parser.add_argument("--interval", type=float, default=0, help="Minutes between cycles; 0 runs once")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(ReconcileWorker(parse_args()).run())
@@ -0,0 +1,48 @@
+# reply_worker.py - Incremental IMAP reply sync that marks leads as replied
+import argparse
+import asyncio
+from datetime import datetime
+
+from services.mailbox_source import IMAPSource
+from services.reply_sync_service import ReplySyncService, REPLY_FETCH_SPEC
+
+class ReplyWorker:
+    def __init__(self, args):
+        self.args = args
+        self.service = ReplySyncService(batch_size=args.batch_size)
+
+    async def run_once(self):
+        print(f"[{datetime.utcnow().isoformat()}] Reply sync started.")
+        source = IMAPSource(
+            host=self.args.imap_host,
+            port=self.args.imap_port,
+            folder=self.args.imap_folder,
+            use_ssl=False if self.args.imap_plain else None,
+            mark_seen=False,
+            fetch_spec=REPLY_FETCH_SPEC
+        )
+        stats = await self.service.sync(source)
+        print(f"[{datetime.utcnow().isoformat()}] Reply sync completed: {stats}")
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Reply worker error: {str(e)}")
+            if not self.args.interval:
+                return
+            await asyncio.sleep(self.args.interval * 60)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mark leads as replied from an IMAP inbox")
+    parser.add_argument("--imap-host", help="IMAP host (defaults to IMAP_SERVER)")
+    parser.add_argument("--imap-port", type=int, help="IMAP port (defaults to IMAP_PORT)")
+    parser.add_argument("--imap-folder", help="IMAP folder (defaults to IMAP_FOLDER)")
+    parser.add_argument("--imap-plain", action="store_true", help="Use plain IMAP instead of IMAPS (local stand-ins)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Replies per bulk write")
+    parser.add_argument("--interval", type=float, default=5, help="Minutes between cycles; 0 runs once")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(ReplyWorker(parse_args()).run())
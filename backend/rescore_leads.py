@@ -0,0 +1,41 @@
+# rescore_leads.py - Recomputes lead scores and statuses (run after changing LEAD_SCORE_* settings, or daily for decay)
+import argparse
+import asyncio
+from datetime import datetime
+
+from config import db
+from services.scoring_service import ScoringService
+from utils.lead_scoring import ScoringWeights
+
+class LeadRescore:
+    def __init__(self, args):
+        self.args = args
+        self.service = ScoringService()
+
+    async def run(self):
+        weights = ScoringWeights.from_settings()
+        user_ids = [self.args.user_id] if self.args.user_id else await db.leads.distinct("user_id")
+        print(f"[{datetime.utcnow().isoformat()}] Lead rescoring started for {len(user_ids)} users ({weights}).")
+        totals = {"scanned": 0, "changed": 0, "updated": 0, "conflicts": 0}
+        for user_id in user_ids:
+            stats = await self.service.rescore(user_id, campaign_id=self.args.campaign_id, weights=weights, dry_run=self.args.dry_run)
+            for key in totals:
+                totals[key] += stats[key]
+            if stats["changed"]:
+                print(f"[{datetime.utcnow().isoformat()}] {user_id}: {stats['changed']} of {stats['scanned']} leads change status {stats['by_status']}")
+        print(
+            f"[{datetime.utcnow().isoformat()}] Lead rescoring completed: {totals['scanned']} scanned, "
+            f"{totals['changed']} changed, {totals['updated']} updated, {totals['conflicts']} conflicts"
+            + (" (dry run)" if self.args.dry_run else "")
+        )
+        return totals
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rescore leads with the current weights and recency decay")
+    parser.add_argument("--user-id", help="Only this user's leads (default: every user)")
+    parser.add_argument("--campaign-id", help="Only this campaign's leads (use with --user-id)")
+    parser.add_argument("--dry-run", action="store_true", help="Report status changes without writing them")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(LeadRescore(parse_args()).run())
@@ -0,0 +1,36 @@
+# rollup_worker.py - Compacts hourly analytics buckets into daily ones
+import argparse
+import asyncio
+from datetime import datetime
+
+from services.rollup_service import RollupService
+
+class RollupWorker:
+    def __init__(self, args):
+        self.args = args
+        self.service = RollupService()
+
+    async def run_once(self):
+        print(f"[{datetime.utcnow().isoformat()}] Rollup compaction started.")
+        stats = await self.service.compact(self.args.retention_hours)
+        print(f"[{datetime.utcnow().isoformat()}] Rollup compaction completed: {stats}")
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Rollup worker error: {str(e)}")
+            if not self.args.interval:
+                return
+            await asyncio.sleep(self.args.interval * 60)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compact hourly analytics rollups into daily buckets")
+    parser.add_argument("--retention-hours", type=int, default=None,
+                        help="Hours of hourly detail to keep (defaults to ROLLUP_HOURLY_RETENTION_HOURS)")
+    parser.add_argument("--interval", type=float, default=60, help="Minutes between cycles; 0 runs once")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(RollupWorker(parse_args()).run())
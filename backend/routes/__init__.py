@@ -6,6 +6,12 @@ from .dashboard import router as dashboard_router
 from .system import router as system_router
 from .domain import router as domain_router
 from .seo import router as seo_router
+from .suppressions import router as suppressions_router
+from .audiences import router as audiences_router
+from .tracking import router as tracking_router
+from .analytics import router as analytics_router
+from .search import router as search_router
+from .exports import router as exports_router
 
 __all__ = [
     "auth_router",
@@ -14,5 +20,11 @@ __all__ = [
     "dashboard_router",
     "system_router",
     "domain_router",
-    "seo_router"
+    "seo_router",
+    "suppressions_router",
+    "audiences_router",
+    "tracking_router",
+    "analytics_router",
+    "search_router",
+    "exports_router"
 ]
\ No newline at end of file
@@ -0,0 +1,47 @@
+# routes/analytics.py
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import logging
+
+from models import User
+from services import AuthService, RollupService
+from utils import build_response, negotiated_response
+
+router = APIRouter()
+security = HTTPBearer()
+
+# Initialize services
+rollup_service = RollupService()
+auth_service = AuthService()
+
+# Authentication dependency
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    user = await auth_service.get_user_by_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    return user
+
+# Account-wide trends
+@router.get("/analytics/trends")
+async def get_trends(request: Request, days: int = 30, granularity: str = "day", user: User = Depends(get_current_user)):
+    try:
+        trend = await rollup_service.get_trend(user.id, days=days, granularity=granularity)
+        return negotiated_response(request, build_response(success=True, data=trend, message="Trends fetched successfully"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Get trends error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch trends")
+
+# Per-campaign trends
+@router.get("/analytics/campaigns/{campaign_id}/trends")
+async def get_campaign_trends(campaign_id: str, request: Request, days: int = 30, granularity: str = "day", user: User = Depends(get_current_user)):
+    try:
+        trend = await rollup_service.get_trend(user.id, campaign_id=campaign_id, days=days, granularity=granularity)
+        return negotiated_response(request, build_response(success=True, data=trend, message="Campaign trends fetched successfully"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Get campaign trends error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch campaign trends")
@@ -0,0 +1,75 @@
+# routes/audiences.py
+from fastapi import APIRouter, HTTPException, Depends, File, Form, UploadFile
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import logging
+
+from models import User
+from services import AuthService, AudienceService
+from utils import build_response
+
+router = APIRouter()
+security = HTTPBearer()
+
+# Initialize services
+audience_service = AudienceService()
+auth_service = AuthService()
+
+# Authentication dependency
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    user = await auth_service.get_user_by_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    return user
+
+# Import a CSV / NDJSON / JSON audience list
+@router.post("/audiences")
+async def import_audience(
+    name: str = Form(...),
+    file: UploadFile = File(...),
+    user: User = Depends(get_current_user)
+):
+    try:
+        audience = await audience_service.import_list(user.id, name, file.filename or "", file.file)
+        return build_response(
+            success=True,
+            data=audience,
+            message=f"Imported {audience['member_count']} recipients"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Import audience error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to import audience list")
+    finally:
+        await file.close()
+
+# Get all audience lists
+@router.get("/audiences")
+async def get_audiences(user: User = Depends(get_current_user)):
+    try:
+        audiences = await audience_service.get_user_lists(user.id)
+        return build_response(success=True, data=audiences, message="Audience lists fetched successfully")
+    except Exception as e:
+        logging.error(f"Get audiences error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch audience lists")
+
+# Get a single audience list
+@router.get("/audiences/{list_id}")
+async def get_audience(list_id: str, user: User = Depends(get_current_user)):
+    audience = await audience_service.get_list(list_id, user.id)
+    if not audience:
+        raise HTTPException(status_code=404, detail="Audience list not found")
+    return build_response(success=True, data=audience, message="Audience list fetched successfully")
+
+# Delete an audience list
+@router.delete("/audiences/{list_id}")
+async def delete_audience(list_id: str, user: User = Depends(get_current_user)):
+    try:
+        deleted = await audience_service.delete_list(list_id, user.id)
+    except Exception as e:
+        logging.error(f"Delete audience error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to delete audience list")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Audience list not found")
+    return build_response(success=True, message="Audience list deleted successfully")
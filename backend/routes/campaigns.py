@@ -1,13 +1,14 @@
 # routes/campaigns.py
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 import logging
 
-from config import db
 from models import User, CampaignRequest, EmailSendRequest
-from services import CampaignService, EmailService, AuthService
+from services import CampaignService, EmailService, AuthService, AudienceService
+from services.revision_service import RevisionConflict
 from utils import build_response, validate_email_list
+from utils.response_cache import cached_json_response, cached_campaign_response
 
 router = APIRouter()
 security = HTTPBearer()
@@ -16,6 +17,7 @@ security = HTTPBearer()
 campaign_service = CampaignService()
 email_service = EmailService()
 auth_service = AuthService()
+audience_service = AudienceService()
 
 # Authentication dependency
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -55,32 +57,51 @@ async def generate_campaign(request: CampaignRequest, user: User = Depends(get_c
         logging.error(f"Campaign generation error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate campaign")
 
-# Get all campaigns
+# Get campaigns, one page at a time (pass pagination.next_cursor back as ?cursor=)
 @router.get("/campaigns")
-async def get_campaigns(user: User = Depends(get_current_user)):
-    try:
-        campaigns = await campaign_service.get_user_campaigns(user.id)
-        return build_response(
+async def get_campaigns(
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    hashtag: Optional[str] = None,
+    user: User = Depends(get_current_user)
+):
+    async def build():
+        page = await campaign_service.get_user_campaigns(user.id, limit=limit, cursor=cursor, hashtag=hashtag)
+        response = build_response(
             success=True,
-            data=[campaign.dict() for campaign in campaigns],
+            data=page["items"],
             message="Campaigns fetched successfully"
         )
+        response["pagination"] = page["pagination"]
+        return response
+
+    try:
+        return await cached_json_response(request, user.id, ("campaigns",), build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Get campaigns error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch campaigns")
 
 # Get a single campaign
 @router.get("/campaigns/{campaign_id}")
-async def get_campaign(campaign_id: str, user: User = Depends(get_current_user)):
-    try:
+async def get_campaign(campaign_id: str, request: Request, user: User = Depends(get_current_user)):
+    async def build():
         campaign = await campaign_service.get_campaign_by_id(campaign_id, user.id)
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
-        return build_response(
+        response = build_response(
             success=True,
-            data=campaign.dict(),
+            data=campaign,
             message="Campaign fetched successfully"
         )
+        return response, campaign.status == "sent"
+
+    try:
+        return await cached_campaign_response(request, user.id, campaign_id, build)
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Get campaign error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch campaign")
@@ -98,10 +119,94 @@ async def update_campaign(
         if not success:
             raise HTTPException(status_code=404, detail="Campaign not found")
         return build_response(success=True, message="Campaign updated successfully")
+    except HTTPException:
+        raise
+    except RevisionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Update campaign error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update campaign")
 
+# Content history, newest first
+@router.get("/campaigns/{campaign_id}/revisions")
+async def list_campaign_revisions(campaign_id: str, user: User = Depends(get_current_user)):
+    try:
+        revisions = await campaign_service.revision_service.list_revisions(campaign_id, user.id)
+        if not revisions and not await campaign_service.get_campaign_by_id(campaign_id, user.id):
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        return build_response(success=True, data=revisions, message="Revisions fetched successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"List revisions error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch revisions")
+
+# Diff two revisions
+@router.get("/campaigns/{campaign_id}/revisions/diff")
+async def diff_campaign_revisions(campaign_id: str, from_revision: int, to_revision: int, user: User = Depends(get_current_user)):
+    try:
+        diff = await campaign_service.revision_service.diff(campaign_id, user.id, from_revision, to_revision)
+        if diff is None:
+            raise HTTPException(status_code=404, detail="Revision not found")
+        return build_response(success=True, data=diff, message="Revision diff generated successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Diff revisions error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to diff revisions")
+
+# Content as of one revision
+@router.get("/campaigns/{campaign_id}/revisions/{revision}")
+async def get_campaign_revision(campaign_id: str, revision: int, user: User = Depends(get_current_user)):
+    try:
+        content = await campaign_service.revision_service.get_content(campaign_id, user.id, revision)
+        if content is None:
+            raise HTTPException(status_code=404, detail="Revision not found")
+        return build_response(
+            success=True,
+            data={"campaign_id": campaign_id, "revision": revision, "content": content},
+            message="Revision fetched successfully"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Get revision error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch revision")
+
+# Undo: make an earlier revision current (recorded as a new revision)
+@router.post("/campaigns/{campaign_id}/revisions/{revision}/restore")
+async def restore_campaign_revision(campaign_id: str, revision: int, user: User = Depends(get_current_user)):
+    try:
+        success = await campaign_service.restore_revision(campaign_id, user.id, revision)
+        if not success:
+            raise HTTPException(status_code=404, detail="Revision not found")
+        return build_response(success=True, message="Revision restored successfully")
+    except HTTPException:
+        raise
+    except RevisionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Restore revision error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to restore revision")
+
+# Move an archived campaign back to the hot collections; reads by id work without this
+@router.post("/campaigns/{campaign_id}/restore")
+async def restore_archived_campaign(campaign_id: str, user: User = Depends(get_current_user)):
+    try:
+        result = await campaign_service.restore_archived(campaign_id, user.id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Archived campaign not found")
+        return build_response(success=True, data=result, message="Campaign restored from archive")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Restore archived campaign error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to restore campaign")
+
 # Delete campaign
 @router.delete("/campaigns/{campaign_id}")
 async def delete_campaign(campaign_id: str, user: User = Depends(get_current_user)):
@@ -122,9 +227,16 @@ async def send_email_campaign(
     user: User = Depends(get_current_user)
 ):
     try:
-        validation = validate_email_list(request.recipients)
-        if not validation["valid"]:
-            return build_response(success=False, errors=validation["errors"])
+        if request.audience_list_id:
+            # Audience members were validated and deduplicated at import time
+            recipients = await audience_service.get_members(request.audience_list_id, user.id)
+            if recipients is None:
+                raise HTTPException(status_code=404, detail="Audience list not found")
+        else:
+            validation = validate_email_list(request.recipients)
+            if not validation["valid"]:
+                return build_response(success=False, errors=validation["errors"])
+            recipients = validation["valid_emails"]
 
         campaign = await campaign_service.get_campaign_by_id(campaign_id, user.id)
         if not campaign:
@@ -132,10 +244,13 @@ async def send_email_campaign(
 
         if campaign.campaign_type != "email":
             raise HTTPException(status_code=400, detail="Not an email campaign")
+        if campaign.archived:
+            # Prior recipients are archived too, so screening could not skip them
+            raise HTTPException(status_code=400, detail="Campaign is archived; restore it before sending")
 
         result = await email_service.send_campaign_emails(
             campaign=campaign.dict(),
-            recipients=validation["valid_emails"],
+            recipients=recipients,
             user_id=user.id
         )
 
@@ -145,12 +260,18 @@ async def send_email_campaign(
                 data={
                     "sent_count": result["sent_count"],
                     "failed_count": result["failed_count"],
-                    "failed_recipients": result["failed_recipients"]
+                    "failed_recipients": result["failed_recipients"],
+                    "skipped_duplicates": result["skipped_duplicates"],
+                    "skipped_suppressed": result["skipped_suppressed"],
+                    "skipped_already_sent": result["skipped_already_sent"],
+                    "sender_breakdown": result["sender_breakdown"]
                 },
                 message=result["message"]
             )
         else:
             raise HTTPException(status_code=500, detail=result["message"])
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Send email campaign error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to send email campaign")
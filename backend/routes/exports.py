@@ -0,0 +1,83 @@
+# routes/exports.py
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Optional
+from datetime import datetime
+import logging
+
+from models import User
+from services import AuthService, ExportService
+
+router = APIRouter()
+security = HTTPBearer()
+
+# Initialize services
+export_service = ExportService()
+auth_service = AuthService()
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Authentication dependency
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    user = await auth_service.get_user_by_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    return user
+
+def _download(stream, name: str, file_format: str, gzip: bool) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{file_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[file_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no"  # Let reverse proxies pass chunks through as they are produced
+        }
+    )
+
+# Stream every lead (optionally filtered) as CSV or NDJSON
+@router.get("/export/leads")
+async def export_leads(
+    format: str = "csv",
+    gzip: bool = False,
+    campaign_id: Optional[str] = None,
+    status: Optional[str] = None,
+    tag: Optional[str] = None,
+    user: User = Depends(get_current_user)
+):
+    try:
+        stream = export_service.lead_export(
+            user.id, format, gzip=gzip,
+            filters={"campaign_id": campaign_id, "status": status, "tag": tag}
+        )
+        return _download(stream, "leads", format, gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Lead export error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to export leads")
+
+# Stream campaigns as CSV or NDJSON; full content only when asked for
+@router.get("/export/campaigns")
+async def export_campaigns(
+    format: str = "csv",
+    gzip: bool = False,
+    include_content: bool = False,
+    status: Optional[str] = None,
+    campaign_type: Optional[str] = None,
+    user: User = Depends(get_current_user)
+):
+    try:
+        stream = export_service.campaign_export(
+            user.id, format, gzip=gzip, include_content=include_content,
+            filters={"status": status, "campaign_type": campaign_type}
+        )
+        return _download(stream, "campaigns", format, gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Campaign export error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to export campaigns")
@@ -1,14 +1,25 @@
 # routes/leads.py
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Optional
+from datetime import datetime
 import logging
 
 from config import db
-from models import User, Lead, LeadStatusUpdate
+from models import User, Lead, LeadStatusUpdate, LeadBulkStatusRequest, LeadBulkTagRequest, LeadBulkRequest
+from services import StatsService, RollupService, LeadService, ScoringService
+from services.stats_service import status_change_deltas
+from utils import build_response
+from utils.response_cache import response_cache, cached_json_response
 
 router = APIRouter()
 security = HTTPBearer()
 
+stats_service = StatsService()
+rollup_service = RollupService()
+lead_service = LeadService()
+scoring_service = ScoringService()
+
 # Authentication dependency
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
@@ -19,11 +30,38 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 
 # Leads Management
 @router.get("/leads")
-async def get_leads(user: User = Depends(get_current_user)):
-    """Get all leads for user"""
+async def get_leads(
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    campaign_id: Optional[str] = None,
+    interaction_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sort: str = "newest",
+    user: User = Depends(get_current_user)
+):
+    """Get one page of the user's leads, filtered and sorted by creation time"""
+    async def build():
+        # Each filter combination is served by a planned index; no skip, so cost is flat for any page
+        page = await lead_service.list_leads(
+            user.id, limit=limit, cursor=cursor, sort=sort,
+            filters={"status": status, "campaign_id": campaign_id, "interaction_type": interaction_type},
+            created_after=created_after, created_before=created_before
+        )
+        response = build_response(
+            success=True,
+            data=[Lead(**lead) for lead in page["items"]],
+            message="Leads fetched successfully"
+        )
+        response["pagination"] = page["pagination"]
+        return response
+
     try:
-        leads = await db.leads.find({"user_id": user.id}).sort("created_at", -1).to_list(1000)
-        return [Lead(**lead) for lead in leads]
+        return await cached_json_response(request, user.id, ("leads",), build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Get leads error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch leads")
@@ -35,15 +73,69 @@ async def update_lead_status(lead_id: str, request: LeadStatusUpdate, user: User
         if request.status not in ["cold", "warm", "hot"]:
             raise HTTPException(status_code=400, detail="Invalid status. Must be 'cold', 'warm', or 'hot'")
         
-        result = await db.leads.update_one(
+        previous = await db.leads.find_one_and_update(
             {"id": lead_id, "user_id": user.id},
-            {"$set": {"status": request.status}}
+            {"$set": {"status": request.status, "status_source": "manual"}},
+            projection={"status": 1, "campaign_id": 1, "_id": 0}
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Lead not found")
         
+        response_cache.bump(user.id, "leads")
+        await stats_service.increment(user.id, status_change_deltas("leads", previous.get("status"), request.status))
+        await rollup_service.record_transitions([(user.id, previous.get("campaign_id"), previous.get("status"), request.status)])
         return {"message": "Lead status updated successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Update lead status error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to update lead status")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to update lead status")
+
+# Bulk status change for ids or a filter, e.g. {"filter": {"campaign_id": "...", "status": "cold"}, "status": "warm"}
+@router.post("/leads/bulk/status")
+async def bulk_update_lead_status(request: LeadBulkStatusRequest, user: User = Depends(get_current_user)):
+    try:
+        result = await lead_service.bulk_update_status(user.id, request.status, ids=request.ids, lead_filter=request.filter)
+        return build_response(success=True, data=result, message="Lead statuses updated")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Bulk lead status error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to update leads")
+
+# Bulk tag assignment/removal
+@router.post("/leads/bulk/tags")
+async def bulk_tag_leads(request: LeadBulkTagRequest, user: User = Depends(get_current_user)):
+    try:
+        result = await lead_service.bulk_tag(user.id, add=request.add, remove=request.remove, ids=request.ids, lead_filter=request.filter)
+        return build_response(success=True, data=result, message="Lead tags updated")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Bulk lead tag error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to tag leads")
+
+# Bulk deletion
+@router.post("/leads/bulk/delete")
+async def bulk_delete_leads(request: LeadBulkRequest, user: User = Depends(get_current_user)):
+    try:
+        result = await lead_service.bulk_delete(user.id, ids=request.ids, lead_filter=request.filter)
+        return build_response(success=True, data=result, message="Leads deleted")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Bulk lead delete error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to delete leads")
+
+# Recompute scores with current weights and recency decay; only status changes are written
+@router.post("/leads/rescore")
+async def rescore_leads(campaign_id: Optional[str] = None, dry_run: bool = False, user: User = Depends(get_current_user)):
+    try:
+        result = await scoring_service.rescore(user.id, campaign_id=campaign_id, dry_run=dry_run)
+        return build_response(success=True, data=result, message="Lead scores recomputed")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Lead rescore error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to rescore leads")
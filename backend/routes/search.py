@@ -0,0 +1,71 @@
+# routes/search.py
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Optional
+import logging
+
+from models import User
+from services import AuthService, SearchService
+from utils import build_response
+from utils.response_cache import cached_json_response
+
+router = APIRouter()
+security = HTTPBearer()
+
+# Initialize services
+search_service = SearchService()
+auth_service = AuthService()
+
+# Authentication dependency
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    user = await auth_service.get_user_by_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    return user
+
+# Search campaign titles, hashtags and content
+@router.get("/search/campaigns")
+async def search_campaigns(
+    request: Request,
+    q: str,
+    page: int = 1,
+    limit: Optional[int] = None,
+    user: User = Depends(get_current_user)
+):
+    async def build():
+        result = await search_service.search_campaigns(user.id, q, page=page, limit=limit)
+        response = build_response(success=True, data=result["items"], message="Campaign search completed")
+        response["pagination"] = result["pagination"]
+        return response
+
+    try:
+        return await cached_json_response(request, user.id, ("campaigns",), build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Campaign search error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search campaigns")
+
+# Search lead emails, names and notes
+@router.get("/search/leads")
+async def search_leads(
+    request: Request,
+    q: str,
+    page: int = 1,
+    limit: Optional[int] = None,
+    user: User = Depends(get_current_user)
+):
+    async def build():
+        result = await search_service.search_leads(user.id, q, page=page, limit=limit)
+        response = build_response(success=True, data=result["items"], message="Lead search completed")
+        response["pagination"] = result["pagination"]
+        return response
+
+    try:
+        return await cached_json_response(request, user.id, ("leads",), build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Lead search error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search leads")
@@ -0,0 +1,70 @@
+# routes/suppressions.py
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import logging
+
+from models import User, SuppressionRequest
+from services import AuthService, SuppressionService
+from utils import build_response, validate_email_list
+
+router = APIRouter()
+security = HTTPBearer()
+
+# Initialize services
+suppression_service = SuppressionService()
+auth_service = AuthService()
+
+# Authentication dependency
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    user = await auth_service.get_user_by_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    return user
+
+# List suppressed addresses
+@router.get("/suppressions")
+async def get_suppressions(user: User = Depends(get_current_user)):
+    try:
+        suppressions = await suppression_service.get_suppressions(user.id)
+        return build_response(
+            success=True,
+            data=suppressions,
+            message="Suppression list fetched successfully"
+        )
+    except Exception as e:
+        logging.error(f"Get suppressions error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch suppression list")
+
+# Add addresses to the suppression list
+@router.post("/suppressions")
+async def add_suppressions(request: SuppressionRequest, user: User = Depends(get_current_user)):
+    if not suppression_service.validate_reason(request.reason):
+        raise HTTPException(status_code=400, detail="Invalid reason. Must be 'bounce', 'unsubscribe', or 'complaint'")
+
+    validation = validate_email_list(request.emails)
+    if not validation["valid_emails"]:
+        return build_response(success=False, errors=validation["errors"])
+
+    try:
+        added = await suppression_service.add_suppressions(user.id, validation["valid_emails"], request.reason)
+        return build_response(
+            success=True,
+            data={"added_count": added, "invalid_emails": validation["invalid_emails"]},
+            message="Suppression list updated successfully"
+        )
+    except Exception as e:
+        logging.error(f"Add suppressions error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to update suppression list")
+
+# Remove an address from the suppression list
+@router.delete("/suppressions/{email}")
+async def remove_suppression(email: str, user: User = Depends(get_current_user)):
+    try:
+        removed = await suppression_service.remove_suppression(user.id, email)
+    except Exception as e:
+        logging.error(f"Remove suppression error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to update suppression list")
+    if not removed:
+        raise HTTPException(status_code=404, detail="Address not on suppression list")
+    return build_response(success=True, message="Address removed from suppression list")
@@ -0,0 +1,32 @@
+# routes/tracking.py
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import RedirectResponse
+
+from services.tracking_service import TrackingService, TRACKING_PIXEL, verify_tracking
+
+router = APIRouter()
+
+# Shared buffer; main.py starts and stops its flush task
+tracking_service = TrackingService()
+
+PIXEL_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate, private",
+    "Pragma": "no-cache"
+}
+
+# Open tracking pixel
+@router.get("/track/open/{campaign_id}/{lead_id}/{signature}.gif", include_in_schema=False)
+async def track_open(campaign_id: str, lead_id: str, signature: str):
+    """Record an open and return the pixel; bad signatures still get the pixel"""
+    if verify_tracking(signature, campaign_id, lead_id):
+        tracking_service.record_open(campaign_id, lead_id)
+    return Response(content=TRACKING_PIXEL, media_type="image/gif", headers=PIXEL_HEADERS)
+
+# Click redirect
+@router.get("/track/click/{campaign_id}/{lead_id}", include_in_schema=False)
+async def track_click(campaign_id: str, lead_id: str, url: str = Query(...), sig: str = Query(...)):
+    """Record a click and redirect to the signed target URL"""
+    if not verify_tracking(sig, campaign_id, lead_id, url):
+        raise HTTPException(status_code=400, detail="Invalid tracking link")
+    tracking_service.record_click(campaign_id, lead_id)
+    return RedirectResponse(url=url, status_code=302)
@@ -1,6 +1,14 @@
 from .ai_service import AIService
 from .email_service import EmailService
 from .auth_service import AuthService
+from .stats_service import StatsService
+from .rollup_service import RollupService
+from .revision_service import RevisionService
+from .search_service import SearchService
+from .lead_service import LeadService
+from .scoring_service import ScoringService
+from .archive_service import ArchiveService
+from .export_service import ExportService
 from .campaign_service import CampaignService
 from .e3t_evaluator import E3TEvaluator
 from .injection_engine import InjectionEngine
@@ -9,6 +17,12 @@ from .intent_matcher import IntentMatcher
 from .seo_brainstorm import SEOBrainstormService
 from .domain_service import DomainService
 from .crawler_service import CrawlerService
+from .suppression_service import SuppressionService
+from .audience_service import AudienceService
+from .tracking_service import TrackingService
+from .sender_router import SenderRouter
+from .bounce_service import BounceProcessor
+from .reply_sync_service import ReplySyncService
 
 __all__ = [
     "AIService",
@@ -21,5 +35,19 @@ __all__ = [
     "IntentMatcher",
     "SEOBrainstormService",
     "DomainService",
-    "CrawlerService"
+    "CrawlerService",
+    "SuppressionService",
+    "AudienceService",
+    "TrackingService",
+    "SenderRouter",
+    "BounceProcessor",
+    "ReplySyncService",
+    "StatsService",
+    "RollupService",
+    "RevisionService",
+    "SearchService",
+    "LeadService",
+    "ScoringService",
+    "ArchiveService",
+    "ExportService"
 ]
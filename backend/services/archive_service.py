@@ -0,0 +1,211 @@
+# services/archive_service.py
+import logging
+import zlib
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+
+import bson
+from bson import Binary
+from pymongo import UpdateOne
+
+from config import settings, db
+from models import CampaignSummary
+from utils.content_codec import unpack_content
+from utils.helpers import build_preview
+from utils.response_cache import response_cache
+from .stats_service import StatsService, merge_deltas
+
+# Fields a hot campaign stub keeps once its campaign is archived: what list views show
+STUB_FIELDS = set(CampaignSummary.model_fields) | {"revision"}
+
+def pack_items(items: List[Dict[str, Any]]) -> Binary:
+    """BSON-encode and zlib-compress documents, keeping dates and binary content intact"""
+    return Binary(zlib.compress(bson.encode({"items": items}), settings.content_compression_level))
+
+def unpack_items(payload: bytes) -> List[Dict[str, Any]]:
+    return bson.decode(zlib.decompress(payload))["items"]
+
+class ArchiveService:
+    """Moves old sent campaigns, their leads and content history to cold storage.
+
+    The ``campaign_archive`` collection holds, per campaign, one compressed
+    copy of the full campaign document plus compressed chunks of its leads
+    and revisions (``archive_chunk_size`` per chunk). The hot campaign is cut
+    down to a summary stub flagged ``archived``, and its leads and revisions
+    leave the hot collections, so their indexes only cover live data.
+
+    Archiving writes the archive first, then deletes the hot documents it
+    archived, then writes the stub; a run interrupted at any step is safe to
+    repeat (chunks may then hold copies, which restore collapses by id).
+    """
+
+    COLLECTION = "campaign_archive"
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.collection = self.db[self.COLLECTION]
+        self.stats_service = StatsService(self.db)
+        self.logger = logging.getLogger(__name__)
+
+    # ===== Archiving =====
+
+    async def archive_old_campaigns(
+        self,
+        older_than_days: Optional[int] = None,
+        batch_size: int = 50,
+        dry_run: bool = False
+    ) -> Dict[str, int]:
+        """Archive sent campaigns created more than ``archive_after_days`` ago"""
+        days = older_than_days if older_than_days is not None else settings.archive_after_days
+        if days < 1:
+            raise ValueError("Archive age must be at least one day")
+        query = {"status": "sent", "archived": {"$ne": True}, "created_at": {"$lt": datetime.utcnow() - timedelta(days=days)}}
+        stats = {"campaigns": 0, "leads": 0, "revisions": 0}
+        if dry_run:
+            stats["campaigns"] = await self.db.campaigns.count_documents(query)
+            return stats
+        while True:
+            # Archived campaigns drop out of the query, so each batch starts from the top
+            campaigns = await self.db.campaigns.find(query, {"id": 1, "user_id": 1, "_id": 0}).sort("created_at", 1).limit(
+                batch_size
+            ).to_list(batch_size)
+            if not campaigns:
+                return stats
+            for campaign in campaigns:
+                archived = await self.archive_campaign(campaign["id"], campaign["user_id"])
+                if archived is not None:
+                    stats["campaigns"] += 1
+                    stats["leads"] += archived["leads"]
+                    stats["revisions"] += archived["revisions"]
+
+    async def archive_campaign(self, campaign_id: str, user_id: str) -> Optional[Dict[str, int]]:
+        """Archive one campaign; None if it does not exist or is already archived"""
+        campaign = await self.db.campaigns.find_one({"id": campaign_id, "user_id": user_id, "archived": {"$ne": True}}, {"_id": 0})
+        if campaign is None:
+            return None
+        try:
+            await self.collection.replace_one(
+                {"campaign_id": campaign_id, "kind": "campaign"},
+                self._entry(campaign_id, user_id, "campaign", [campaign]),
+                upsert=True
+            )
+            leads = await self._archive_chunks(self.db.leads, campaign_id, user_id, "leads")
+            revisions = await self._archive_chunks(self.db.campaign_revisions, campaign_id, user_id, "revisions")
+
+            stub = {
+                "archived": True,
+                "archived_at": datetime.utcnow(),
+                "preview": campaign.get("preview") or build_preview(unpack_content(campaign.get("content")))
+            }
+            dropped = {field: "" for field in campaign if field not in STUB_FIELDS}
+            update: Dict[str, Any] = {"$set": stub}
+            if dropped:
+                update["$unset"] = dropped
+            await self.db.campaigns.update_one({"id": campaign_id, "user_id": user_id}, update)
+        except Exception as e:
+            self.logger.error(f"Archive campaign {campaign_id} error: {str(e)}")
+            raise Exception("Failed to archive campaign")
+
+        response_cache.bump(user_id, "campaigns", "leads", campaign_ids=[campaign_id])
+        return {"leads": len(leads), "revisions": len(revisions)}
+
+    async def _archive_chunks(self, collection, campaign_id: str, user_id: str, kind: str) -> List[Dict[str, Any]]:
+        """Copy a campaign's documents into archive chunks, then delete exactly those from the hot collection"""
+        chunk_size = max(1, settings.archive_chunk_size)
+        archived: List[Dict[str, Any]] = []
+        chunk: List[Dict[str, Any]] = []
+        cursor = collection.find({"campaign_id": campaign_id}).batch_size(chunk_size)
+        async for doc in cursor:
+            chunk.append(doc)
+            if len(chunk) >= chunk_size:
+                await self._write_chunk(collection, campaign_id, user_id, kind, chunk)
+                archived.extend(chunk)
+                chunk = []
+        if chunk:
+            await self._write_chunk(collection, campaign_id, user_id, kind, chunk)
+            archived.extend(chunk)
+        return archived
+
+    async def _write_chunk(self, collection, campaign_id: str, user_id: str, kind: str, chunk: List[Dict[str, Any]]):
+        await self.collection.insert_one(self._entry(campaign_id, user_id, kind, chunk))
+        await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in chunk]}})
+        if kind == "leads":
+            # Per chunk, so a run interrupted later has already counted the leads it moved
+            await self._apply_lead_counters(user_id, chunk, sign=-1)
+
+    @staticmethod
+    def _entry(campaign_id: str, user_id: str, kind: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        payload = pack_items(items)
+        return {
+            "campaign_id": campaign_id,
+            "user_id": user_id,
+            "kind": kind,
+            "count": len(items),
+            "archived_at": datetime.utcnow(),
+            "payload": payload
+        }
+
+    # ===== Reads and restore =====
+
+    async def get_campaign(self, campaign_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Full archived campaign document, read without restoring it"""
+        entry = await self.collection.find_one({"campaign_id": campaign_id, "user_id": user_id, "kind": "campaign"})
+        if entry is None:
+            return None
+        return unpack_items(entry["payload"])[0]
+
+    async def restore_campaign(self, campaign_id: str, user_id: str) -> Optional[Dict[str, int]]:
+        """Move an archived campaign with its leads and revisions back to the hot collections"""
+        entries = await self.collection.find({"campaign_id": campaign_id, "user_id": user_id}).to_list(None)
+        campaign = next((unpack_items(entry["payload"])[0] for entry in entries if entry["kind"] == "campaign"), None)
+        if campaign is None:
+            return None
+
+        restored: Dict[str, List[Dict[str, Any]]] = {"leads": [], "revisions": []}
+        try:
+            for entry in entries:
+                if entry["kind"] in restored:
+                    restored[entry["kind"]].extend(unpack_items(entry["payload"]))
+            # Upserts keyed by _id: chunks repeated by an interrupted archive run restore once
+            inserted_leads = await self._restore_documents(self.db.leads, restored["leads"])
+            await self._restore_documents(self.db.campaign_revisions, restored["revisions"])
+            await self.db.campaigns.replace_one({"id": campaign_id, "user_id": user_id}, campaign, upsert=True)
+            await self.collection.delete_many({"_id": {"$in": [entry["_id"] for entry in entries]}})
+        except Exception as e:
+            self.logger.error(f"Restore campaign {campaign_id} error: {str(e)}")
+            raise Exception("Failed to restore campaign")
+
+        await self._apply_lead_counters(user_id, inserted_leads, sign=1)
+        response_cache.bump(user_id, "campaigns", "leads", campaign_ids=[campaign_id])
+        return {"leads": len(inserted_leads), "revisions": len({doc["_id"] for doc in restored["revisions"]})}
+
+    async def _restore_documents(self, collection, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert archived documents that are not already back; returns the ones inserted"""
+        unique = list({doc["_id"]: doc for doc in documents}.values())
+        inserted: List[Dict[str, Any]] = []
+        chunk_size = max(1, settings.archive_chunk_size)
+        for start in range(0, len(unique), chunk_size):
+            chunk = unique[start:start + chunk_size]
+            result = await collection.bulk_write(
+                [
+                    UpdateOne({"_id": doc["_id"]}, {"$setOnInsert": {field: value for field, value in doc.items() if field != "_id"}}, upsert=True)
+                    for doc in chunk
+                ],
+                ordered=False
+            )
+            inserted.extend(chunk[index] for index in result.upserted_ids)
+        return inserted
+
+    async def delete_campaign(self, campaign_id: str):
+        """Drop everything archived for a deleted campaign"""
+        await self.collection.delete_many({"campaign_id": campaign_id})
+
+    async def _apply_lead_counters(self, user_id: str, leads: List[Dict[str, Any]], sign: int):
+        # Archived leads leave the live lead counters, matching what reconciliation counts
+        if not leads:
+            return
+        deltas: Dict[str, int] = {"leads.total": sign * len(leads)}
+        for lead in leads:
+            if lead.get("status"):
+                merge_deltas(deltas, {f"leads.by_status.{lead['status']}": sign})
+        await self.stats_service.increment(user_id, deltas)
@@ -0,0 +1,288 @@
+# services/audience_service.py
+import csv
+import io
+import json
+import logging
+from itertools import chain, islice
+from typing import BinaryIO, Iterable, Iterator, List, Dict, Any, Optional, Set, TextIO
+from datetime import datetime
+
+from starlette.concurrency import run_in_threadpool
+
+from config import db
+from models import AudienceList
+from utils.constants import ERROR_MESSAGES
+from utils.validators import validate_email_format
+from .suppression_service import normalize_email
+
+class AudienceParser:
+    """Extracts candidate addresses from a CSV, NDJSON or JSON text stream.
+
+    CSV input may carry a header row with an ``email`` column; without one the
+    first cell containing ``@`` in each row is used. NDJSON lines, and the
+    elements of a JSON array, may be objects with an ``email`` key or bare
+    JSON strings.
+    """
+
+    READ_SIZE = 64 * 1024
+    MAX_RECORD_SIZE = 64 * 1024  # per JSON array element
+
+    def __init__(self, file_format: str):
+        self.file_format = file_format
+        self.malformed = 0
+
+    def candidates(self, stream: TextIO) -> Iterator[str]:
+        if self.file_format == "json":
+            return self._parse_json(stream)
+        if self.file_format == "ndjson":
+            return self._parse_ndjson(stream)
+        return self._parse_csv(stream)
+
+    def _parse_csv(self, stream: TextIO) -> Iterator[str]:
+        # csv.reader pulls further lines itself when a quoted field spans them
+        email_column: Optional[int] = None
+        header_checked = False
+        for row in csv.reader(stream):
+            if not any(cell.strip() for cell in row):
+                continue
+            if not header_checked:
+                header_checked = True
+                headers = [cell.strip().lower() for cell in row]
+                if "email" in headers:
+                    email_column = headers.index("email")
+                    continue
+
+            if email_column is not None:
+                if email_column < len(row):
+                    yield row[email_column]
+                else:
+                    self.malformed += 1
+                continue
+
+            cell = next((cell for cell in row if "@" in cell), None)
+            if cell is None:
+                self.malformed += 1
+            else:
+                yield cell
+
+    def _parse_ndjson(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.malformed += 1
+                continue
+            candidate = self._candidate(record)
+            if candidate is not None:
+                yield candidate
+
+    def _parse_json(self, stream: TextIO) -> Iterator[str]:
+        """A top-level JSON array, decoded one element at a time; anything else is read as NDJSON"""
+        text = ""
+        while not text.strip():
+            chunk = stream.read(self.READ_SIZE)
+            if not chunk:
+                return
+            text += chunk
+        text = text.lstrip()
+        if not text.startswith("["):
+            # Complete the partially read line before handing the rest over line by line
+            head = (text + stream.readline()).splitlines()
+            yield from self._parse_ndjson(chain(head, stream))
+            return
+
+        decoder = json.JSONDecoder()
+        position, expect_item, eof = 1, True, False
+        while True:
+            while position < len(text) and text[position].isspace():
+                position += 1
+            if position == len(text):
+                if eof:
+                    self.malformed += 1  # truncated array
+                    return
+                text, position = text[position:] + stream.read(self.READ_SIZE), 0
+                eof = position == len(text)
+                continue
+
+            if text[position] == "]":
+                return
+            if not expect_item:
+                if text[position] != ",":
+                    self.malformed += 1
+                    return
+                position, expect_item = position + 1, True
+                continue
+
+            try:
+                record, end = decoder.raw_decode(text, position)
+            except ValueError:
+                record, end = None, None
+                if len(text) - position > self.MAX_RECORD_SIZE:
+                    self.malformed += 1
+                    return
+            if not eof and (end is None or end == len(text)):
+                # The element may continue in the next chunk (a bare number could, too)
+                chunk = stream.read(self.READ_SIZE)
+                text, position = text[position:] + chunk, 0
+                eof = not chunk
+                continue
+            if end is None:
+                self.malformed += 1
+                return
+
+            candidate = self._candidate(record)
+            if candidate is not None:
+                yield candidate
+            position, expect_item = end, False
+
+    def _candidate(self, record: Any) -> Optional[str]:
+        if isinstance(record, str):
+            return record
+        if isinstance(record, dict):
+            value = next((v for k, v in record.items() if k.lower() == "email"), None)
+            if isinstance(value, str):
+                return value
+        self.malformed += 1
+        return None
+
+def take(candidates: Iterator[str], size: int) -> List[str]:
+    return list(islice(candidates, size))
+
+class AudienceService:
+    """Service for reusable, pre-validated recipient lists"""
+
+    CHUNK_SIZE = 1000  # addresses per audience_list_chunks document
+    FORMATS = {".csv": "csv", ".txt": "csv", ".json": "json", ".ndjson": "ndjson"}
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.logger = logging.getLogger(__name__)
+
+    def detect_format(self, filename: str) -> Optional[str]:
+        """Map an upload filename to a streaming parser format"""
+        extension = '.' + filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        return self.FORMATS.get(extension)
+
+    async def import_list(self, user_id: str, name: str, filename: str, file: BinaryIO) -> Dict[str, Any]:
+        """Stream an uploaded file into a new audience list.
+
+        ``file`` is a binary file object such as ``UploadFile.file``; the
+        upload size limit is enforced by ``UploadLimitMiddleware``. It is
+        decoded and parsed incrementally, a chunk of addresses at a time, in
+        the thread pool; only the dedup set and one pending chunk are held in
+        memory.
+        """
+        file_format = self.detect_format(filename)
+        if not file_format:
+            raise ValueError(ERROR_MESSAGES["INVALID_FILE_FORMAT"])
+
+        audience = AudienceList(user_id=user_id, name=name, source_filename=filename)
+        await self.db.audience_lists.insert_one(audience.dict())
+
+        parser = AudienceParser(file_format)
+        # newline="" hands csv the raw line endings, as the csv module requires
+        stream = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+        candidates = parser.candidates(stream)
+        seen: Set[str] = set()
+        counts = {"invalid": 0, "duplicates": 0, "chunks": 0}
+
+        try:
+            while True:
+                batch = await run_in_threadpool(take, candidates, self.CHUNK_SIZE)
+                if not batch:
+                    break
+                pending = []
+                for candidate in batch:
+                    email = normalize_email(candidate)
+                    if not validate_email_format(email):
+                        counts["invalid"] += 1
+                        continue
+                    if email in seen:
+                        counts["duplicates"] += 1
+                        continue
+                    seen.add(email)
+                    pending.append(email)
+                if pending:
+                    await self.db.audience_list_chunks.insert_one({
+                        "list_id": audience.id,
+                        "user_id": user_id,
+                        "seq": counts["chunks"],
+                        "count": len(pending),
+                        "emails": pending
+                    })
+                    counts["chunks"] += 1
+        except Exception:
+            await self._discard(audience.id)
+            raise
+        finally:
+            # Leave closing the upload to its owner
+            stream.detach()
+
+        if not seen:
+            await self._discard(audience.id)
+            raise ValueError(ERROR_MESSAGES["NO_VALID_RECIPIENTS"])
+
+        summary = {
+            "status": "ready",
+            "member_count": len(seen),
+            "invalid_count": counts["invalid"] + parser.malformed,
+            "duplicate_count": counts["duplicates"],
+            "chunk_count": counts["chunks"],
+            "updated_at": datetime.utcnow()
+        }
+        await self.db.audience_lists.update_one({"id": audience.id}, {"$set": summary})
+        return {**audience.dict(), **summary}
+
+    async def _discard(self, list_id: str):
+        try:
+            await self.db.audience_list_chunks.delete_many({"list_id": list_id})
+            await self.db.audience_lists.delete_one({"id": list_id})
+        except Exception as e:
+            self.logger.error(f"Audience cleanup error: {str(e)}")
+
+    async def get_user_lists(self, user_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get audience list metadata for a user"""
+        try:
+            return await self.db.audience_lists.find(
+                {"user_id": user_id},
+                {"_id": 0}
+            ).sort("created_at", -1).limit(limit).to_list(limit)
+        except Exception as e:
+            self.logger.error(f"Get audience lists error: {str(e)}")
+            raise Exception("Failed to fetch audience lists")
+
+    async def get_list(self, list_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get audience list metadata by ID for user"""
+        return await self.db.audience_lists.find_one({"id": list_id, "user_id": user_id}, {"_id": 0})
+
+    async def get_members(self, list_id: str, user_id: str) -> Optional[List[str]]:
+        """Get every address in a ready list, or None if it doesn't exist"""
+        audience = await self.db.audience_lists.find_one(
+            {"id": list_id, "user_id": user_id, "status": "ready"},
+            {"_id": 1}
+        )
+        if not audience:
+            return None
+
+        members: List[str] = []
+        cursor = self.db.audience_list_chunks.find(
+            {"list_id": list_id},
+            {"emails": 1, "_id": 0}
+        ).sort("seq", 1)
+        async for chunk in cursor:
+            members.extend(chunk["emails"])
+        return members
+
+    async def delete_list(self, list_id: str, user_id: str) -> bool:
+        """Delete an audience list and its member chunks"""
+        try:
+            result = await self.db.audience_lists.delete_one({"id": list_id, "user_id": user_id})
+            if result.deleted_count == 0:
+                return False
+            await self.db.audience_list_chunks.delete_many({"list_id": list_id})
+            return True
+        except Exception as e:
+            self.logger.error(f"Delete audience list error: {str(e)}")
+            raise Exception("Failed to delete audience list")
@@ -0,0 +1,258 @@
+# services/bounce_service.py
+import logging
+from dataclasses import dataclass
+from email import policy
+from email.message import Message
+from email.parser import BytesParser, HeaderParser
+from email.utils import parseaddr
+from typing import Iterable, List, Dict, Any, Optional, Set, Tuple
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from config import settings, db
+from .suppression_service import SuppressionService, normalize_email
+
+@dataclass
+class BounceRecord:
+    """One failed recipient extracted from a DSN"""
+    email: str
+    bounce_type: str  # hard, soft
+    status: str = ""
+    diagnostic: str = ""
+    original_message_id: Optional[str] = None
+    original_sender: Optional[str] = None
+
+def _header_value(block: Message, name: str) -> str:
+    value = block.get(name)
+    return str(value).strip() if value else ""
+
+def _address_from_field(value: str) -> str:
+    # Final-Recipient / Original-Recipient look like "rfc822; user@example.com"
+    return value.split(";", 1)[-1].strip().strip("<>")
+
+def classify_bounce(action: str, status: str) -> Optional[str]:
+    """Map a DSN Action/Status pair to hard, soft, or None when not a failure"""
+    action = action.lower()
+    code = status.split()[0] if status else ""
+    if action in ("delivered", "relayed", "expanded"):
+        return None
+    if code.startswith("5"):
+        return "hard"
+    if code.startswith("4") or action == "delayed":
+        return "soft"
+    if action == "failed":
+        return "hard"
+    return None
+
+def parse_dsn(message: Message) -> List[BounceRecord]:
+    """Extract bounce records from an RFC 3464 report or a legacy bounce"""
+    records: List[BounceRecord] = []
+    original_id = None
+    original_from = None
+
+    for part in message.walk():
+        content_type = part.get_content_type()
+        if content_type == "message/delivery-status":
+            for block in part.get_payload():
+                if not isinstance(block, Message):
+                    continue
+                recipient = _header_value(block, "Final-Recipient") or _header_value(block, "Original-Recipient")
+                if not recipient:
+                    continue
+                action = _header_value(block, "Action")
+                status = _header_value(block, "Status")
+                bounce_type = classify_bounce(action, status)
+                if bounce_type:
+                    records.append(BounceRecord(
+                        email=_address_from_field(recipient),
+                        bounce_type=bounce_type,
+                        status=status,
+                        diagnostic=_header_value(block, "Diagnostic-Code")[:500]
+                    ))
+        elif content_type == "message/rfc822" and original_id is None:
+            payload = part.get_payload()
+            if payload and isinstance(payload[0], Message):
+                original_id = _header_value(payload[0], "Message-ID") or None
+                original_from = _header_value(payload[0], "From") or None
+        elif content_type == "text/rfc822-headers" and original_id is None:
+            headers = HeaderParser().parsestr(part.get_payload(decode=True).decode("utf-8", "replace"))
+            original_id = _header_value(headers, "Message-ID") or None
+            original_from = _header_value(headers, "From") or None
+
+    # Non-DSN bounces (e.g. some Gmail notices) only carry X-Failed-Recipients
+    if not records:
+        failed = _header_value(message, "X-Failed-Recipients")
+        records = [
+            BounceRecord(email=address.strip(), bounce_type="hard")
+            for address in failed.split(",") if address.strip()
+        ]
+
+    # Bounces go back to the envelope sender, so the DSN's own To names it when the original is not attached
+    sender = parseaddr(original_from or _header_value(message, "To"))[1]
+    for record in records:
+        record.original_message_id = original_id
+        record.original_sender = normalize_email(sender) if sender else None
+    return records
+
+class BounceProcessor:
+    """Streams bounce messages from a mailbox source and applies them in bulk.
+
+    Messages are parsed one at a time; bounce records are accumulated into
+    batches of ``batch_size`` and each batch costs one lead lookup, one
+    ``bulk_write`` on leads and one on suppressions regardless of its size.
+
+    A bounce only touches the lead it was sent as: the one whose Message-ID
+    the DSN quotes. DSNs without the original Message-ID fall back to the
+    recipient's leads sent from the same sender account; bounces that match
+    neither are counted as unmatched and change nothing.
+    """
+
+    def __init__(self, database=None, batch_size: int = 500, soft_threshold: Optional[int] = None):
+        self.db = database if database is not None else db
+        self.batch_size = batch_size
+        self.soft_threshold = soft_threshold or settings.bounce_soft_threshold
+        self.suppression_service = SuppressionService(self.db)
+        self.parser = BytesParser(policy=policy.compat32)
+        self.logger = logging.getLogger(__name__)
+
+    async def process_source(self, source) -> Dict[str, Any]:
+        """Consume every message from a MboxSource, MaildirSource or IMAPSource"""
+        stats = {"messages": 0, "bounces": 0, "unmatched": 0, "hard": 0, "soft": 0, "leads_updated": 0, "suppressed": 0}
+        pending: List[BounceRecord] = []
+        pending_keys: List[str] = []
+
+        try:
+            for key, raw in source.iter_messages():
+                stats["messages"] += 1
+                try:
+                    records = parse_dsn(self.parser.parsebytes(raw))
+                except Exception as e:
+                    self.logger.warning(f"Skipping unparsable message {key}: {str(e)}")
+                    records = []
+                pending.extend(records)
+                pending_keys.append(key)
+
+                if len(pending) >= self.batch_size:
+                    await self._apply_batch(pending, stats)
+                    source.acknowledge(pending_keys)
+                    pending, pending_keys = [], []
+
+            if pending or pending_keys:
+                await self._apply_batch(pending, stats)
+                source.acknowledge(pending_keys)
+        finally:
+            source.close()
+
+        self.logger.info(f"Bounce processing complete: {stats}")
+        return stats
+
+    async def _apply_batch(self, records: List[BounceRecord], stats: Dict[str, Any]):
+        if not records:
+            return
+        now = datetime.utcnow()
+        stats["bounces"] += len(records)
+
+        # One bounce per lead; a hard bounce outranks soft ones in the same batch
+        targets: Dict[str, Tuple[BounceRecord, Dict[str, Any]]] = {}
+        for record, leads in await self._resolve_leads(records):
+            if not leads:
+                stats["unmatched"] += 1
+            for lead in leads:
+                current = targets.get(lead["id"])
+                if current is None or current[0].bounce_type != "hard":
+                    targets[lead["id"]] = (record, lead)
+        hard = {lead_id: target for lead_id, target in targets.items() if target[0].bounce_type == "hard"}
+        soft = {lead_id: target for lead_id, target in targets.items() if target[0].bounce_type != "hard"}
+        stats["hard"] += len(hard)
+        stats["soft"] += len(soft)
+
+        operations = []
+        for lead_id, (record, lead) in hard.items():
+            operations.append(UpdateOne(
+                {"id": lead_id, "user_id": lead["user_id"], "interaction_type": "sent"},
+                {"$set": {
+                    "interaction_type": "bounced",
+                    "bounce_type": "hard",
+                    "bounce_status": record.status,
+                    "bounced_at": now
+                }}
+            ))
+        for lead_id, (record, lead) in soft.items():
+            operations.append(UpdateOne(
+                {"id": lead_id, "user_id": lead["user_id"], "interaction_type": "sent"},
+                {"$inc": {"soft_bounce_count": 1}, "$set": {"bounce_status": record.status, "bounced_at": now}}
+            ))
+        if operations:
+            result = await self.db.leads.bulk_write(operations, ordered=False)
+            stats["leads_updated"] += result.modified_count
+
+        to_suppress: Set[Tuple[str, str]] = {
+            (lead["user_id"], normalize_email(lead["email"])) for _, lead in hard.values() if lead.get("email")
+        }
+        if soft:
+            # Repeated soft bounces are treated like hard ones
+            to_suppress |= await self._repeated_soft_bounces(soft.values())
+
+        if to_suppress:
+            stats["suppressed"] += await self.suppression_service.suppress_many(to_suppress, "bounce", source="dsn")
+
+    async def _repeated_soft_bounces(self, targets: Iterable[Tuple[BounceRecord, Dict[str, Any]]]) -> Set[Tuple[str, str]]:
+        """(user_id, email) pairs whose soft bounces, summed over all the user's leads for the address, reach the threshold.
+
+        Leads are one per campaign and recipient, and each is sent once, so
+        an address that soft-bounces once in each of several campaigns only
+        adds up across its leads.
+        """
+        scopes: Dict[str, Set[str]] = {}
+        for _, lead in targets:
+            if lead.get("email"):
+                scopes.setdefault(lead["user_id"], set()).update({lead["email"], normalize_email(lead["email"])})
+        if not scopes:
+            return set()
+        pipeline = [
+            {"$match": {
+                "$or": [{"user_id": user_id, "email": {"$in": list(emails)}} for user_id, emails in scopes.items()],
+                "soft_bounce_count": {"$gt": 0}
+            }},
+            {"$group": {"_id": {"user_id": "$user_id", "email": "$email"}, "soft_bounces": {"$sum": "$soft_bounce_count"}}}
+        ]
+        # At most a couple of spellings per address; fold them the way suppressions are keyed
+        totals: Dict[Tuple[str, str], int] = {}
+        async for group in self.db.leads.aggregate(pipeline):
+            key = (group["_id"]["user_id"], normalize_email(group["_id"]["email"]))
+            totals[key] = totals.get(key, 0) + group["soft_bounces"]
+        return {key for key, soft_bounces in totals.items() if soft_bounces >= self.soft_threshold}
+
+    async def _resolve_leads(self, records: List[BounceRecord]) -> List[Tuple[BounceRecord, List[Dict[str, Any]]]]:
+        """The leads each bounce belongs to: by the quoted Message-ID, else by sender and recipient"""
+        projection = {"id": 1, "user_id": 1, "email": 1, "message_id": 1, "sender": 1, "_id": 0}
+        message_ids = {record.original_message_id for record in records if record.original_message_id}
+        by_message_id: Dict[str, Dict[str, Any]] = {}
+        if message_ids:
+            cursor = self.db.leads.find({"message_id": {"$in": list(message_ids)}}, projection)
+            async for lead in cursor:
+                by_message_id[lead["message_id"]] = lead
+
+        # Lead emails keep the casing they were sent with, so match both forms
+        fallback = [record for record in records if not record.original_message_id and record.original_sender]
+        by_sender: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        if fallback:
+            cursor = self.db.leads.find(
+                {
+                    "email": {"$in": list({form for record in fallback for form in (record.email.strip(), normalize_email(record.email))})},
+                    "sender": {"$in": list({record.original_sender for record in fallback})}
+                },
+                projection
+            )
+            async for lead in cursor:
+                by_sender.setdefault((lead["sender"], normalize_email(lead["email"])), []).append(lead)
+
+        resolved = []
+        for record in records:
+            if record.original_message_id:
+                lead = by_message_id.get(record.original_message_id)
+                resolved.append((record, [lead] if lead else []))
+            else:
+                resolved.append((record, by_sender.get((record.original_sender, normalize_email(record.email)), [])))
+        return resolved
@@ -1,17 +1,32 @@
 # services/campaign_service.py
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
 
+from pymongo import UpdateOne
+
 from config import db
-from models import Campaign, User
+from models import Campaign, CampaignSummary, User
+from utils.constants import VALIDATION_RULES
+from utils.content_analysis import CONTENT_ANALYTICS_VERSION, content_fields
+from utils.content_codec import is_packed, pack_content, unpack_content
+from utils.helpers import build_preview, clamp_page_size, keyset_filter, keyset_page
+from utils.response_cache import response_cache
 from .ai_service import AIService
+from .stats_service import StatsService, campaign_counter_deltas, status_change_deltas
+from .revision_service import RevisionService, RevisionConflict
+from .archive_service import ArchiveService
+
+SUMMARY_PROJECTION = CampaignSummary.projection(VALIDATION_RULES["CAMPAIGN_PREVIEW_LENGTH"])
 
 class CampaignService:
     """Service for campaign-related business logic"""
     
     def __init__(self):
         self.ai_service = AIService()
+        self.stats_service = StatsService()
+        self.revision_service = RevisionService()
+        self.archive_service = ArchiveService()
         self.logger = logging.getLogger(__name__)
     
     async def generate_campaign(self, user: User, campaign_type: str, style: str = "persuasive", custom_prompt: Optional[str] = None) -> Dict[str, Any]:
@@ -34,17 +49,23 @@ class CampaignService:
             )
             
             # Create campaign record
+            derived = content_fields(content, campaign_type)
             campaign = Campaign(
                 user_id=user.id,
                 title=f"{campaign_type.replace('_', ' ').title()} Campaign - {datetime.now().strftime('%Y-%m-%d')}",
                 campaign_type=campaign_type,
                 content=content,
                 style=style,
-                status="draft"
+                status="draft",
+                **derived
             )
             
-            # Save to database
-            await db.campaigns.insert_one(campaign.dict())
+            # Save to database, with large content packed and the search terms the model doesn't carry
+            document = {**campaign.dict(), **derived, "content": pack_content(content)}
+            await db.campaigns.insert_one(document)
+            await self.revision_service.record(campaign.id, user.id, campaign.revision, content, source="generated")
+            response_cache.bump(user.id, "campaigns")
+            await self.stats_service.increment(user.id, campaign_counter_deltas(campaign.status, campaign.campaign_type))
             
             return {
                 "success": True,
@@ -59,11 +80,27 @@ class CampaignService:
             self.logger.error(f"Campaign generation error: {str(e)}")
             raise Exception(f"Failed to generate campaign: {str(e)}")
     
-    async def get_user_campaigns(self, user_id: str, limit: int = 1000) -> List[Campaign]:
-        """Get all campaigns for a user"""
+    async def get_user_campaigns(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        hashtag: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get one page of a user's campaign summaries, newest first (full content via get_campaign_by_id)"""
+        page_size = clamp_page_size(limit)
+        base: Dict[str, Any] = {"user_id": user_id}
+        if hashtag:
+            base["analytics.hashtags"] = "#" + hashtag.lstrip("#").lower()
+        query = keyset_filter(base, cursor)
         try:
-            campaigns = await db.campaigns.find({"user_id": user_id}).sort("created_at", -1).limit(limit).to_list(limit)
-            return [Campaign(**campaign) for campaign in campaigns]
+            # Served by the (user_id, created_at, id) index; no skip, so cost is flat for any page
+            campaigns = await db.campaigns.find(query, SUMMARY_PROJECTION).sort(
+                [("created_at", -1), ("id", -1)]
+            ).limit(page_size + 1).to_list(page_size + 1)
+            page = keyset_page(campaigns, page_size)
+            page["items"] = [CampaignSummary(**campaign) for campaign in page["items"]]
+            return page
         except Exception as e:
             self.logger.error(f"Get campaigns error: {str(e)}")
             raise Exception("Failed to fetch campaigns")
@@ -71,44 +108,117 @@ class CampaignService:
     async def get_campaign_by_id(self, campaign_id: str, user_id: str) -> Optional[Campaign]:
         """Get specific campaign by ID for user"""
         try:
-            campaign = await db.campaigns.find_one({"id": campaign_id, "user_id": user_id})
+            campaign = await db.campaigns.find_one({"id": campaign_id, "user_id": user_id}, {"search_terms": 0})
             if not campaign:
                 return None
+            if campaign.get("archived"):
+                # The hot row is only a stub; serve the full document from the archive without restoring it
+                archived = await self.archive_service.get_campaign(campaign_id, user_id)
+                if archived is not None:
+                    archived.pop("search_terms", None)
+                    return Campaign(**{**archived, "archived": True})
             return Campaign(**campaign)
         except Exception as e:
             self.logger.error(f"Get campaign error: {str(e)}")
             raise Exception("Failed to fetch campaign")
     
-    async def update_campaign(self, campaign_id: str, user_id: str, title: Optional[str] = None, content: Optional[str] = None) -> bool:
-        """Update campaign details"""
+    async def update_campaign(
+        self,
+        campaign_id: str,
+        user_id: str,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        source: str = "edit"
+    ) -> bool:
+        """Update campaign details; content changes are kept as a new revision"""
+        new_revision = None
         try:
+            if not title and not content:
+                raise ValueError("No data to update")
+            
+            # Sent campaigns are immutable, which is what lets their responses be cached indefinitely
+            query: Dict[str, Any] = {"id": campaign_id, "user_id": user_id, "status": {"$ne": "sent"}}
             update_data = {}
             if title:
                 update_data["title"] = title
             if content:
-                update_data["content"] = content
+                current = await db.campaigns.find_one(
+                    {"id": campaign_id, "user_id": user_id},
+                    {"content": 1, "revision": 1, "status": 1, "campaign_type": 1, "_id": 0}
+                )
+                if current is None:
+                    return False
+                if current.get("status") == "sent":
+                    raise ValueError("Sent campaigns cannot be edited")
+                previous = unpack_content(current.get("content")) or ""
+                if content != previous:
+                    revision = current.get("revision") or 1
+                    await self.revision_service.ensure_base(campaign_id, user_id, revision, previous)
+                    new_revision = revision + 1
+                    await self.revision_service.record(campaign_id, user_id, new_revision, content, previous, source)
+                    update_data.update({
+                        "content": pack_content(content),
+                        "revision": new_revision,
+                        **content_fields(content, current.get("campaign_type"))
+                    })
+                    # Only apply if nobody else moved the campaign past the revision the delta was built on
+                    query["revision"] = current.get("revision")
             
             if not update_data:
-                raise ValueError("No data to update")
+                return True
             
-            result = await db.campaigns.update_one(
-                {"id": campaign_id, "user_id": user_id},
-                {"$set": update_data}
-            )
+            result = await db.campaigns.update_one(query, {"$set": update_data})
+            if result.matched_count == 0:
+                if new_revision is not None:
+                    await self.revision_service.discard(campaign_id, new_revision)
+                    new_revision = None
+                if await db.campaigns.count_documents({"id": campaign_id, "user_id": user_id, "status": "sent"}, limit=1):
+                    raise ValueError("Sent campaigns cannot be edited")
+                if "revision" in query and await db.campaigns.count_documents({"id": campaign_id, "user_id": user_id}, limit=1):
+                    raise RevisionConflict("Campaign was edited concurrently; reload and try again")
+                return False
             
-            return result.matched_count > 0
+            response_cache.bump(user_id, "campaigns", campaign_ids=[campaign_id])
+            return True
             
         except ValueError:
             raise
         except Exception as e:
             self.logger.error(f"Update campaign error: {str(e)}")
+            if new_revision is not None:
+                await self.revision_service.discard(campaign_id, new_revision)
             raise Exception("Failed to update campaign")
     
+    async def restore_revision(self, campaign_id: str, user_id: str, revision: int) -> bool:
+        """Make an earlier revision's content current again, as a new revision"""
+        content = await self.revision_service.get_content(campaign_id, user_id, revision)
+        if content is None:
+            return False
+        return await self.update_campaign(campaign_id, user_id, content=content, source=f"restore:{revision}")
+    
+    async def restore_archived(self, campaign_id: str, user_id: str) -> Optional[Dict[str, int]]:
+        """Bring an archived campaign, its leads and history back to the hot collections"""
+        return await self.archive_service.restore_campaign(campaign_id, user_id)
+    
     async def delete_campaign(self, campaign_id: str, user_id: str) -> bool:
         """Delete campaign"""
         try:
-            result = await db.campaigns.delete_one({"id": campaign_id, "user_id": user_id})
-            return result.deleted_count > 0
+            deleted = await db.campaigns.find_one_and_delete(
+                {"id": campaign_id, "user_id": user_id},
+                projection={"status": 1, "campaign_type": 1, "performance.sent_count": 1, "_id": 0}
+            )
+            if deleted is None:
+                return False
+            await self.revision_service.delete_history(campaign_id)
+            await self.archive_service.delete_campaign(campaign_id)
+            response_cache.bump(user_id, "campaigns", campaign_ids=[campaign_id])
+            await self.stats_service.increment(user_id, campaign_counter_deltas(
+                deleted.get("status"),
+                deleted.get("campaign_type"),
+                deleted.get("performance", {}).get("sent_count", 0),
+                sign=-1
+            ))
+            return True
         except Exception as e:
             self.logger.error(f"Delete campaign error: {str(e)}")
             raise Exception("Failed to delete campaign")
@@ -116,29 +226,13 @@ class CampaignService:
     async def get_campaign_performance_stats(self, user_id: str) -> Dict[str, Any]:
         """Get campaign performance statistics for user"""
         try:
-            # Get total campaigns
-            total_campaigns = await db.campaigns.count_documents({"user_id": user_id})
-            
-            # Get campaigns by status
-            draft_campaigns = await db.campaigns.count_documents({"user_id": user_id, "status": "draft"})
-            sent_campaigns = await db.campaigns.count_documents({"user_id": user_id, "status": "sent"})
-            
-            # Get total emails sent
-            sent_campaign_list = await db.campaigns.find({"user_id": user_id, "status": "sent"}).to_list(1000)
-            total_emails_sent = sum(campaign.get("performance", {}).get("sent_count", 0) for campaign in sent_campaign_list)
-            
-            # Get campaigns by type
-            campaigns_by_type = {}
-            for campaign_type in ["email", "social_media", "direct_message"]:
-                count = await db.campaigns.count_documents({"user_id": user_id, "campaign_type": campaign_type})
-                campaigns_by_type[campaign_type] = count
-            
+            stats = await self.stats_service.get_campaign_stats(user_id)
             return {
-                "total_campaigns": total_campaigns,
-                "draft_campaigns": draft_campaigns,
-                "sent_campaigns": sent_campaigns,
-                "total_emails_sent": total_emails_sent,
-                "campaigns_by_type": campaigns_by_type
+                "total_campaigns": stats["total_campaigns"],
+                "draft_campaigns": stats["campaigns_by_status"].get("draft", 0),
+                "sent_campaigns": stats["campaigns_by_status"].get("sent", 0),
+                "total_emails_sent": stats["total_emails_sent"],
+                "campaigns_by_type": stats["campaigns_by_type"]
             }
             
         except Exception as e:
@@ -148,20 +242,99 @@ class CampaignService:
     async def schedule_campaign(self, campaign_id: str, user_id: str, scheduled_at: datetime) -> bool:
         """Schedule campaign for future sending"""
         try:
-            result = await db.campaigns.update_one(
-                {"id": campaign_id, "user_id": user_id},
+            # The pre-update document tells which status counter to move
+            previous = await db.campaigns.find_one_and_update(
+                {"id": campaign_id, "user_id": user_id, "archived": {"$ne": True}},
                 {
                     "$set": {
                         "scheduled_at": scheduled_at,
                         "status": "scheduled"
                     }
-                }
+                },
+                projection={"status": 1, "performance.sent_count": 1, "_id": 0}
             )
-            return result.matched_count > 0
+            if previous is None:
+                if await db.campaigns.count_documents({"id": campaign_id, "user_id": user_id, "archived": True}, limit=1):
+                    raise ValueError("Archived campaigns must be restored before they are rescheduled")
+                return False
+            response_cache.bump(user_id, "campaigns", campaign_ids=[campaign_id])
+            deltas = status_change_deltas("campaigns", previous.get("status"), "scheduled")
+            if previous.get("status") == "sent":
+                deltas["total_sent"] = -previous.get("performance", {}).get("sent_count", 0)
+            await self.stats_service.increment(user_id, deltas)
+            return True
+        except ValueError:
+            raise
         except Exception as e:
             self.logger.error(f"Schedule campaign error: {str(e)}")
             raise Exception("Failed to schedule campaign")
     
+    async def pack_stored_content(self, batch_size: int = 500, dry_run: bool = False, unpack: bool = False) -> Dict[str, int]:
+        """Re-encode stored content in _id order: pack text above the threshold, or unpack everything.
+
+        Each update is conditional on the content it read, so a concurrent
+        edit wins over the migration rather than being overwritten.
+        """
+        stats = {"scanned": 0, "updated": 0, "bytes_before": 0, "bytes_after": 0}
+        # Archived stubs keep no content; the archive holds it
+        query: Dict[str, Any] = {"content": {"$type": "binData" if unpack else "string"}, "archived": {"$ne": True}}
+        last_id = None
+        while True:
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = await db.campaigns.find(query, {"content": 1, "preview": 1}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+            if not batch:
+                break
+            last_id = batch[-1]["_id"]
+
+            operations = []
+            for doc in batch:
+                stats["scanned"] += 1
+                text = unpack_content(doc["content"])
+                stored = text if unpack else pack_content(text)
+                if not unpack and not is_packed(stored):
+                    continue
+                update = {"content": stored}
+                if doc.get("preview") is None:
+                    update["preview"] = build_preview(text)
+                operations.append(UpdateOne({"_id": doc["_id"], "content": doc["content"]}, {"$set": update}))
+                stats["bytes_before"] += len(doc["content"]) if is_packed(doc["content"]) else len(doc["content"].encode("utf-8"))
+                stats["bytes_after"] += len(stored) if is_packed(stored) else len(stored.encode("utf-8"))
+
+            if operations and not dry_run:
+                result = await db.campaigns.bulk_write(operations, ordered=False)
+                stats["updated"] += result.modified_count
+            elif dry_run:
+                stats["updated"] += len(operations)
+        return stats
+    
+    async def backfill_content_analytics(self, batch_size: int = 500, force: bool = False) -> Dict[str, int]:
+        """Store preview and analytics on campaigns missing them (or on all campaigns with force)"""
+        stats = {"scanned": 0, "updated": 0}
+        # Archived stubs have no content to analyze, and their stored preview and counts must survive
+        query: Dict[str, Any] = {"archived": {"$ne": True}}
+        if not force:
+            query["analytics.version"] = {"$ne": CONTENT_ANALYTICS_VERSION}
+        last_id = None
+        while True:
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = await db.campaigns.find(query, {"content": 1, "campaign_type": 1}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+            if not batch:
+                break
+            last_id = batch[-1]["_id"]
+            stats["scanned"] += len(batch)
+            # Conditional on the content read, so an edit racing the backfill keeps its own analytics
+            result = await db.campaigns.bulk_write([
+                UpdateOne(
+                    {"_id": doc["_id"], "content": doc.get("content")},
+                    {"$set": content_fields(unpack_content(doc.get("content")), doc.get("campaign_type"))}
+                )
+                for doc in batch
+            ], ordered=False)
+            stats["updated"] += result.modified_count
+        return stats
+    
     def validate_campaign_type(self, campaign_type: str) -> bool:
         """Validate campaign type"""
         valid_types = ["email", "social_media", "direct_message"]
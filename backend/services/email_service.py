@@ -3,24 +3,43 @@ import smtplib
 import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any
+from email.utils import make_msgid
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
 from config import settings, db
 from models import Lead
+from utils.response_cache import response_cache
+from .suppression_service import SuppressionService, normalize_email
+from .tracking_service import instrument_html
+from .sender_router import SenderAccount, SenderRouter, SenderDispatch, load_sender_pool
+from .stats_service import StatsService, status_change_deltas
+from .rollup_service import RollupService
 
 class EmailService:
     """Service for sending emails via SMTP"""
     
-    def __init__(self):
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
         self.smtp_server = settings.smtp_server
         self.smtp_port = settings.smtp_port
+        self.smtp_use_tls = settings.smtp_use_tls
         self.sender_email = settings.sender_email
         self.sender_password = settings.email_app_password
+        self.sender_pool = load_sender_pool()
+        self.sender_router = SenderRouter(self.db)
+        self.suppression_service = SuppressionService(self.db)
+        self.stats_service = StatsService(self.db)
+        self.rollup_service = RollupService(self.db)
         self.logger = logging.getLogger(__name__)
     
     def _validate_email_config(self) -> bool:
         """Validate email configuration"""
+        if self.sender_pool:
+            return True
         return all([
             self.sender_email,
             self.sender_password,
@@ -28,29 +47,88 @@ class EmailService:
             self.smtp_port
         ])
     
-    async def send_single_email(self, recipient: str, subject: str, content: str) -> bool:
-        """Send a single email to recipient"""
+    def _get_senders(self) -> List[SenderAccount]:
+        """Configured sender pool, or the single legacy SENDER_EMAIL account"""
+        if self.sender_pool:
+            return self.sender_pool
+        if not self._validate_email_config():
+            return []
+        return [SenderAccount(
+            email=self.sender_email,
+            password=self.sender_password,
+            host=self.smtp_server,
+            port=self.smtp_port,
+            use_tls=self.smtp_use_tls,
+            daily_quota=settings.sender_daily_quota
+        )]
+    
+    def _message_id(self, lead_id: str, senders: List[SenderAccount]) -> str:
+        """Deterministic Message-ID so replies can be matched back to the lead"""
+        domain = settings.message_id_domain or senders[0].email.rsplit('@', 1)[-1]
+        return f"<{lead_id}@{domain}>"
+
+    async def _upsert_lead(self, lead: Lead) -> bool:
+        """Insert the lead unless the recipient already has one for the campaign; True if inserted.
+
+        Screening drops every address that already has a lead in the
+        campaign, so a match only happens when two sends of the campaign
+        race: the unique (user_id, campaign_id, email) index makes their
+        upserts collide, and the loser retries as a plain match. The existing
+        lead then keeps its id and history, counts the extra send and takes
+        this send's Message-ID and sender.
+        """
+        identity = {"user_id": lead.user_id, "campaign_id": lead.campaign_id, "email": lead.email}
+        document = lead.dict()
+        document.pop("send_count")
+        latest = {"message_id": document.pop("message_id"), "sender": document.pop("sender")}
+        update = {"$setOnInsert": document, "$set": latest, "$inc": {"send_count": 1}}
+        options = {"projection": {"id": 1, "_id": 0}, "upsert": True, "return_document": ReturnDocument.BEFORE}
+        try:
+            existing = await self.db.leads.find_one_and_update(identity, update, **options)
+        except DuplicateKeyError:
+            existing = await self.db.leads.find_one_and_update(identity, update, **options)
+        if existing is not None:
+            # This send's links carry an id that was never stored; replies still resolve through the Message-ID set above
+            self.logger.warning(f"Lead for {lead.email} in campaign {lead.campaign_id} was created concurrently; opens and clicks of this send are lost")
+        return existing is None
+
+    def _build_message(self, sender_email: str, recipient: str, subject: str, html_content: str, message_id: Optional[str] = None) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = sender_email
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        msg['Message-ID'] = message_id or make_msgid(domain=sender_email.rsplit('@', 1)[-1])
+        msg.attach(MIMEText(html_content, 'html'))
+        return msg
+    
+    def _deliver(self, sender: SenderAccount, msg: MIMEMultipart):
+        """Deliver one message through one sender account, raising on failure"""
+        server = smtplib.SMTP(sender.host, sender.port)
+        try:
+            if sender.use_tls:
+                server.starttls()
+            server.login(sender.email, sender.password)
+            server.send_message(msg)
+        finally:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                pass
+    
+    async def send_single_email(self, recipient: str, subject: str, content: str, html_content: Optional[str] = None) -> bool:
+        """Send a single email to recipient, optionally with pre-rendered HTML"""
         try:
-            if not self._validate_email_config():
+            senders = self._get_senders()
+            if not senders:
                 self.logger.error("Email configuration not complete")
                 return False
             
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.sender_email
-            msg['To'] = recipient
-            msg['Subject'] = subject
-            
             # Convert content to HTML if needed
-            html_content = content.replace('\n', '<br>')
-            msg.attach(MIMEText(html_content, 'html'))
+            if html_content is None:
+                html_content = content.replace('\n', '<br>')
             
-            # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.sender_email, self.sender_password)
-            server.send_message(msg)
-            server.quit()
+            sender = senders[0]
+            self._deliver(sender, self._build_message(sender.email, recipient, subject, html_content))
             
             self.logger.info(f"Email sent successfully to {recipient}")
             return True
@@ -59,39 +137,78 @@ class EmailService:
             self.logger.error(f"Failed to send email to {recipient}: {str(e)}")
             return False
     
+    async def _send_with_failover(self, dispatch: SenderDispatch, recipient: str, subject: str, html_content: str, message_id: str) -> Optional[str]:
+        """Try senders in routing order until one accepts the message; returns the sender used"""
+        tried = []
+        while True:
+            sender = dispatch.choose(exclude=tried)
+            if sender is None:
+                self.logger.error(f"No sender with remaining quota for {recipient}")
+                return None
+            
+            try:
+                self._deliver(sender, self._build_message(sender.email, recipient, subject, html_content, message_id))
+            except smtplib.SMTPRecipientsRefused as e:
+                # The address itself was rejected; another sender won't help
+                self.logger.error(f"Recipient refused {recipient}: {str(e)}")
+                return None
+            except Exception as e:
+                self.logger.warning(f"Sender {sender.email} failed for {recipient}: {str(e)}")
+                dispatch.failed(sender)
+                tried.append(sender.email)
+                continue
+            
+            await dispatch.succeeded(sender)
+            return sender.email
+    
     async def send_campaign_emails(self, campaign: Dict[str, Any], recipients: List[str], user_id: str) -> Dict[str, Any]:
         """Send campaign emails to multiple recipients and track results"""
         try:
-            if not self._validate_email_config():
+            senders = self._get_senders()
+            if not senders:
                 raise Exception("Email configuration not set")
             
             campaign_id = campaign['id']
             campaign_title = campaign['title']
             campaign_content = campaign['content']
             
+            # Drop duplicates, suppressed addresses and prior recipients before any SMTP work
+            screening = await self.suppression_service.filter_recipients(user_id, campaign_id, recipients)
+            recipients = screening["recipients"]
+            
             sent_count = 0
+            created_count = 0
             failed_recipients = []
+            base_html = campaign_content.replace('\n', '<br>')
+            dispatch = await self.sender_router.open_dispatch(senders)
             
             # Send emails to all recipients
             for recipient in recipients:
                 try:
+                    # Lead id is allocated up front so tracking links can reference it
+                    lead = Lead(
+                        user_id=user_id,
+                        campaign_id=campaign_id,
+                        email=recipient,
+                        interaction_type="sent",
+                        status="cold"
+                    )
+                    lead.message_id = self._message_id(lead.id, senders)
+                    
                     # Send email
-                    success = await self.send_single_email(
+                    sender_email = await self._send_with_failover(
+                        dispatch,
                         recipient=recipient,
                         subject=campaign_title,
-                        content=campaign_content
+                        html_content=instrument_html(base_html, campaign_id, lead.id),
+                        message_id=lead.message_id
                     )
                     
-                    if success:
-                        # Create lead entry for successful send
-                        lead = Lead(
-                            user_id=user_id,
-                            campaign_id=campaign_id,
-                            email=recipient,
-                            interaction_type="sent",
-                            status="cold"
-                        )
-                        await db.leads.insert_one(lead.dict())
+                    if sender_email:
+                        # Create the lead for a successful send, or merge into the recipient's existing one
+                        lead.sender = normalize_email(sender_email)
+                        if await self._upsert_lead(lead):
+                            created_count += 1
                         sent_count += 1
                     else:
                         failed_recipients.append(recipient)
@@ -100,28 +217,43 @@ class EmailService:
                     self.logger.error(f"Failed to send email to {recipient}: {str(e)}")
                     failed_recipients.append(recipient)
             
-            # Update campaign performance
-            performance_data = {
-                "sent_count": sent_count,
-                "failed_count": len(failed_recipients),
-                "sent_at": datetime.utcnow().isoformat()
-            }
+            await dispatch.flush()
             
-            await db.campaigns.update_one(
+            # Update campaign performance; dotted paths keep tracking counters intact
+            previous = await self.db.campaigns.find_one_and_update(
                 {"id": campaign_id},
                 {
                     "$set": {
                         "status": "sent",
-                        "performance": performance_data
+                        "performance.sent_count": sent_count,
+                        "performance.failed_count": len(failed_recipients),
+                        "performance.sent_at": datetime.utcnow().isoformat()
                     }
-                }
+                },
+                projection={"status": 1, "performance.sent_count": 1, "_id": 0}
             )
+            response_cache.bump(user_id, "campaigns", "leads", campaign_ids=[campaign_id])
+            if previous is not None:
+                # A re-send replaces the campaign's sent_count rather than adding to it
+                previous_sent = previous.get("performance", {}).get("sent_count", 0) if previous.get("status") == "sent" else 0
+                deltas = status_change_deltas("campaigns", previous.get("status"), "sent")
+                deltas.update({
+                    "total_sent": sent_count - previous_sent,
+                    "leads.total": created_count,
+                    "leads.by_status.cold": created_count
+                })
+                await self.stats_service.increment(user_id, deltas)
+            await self.rollup_service.record(user_id, campaign_id, {"emails_sent": sent_count, "leads_created": created_count})
             
             return {
                 "success": True,
                 "sent_count": sent_count,
                 "failed_count": len(failed_recipients),
                 "failed_recipients": failed_recipients,
+                "skipped_duplicates": screening["skipped_duplicates"],
+                "skipped_suppressed": screening["skipped_suppressed"],
+                "skipped_already_sent": screening["skipped_already_sent"],
+                "sender_breakdown": {email: count for email, count in dispatch.sent.items() if count},
                 "message": f"Campaign sent successfully to {sent_count} recipients"
             }
             
@@ -144,5 +276,6 @@ class EmailService:
             "configured": is_configured,
             "smtp_server": self.smtp_server,
             "smtp_port": self.smtp_port,
-            "sender_email": self.sender_email if is_configured else "Not configured"
+            "sender_email": self.sender_email if is_configured else "Not configured",
+            "senders": self.sender_router.get_status(self._get_senders())
         }
\ No newline at end of file
@@ -0,0 +1,138 @@
+# services/export_service.py
+import csv
+import io
+import json
+import logging
+import zlib
+from typing import List, Dict, Any, Optional, AsyncIterator, Iterable
+from datetime import datetime
+
+from config import settings, db
+from models import CampaignSummary, Lead
+from utils.content_codec import unpack_content
+from utils.serialization import dumps_json
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str, separators=(",", ":"))
+    return value
+
+class RowEncoder:
+    """Encodes rows to CSV or NDJSON bytes, optionally through a streaming gzip compressor"""
+
+    def __init__(self, file_format: str, fields: List[str], gzip: bool = False):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+        self.file_format = file_format
+        self.fields = fields
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text) if file_format == "csv" else None
+        self._compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31) if gzip else None
+
+    def _emit(self, data: bytes) -> bytes:
+        if self._compressor is None:
+            return data
+        # Sync flush so every chunk reaches the client now instead of waiting in the compressor
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def _drain_text(self) -> bytes:
+        data = self._text.getvalue().encode("utf-8")
+        self._text.seek(0)
+        self._text.truncate()
+        return data
+
+    def header(self) -> bytes:
+        if self._writer is None:
+            return b""
+        self._writer.writerow(self.fields)
+        return self._emit(self._drain_text())
+
+    def rows(self, rows: Iterable[Dict[str, Any]]) -> bytes:
+        if self._writer is None:
+            return self._emit(b"".join(dumps_json(row) + b"\n" for row in rows))
+        self._writer.writerows([_csv_value(row.get(field)) for field in self.fields] for row in rows)
+        return self._emit(self._drain_text())
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH) if self._compressor is not None else b""
+
+class ExportService:
+    """Streams a user's leads or campaigns as CSV/NDJSON chunks.
+
+    Documents come from a Motor cursor in ``export_batch_size`` batches in
+    index order and are encoded ``export_chunk_rows`` at a time; only one
+    batch and one chunk are ever held, so memory stays flat no matter how
+    many rows are exported, and bytes start flowing immediately.
+    """
+
+    LEAD_FIELDS = list(Lead.model_fields)
+    CAMPAIGN_FIELDS = list(CampaignSummary.model_fields)
+    LEAD_FILTERS = ("campaign_id", "status", "tag")
+    CAMPAIGN_FILTERS = ("status", "campaign_type")
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.logger = logging.getLogger(__name__)
+
+    def lead_export(self, user_id: str, file_format: str, gzip: bool = False, filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[bytes]:
+        """Encoder is built (and the format validated) before the stream starts"""
+        query = {"user_id": user_id, **self._filters(filters, self.LEAD_FILTERS)}
+        if "tag" in query:
+            query["tags"] = query.pop("tag").strip().lower()
+        projection = {field: 1 for field in self.LEAD_FIELDS}
+        projection["_id"] = 0
+        encoder = RowEncoder(file_format, self.LEAD_FIELDS, gzip)
+        return self._stream(self.db.leads, query, projection, encoder)
+
+    def campaign_export(
+        self,
+        user_id: str,
+        file_format: str,
+        gzip: bool = False,
+        include_content: bool = False,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[bytes]:
+        query = {"user_id": user_id, **self._filters(filters, self.CAMPAIGN_FILTERS)}
+        fields = self.CAMPAIGN_FIELDS + (["content"] if include_content else [])
+        projection = {field: 1 for field in fields}
+        projection["_id"] = 0
+        encoder = RowEncoder(file_format, fields, gzip)
+        return self._stream(self.db.campaigns, query, projection, encoder, unpack=include_content)
+
+    @staticmethod
+    def _filters(filters: Optional[Dict[str, Any]], allowed: Iterable[str]) -> Dict[str, Any]:
+        return {field: value for field, value in (filters or {}).items() if field in allowed and value is not None}
+
+    async def _stream(self, collection, query: Dict[str, Any], projection: Dict[str, Any], encoder: RowEncoder, unpack: bool = False) -> AsyncIterator[bytes]:
+        chunk_rows = max(1, settings.export_chunk_rows)
+        cursor = collection.find(query, projection).sort([("created_at", -1), ("id", -1)]).batch_size(settings.export_batch_size)
+        exported = 0
+        try:
+            header = encoder.header()
+            if header:
+                yield header
+            pending: List[Dict[str, Any]] = []
+            async for doc in cursor:
+                if unpack:
+                    doc["content"] = unpack_content(doc.get("content"))
+                pending.append(doc)
+                if len(pending) >= chunk_rows:
+                    exported += len(pending)
+                    yield encoder.rows(pending)
+                    pending = []
+            exported += len(pending)
+            tail = (encoder.rows(pending) if pending else b"") + encoder.finish()
+            if tail:
+                yield tail
+        except Exception as e:
+            # Headers are already sent, so the client sees a truncated file rather than an error status
+            self.logger.error(f"Export failed after {exported} rows: {str(e)}")
+            raise
+        finally:
+            await cursor.close()
@@ -0,0 +1,368 @@
+# services/lead_service.py
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable
+
+from pymongo import UpdateMany, UpdateOne
+
+from config import db
+from config.database import LEAD_LIST_INDEXES
+from models import LeadFilter
+from utils.lead_scoring import SCORED_STATUSES
+from utils.helpers import clamp_page_size, keyset_filter, keyset_page
+from utils.response_cache import response_cache
+from .stats_service import StatsService, lead_transition_deltas, merge_deltas, status_change_deltas
+from .rollup_service import RollupService, LeadTransition
+
+class LeadService:
+    """Bulk lead operations: one selection read and one write per request.
+
+    A request names its leads by id or by filter; either way the matching
+    leads are read once (id, status, campaign) so every item gets a result
+    and the dashboard counters and rollups move by exactly what changed.
+    """
+
+    MAX_BULK_LEADS = 5000
+    MAX_TAGS = 50
+
+    # Furthest interaction wins when duplicates are merged
+    INTERACTION_RANK = ("sent", "bounced", "opened", "clicked", "replied")
+    MERGE_COUNTERS = ("open_count", "click_count", "reply_count", "soft_bounce_count")
+    MERGE_LATEST = ("last_interaction_at", "replied_at", "bounced_at", "scored_at", "score")
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.stats_service = StatsService(self.db)
+        self.rollup_service = RollupService(self.db)
+        self.logger = logging.getLogger(__name__)
+
+    # ===== Listing =====
+
+    LIST_SORTS = {"newest": -1, "oldest": 1}
+    LIST_FILTERS = ("campaign_id", "status", "interaction_type")
+
+    @staticmethod
+    def list_index(filters: Dict[str, Any]) -> str:
+        """Name in LEAD_LIST_INDEXES of the index planned for a set of equality filters"""
+        if "interaction_type" in filters:
+            return "interaction"
+        if "campaign_id" in filters:
+            return "campaign"
+        if "status" in filters:
+            return "status"
+        return "all"
+
+    def list_query(
+        self,
+        user_id: str,
+        filters: Optional[Dict[str, Any]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        sort: str = "newest",
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Query, sort and index hint for one page of a filtered lead list"""
+        if sort not in self.LIST_SORTS:
+            raise ValueError(f"Sort must be one of: {', '.join(self.LIST_SORTS)}")
+        if created_after and created_before and created_after >= created_before:
+            raise ValueError("created_after must be earlier than created_before")
+        conditions = {field: value for field, value in (filters or {}).items() if field in self.LIST_FILTERS and value}
+        query: Dict[str, Any] = {"user_id": user_id, **conditions}
+        if created_after or created_before:
+            query["created_at"] = {
+                **({"$gte": created_after} if created_after else {}),
+                **({"$lt": created_before} if created_before else {})
+            }
+        direction = self.LIST_SORTS[sort]
+        return {
+            "filter": keyset_filter(query, cursor, descending=direction < 0),
+            "sort": [("created_at", direction), ("id", direction)],
+            "hint": LEAD_LIST_INDEXES[self.list_index(conditions)]
+        }
+
+    async def list_leads(self, user_id: str, limit: Optional[int] = None, **criteria) -> Dict[str, Any]:
+        """One keyset page of leads matching the filters; see list_query for the criteria"""
+        page_size = clamp_page_size(limit)
+        plan = self.list_query(user_id, **criteria)
+        try:
+            leads = await self.db.leads.find(plan["filter"], {"_id": 0}).sort(plan["sort"]).hint(plan["hint"]).limit(
+                page_size + 1
+            ).to_list(page_size + 1)
+        except Exception as e:
+            self.logger.error(f"Lead list error: {str(e)}")
+            raise Exception("Failed to fetch leads")
+        return keyset_page(leads, page_size)
+
+    # ===== Selection =====
+
+    async def select(self, user_id: str, ids: Optional[List[str]] = None, lead_filter: Optional[LeadFilter] = None) -> Dict[str, Any]:
+        """Leads targeted by a bulk request, plus the requested ids that matched nothing"""
+        if (ids is None) == (lead_filter is None):
+            raise ValueError("Provide either ids or filter")
+
+        query: Dict[str, Any] = {"user_id": user_id}
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+            if not ids:
+                raise ValueError("No lead ids given")
+            if len(ids) > self.MAX_BULK_LEADS:
+                raise ValueError(f"At most {self.MAX_BULK_LEADS} leads per request")
+            query["id"] = {"$in": ids}
+        else:
+            conditions = {field: value for field, value in lead_filter.dict().items() if value is not None}
+            if not conditions:
+                raise ValueError("Filter must set at least one field")
+            if "tag" in conditions:
+                conditions["tags"] = conditions.pop("tag").strip().lower()
+            query.update(conditions)
+
+        leads = await self.db.leads.find(
+            query, {"id": 1, "status": 1, "campaign_id": 1, "_id": 0}
+        ).limit(self.MAX_BULK_LEADS + 1).to_list(self.MAX_BULK_LEADS + 1)
+        if len(leads) > self.MAX_BULK_LEADS:
+            raise ValueError(f"Filter matches more than {self.MAX_BULK_LEADS} leads; narrow it down")
+
+        found = {lead["id"] for lead in leads}
+        return {"leads": leads, "missing": [lead_id for lead_id in ids or [] if lead_id not in found]}
+
+    @staticmethod
+    def _results(selection: Dict[str, Any], outcomes: Dict[str, str]) -> Dict[str, Any]:
+        results = [{"id": lead["id"], "result": outcomes[lead["id"]]} for lead in selection["leads"]]
+        results.extend({"id": lead_id, "result": "not_found"} for lead_id in selection["missing"])
+        summary: Dict[str, int] = {}
+        for item in results:
+            summary[item["result"]] = summary.get(item["result"], 0) + 1
+        return {"matched": len(selection["leads"]), "summary": summary, "results": results}
+
+    async def _current_status(self, user_id: str, lead_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        leads = await self.db.leads.find(
+            {"user_id": user_id, "id": {"$in": list(lead_ids)}}, {"id": 1, "status": 1, "_id": 0}
+        ).to_list(None)
+        return {lead["id"]: lead.get("status") for lead in leads}
+
+    # ===== Operations =====
+
+    async def bulk_update_status(self, user_id: str, status: str, ids: Optional[List[str]] = None, lead_filter: Optional[LeadFilter] = None) -> Dict[str, Any]:
+        """Set the status of many leads with one bulk_write, pinning it against batch rescoring"""
+        if status not in StatsService.LEAD_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of: {', '.join(StatsService.LEAD_STATUSES)}")
+        selection = await self.select(user_id, ids, lead_filter)
+        outcomes = {lead["id"]: "unchanged" for lead in selection["leads"] if lead.get("status") == status}
+        changing = [lead for lead in selection["leads"] if lead["id"] not in outcomes]
+
+        if changing:
+            try:
+                # Each update is conditional on the status read above, so counters only move for real transitions
+                result = await self.db.leads.bulk_write([
+                    UpdateOne(
+                        {"id": lead["id"], "user_id": user_id, "status": lead.get("status")},
+                        {"$set": {"status": status, "status_source": "manual"}}
+                    )
+                    for lead in changing
+                ], ordered=False)
+            except Exception as e:
+                self.logger.error(f"Bulk lead status error: {str(e)}")
+                raise Exception("Failed to update leads")
+
+            if result.modified_count == len(changing):
+                outcomes.update({lead["id"]: "updated" for lead in changing})
+            else:
+                # Some leads changed underneath us; find out which updates landed
+                current = await self._current_status(user_id, (lead["id"] for lead in changing))
+                outcomes.update({
+                    lead["id"]: "updated" if current.get(lead["id"]) == status else "conflict"
+                    for lead in changing
+                })
+
+            transitions: List[LeadTransition] = [
+                (user_id, lead.get("campaign_id"), lead.get("status"), status)
+                for lead in changing if outcomes[lead["id"]] == "updated"
+            ]
+            if transitions:
+                response_cache.bump(user_id, "leads")
+                await self.stats_service.increment_many(lead_transition_deltas(transitions))
+                await self.rollup_service.record_transitions(transitions)
+
+        unchanged = [lead_id for lead_id, outcome in outcomes.items() if outcome == "unchanged"]
+        if unchanged:
+            # Already at the chosen status, but now chosen by hand
+            await self.db.leads.update_many(
+                {"id": {"$in": unchanged}, "user_id": user_id, "status": status}, {"$set": {"status_source": "manual"}}
+            )
+
+        return self._results(selection, outcomes)
+
+    async def bulk_tag(
+        self,
+        user_id: str,
+        add: Optional[List[str]] = None,
+        remove: Optional[List[str]] = None,
+        ids: Optional[List[str]] = None,
+        lead_filter: Optional[LeadFilter] = None
+    ) -> Dict[str, Any]:
+        """Add and/or remove tags on many leads with one bulk_write"""
+        add = list(dict.fromkeys(tag.strip().lower() for tag in add or [] if tag and tag.strip()))
+        remove = list(dict.fromkeys(tag.strip().lower() for tag in remove or [] if tag and tag.strip()))
+        if not add and not remove:
+            raise ValueError("No tags to add or remove")
+        if len(add) + len(remove) > self.MAX_TAGS:
+            raise ValueError(f"At most {self.MAX_TAGS} tags per request")
+        selection = await self.select(user_id, ids, lead_filter)
+        lead_ids = [lead["id"] for lead in selection["leads"]]
+
+        if lead_ids:
+            scope = {"user_id": user_id, "id": {"$in": lead_ids}}
+            # $addToSet and $pull cannot touch the same field in one update, so adds and removes are two ops in one bulk_write
+            operations = []
+            if add:
+                operations.append(UpdateMany(scope, {"$addToSet": {"tags": {"$each": add}}}))
+            if remove:
+                operations.append(UpdateMany(scope, {"$pull": {"tags": {"$in": remove}}}))
+            try:
+                await self.db.leads.bulk_write(operations, ordered=True)
+            except Exception as e:
+                self.logger.error(f"Bulk lead tag error: {str(e)}")
+                raise Exception("Failed to tag leads")
+            response_cache.bump(user_id, "leads")
+
+        return self._results(selection, {lead_id: "updated" for lead_id in lead_ids})
+
+    async def bulk_delete(self, user_id: str, ids: Optional[List[str]] = None, lead_filter: Optional[LeadFilter] = None) -> Dict[str, Any]:
+        """Delete many leads with one delete_many"""
+        selection = await self.select(user_id, ids, lead_filter)
+        lead_ids = [lead["id"] for lead in selection["leads"]]
+        outcomes: Dict[str, str] = {}
+
+        if lead_ids:
+            try:
+                result = await self.db.leads.delete_many({"user_id": user_id, "id": {"$in": lead_ids}})
+            except Exception as e:
+                self.logger.error(f"Bulk lead delete error: {str(e)}")
+                raise Exception("Failed to delete leads")
+
+            remaining = set() if result.deleted_count == len(lead_ids) else set(await self._current_status(user_id, lead_ids))
+            deltas: Dict[str, int] = {}
+            for lead in selection["leads"]:
+                if lead["id"] in remaining:
+                    outcomes[lead["id"]] = "conflict"
+                    continue
+                outcomes[lead["id"]] = "deleted"
+                merge_deltas(deltas, {"leads.total": -1})
+                if lead.get("status"):
+                    merge_deltas(deltas, {f"leads.by_status.{lead['status']}": -1})
+            if deltas:
+                response_cache.bump(user_id, "leads")
+                await self.stats_service.increment(user_id, deltas)
+
+        return self._results(selection, outcomes)
+
+    # ===== Deduplication =====
+
+    async def merge_duplicates(self, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+        """Collapse leads sharing (user_id, campaign_id, email) into the oldest of them.
+
+        The survivor absorbs the others' counters, latest timestamps, tags and
+        furthest interaction/status in one atomic update that also lists the
+        absorbed ids in ``merged_ids``; duplicates already listed there are
+        only deleted. A run stopped at any point can therefore be rerun
+        without counting anything twice, and finished groups drop out.
+        """
+        stats = {"groups": 0, "duplicates": 0, "deleted": 0}
+        cursor = self.db.leads.aggregate([
+            {"$match": {"email": {"$type": "string"}}},
+            {"$group": {"_id": {"user_id": "$user_id", "campaign_id": "$campaign_id", "email": "$email"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ], allowDiskUse=True, batchSize=batch_size)
+
+        groups: List[Dict[str, Any]] = []
+        async for group in cursor:
+            stats["groups"] += 1
+            stats["duplicates"] += group["count"] - 1
+            groups.append(group["_id"])
+            if len(groups) >= batch_size:
+                if not dry_run:
+                    stats["deleted"] += await self._merge_groups(groups)
+                groups = []
+        if groups and not dry_run:
+            stats["deleted"] += await self._merge_groups(groups)
+        return stats
+
+    async def _merge_groups(self, groups: List[Dict[str, Any]]) -> int:
+        leads = await self.db.leads.find({"$or": groups}).sort([("created_at", 1), ("_id", 1)]).to_list(None)
+        by_identity: Dict[tuple, List[Dict[str, Any]]] = {}
+        for lead in leads:
+            by_identity.setdefault((lead["user_id"], lead["campaign_id"], lead["email"]), []).append(lead)
+
+        operations: List[UpdateOne] = []
+        duplicate_ids: List[str] = []
+        deltas: Dict[str, Dict[str, int]] = {}
+        for (user_id, _, _), group in by_identity.items():
+            if len(group) < 2:
+                continue
+            survivor, duplicates = group[0], group[1:]
+            update, status = self._merge_update(survivor, duplicates)
+            if update:
+                operations.append(UpdateOne({"_id": survivor["_id"]}, update))
+            user_deltas = deltas.setdefault(user_id, {})
+            merge_deltas(user_deltas, status_change_deltas("leads", survivor.get("status"), status))
+            for duplicate in duplicates:
+                duplicate_ids.append(duplicate["id"])
+                merge_deltas(user_deltas, {"leads.total": -1})
+                if duplicate.get("status"):
+                    merge_deltas(user_deltas, {f"leads.by_status.{duplicate['status']}": -1})
+
+        try:
+            if operations:
+                await self.db.leads.bulk_write(operations, ordered=False)
+            # Only after every survivor has absorbed its duplicates
+            result = await self.db.leads.delete_many({"id": {"$in": duplicate_ids}})
+        except Exception as e:
+            self.logger.error(f"Lead merge error: {str(e)}")
+            raise Exception("Failed to merge duplicate leads")
+
+        for user_id in deltas:
+            response_cache.bump(user_id, "leads")
+        await self.stats_service.increment_many(deltas)
+        return result.deleted_count
+
+    def _merge_update(self, survivor: Dict[str, Any], duplicates: List[Dict[str, Any]]) -> tuple:
+        """Update folding not-yet-absorbed duplicates into the survivor, and the survivor's resulting status"""
+        merged_ids = set(survivor.get("merged_ids") or [])
+        absorbed = [lead for lead in duplicates if lead["id"] not in merged_ids]
+        if not absorbed:
+            return {}, survivor.get("status")
+        group = [survivor] + absorbed
+
+        # A hand-set status (converted, unqualified) beats any scored one; among scored ones the hottest wins
+        statuses = [lead.get("status") for lead in group if lead.get("status")]
+        manual = [status for status in statuses if status not in SCORED_STATUSES]
+        status = manual[0] if manual else max(statuses, key=SCORED_STATUSES.index, default=survivor.get("status"))
+        interactions = [lead.get("interaction_type") for lead in group if lead.get("interaction_type") in self.INTERACTION_RANK]
+        update: Dict[str, Any] = {
+            "$inc": {
+                **{field: sum(lead.get(field) or 0 for lead in absorbed) for field in self.MERGE_COUNTERS},
+                "send_count": sum(lead.get("send_count", 1) for lead in absorbed)
+            },
+            "$addToSet": {
+                "merged_ids": {"$each": [lead["id"] for lead in absorbed]},
+                "tags": {"$each": list(dict.fromkeys(tag for lead in absorbed for tag in lead.get("tags") or []))}
+            }
+        }
+        if survivor.get("send_count") is None:
+            update["$inc"]["send_count"] += 1  # Leads stored before send_count existed were one send each
+        latest = {
+            field: max(lead[field] for lead in absorbed if lead.get(field) is not None)
+            for field in self.MERGE_LATEST if any(lead.get(field) is not None for lead in absorbed)
+        }
+        if latest:
+            update["$max"] = latest
+        fill = {
+            "status": status,
+            "interaction_type": max(interactions, key=self.INTERACTION_RANK.index, default=survivor.get("interaction_type"))
+        }
+        for field in ("name", "notes"):
+            value = next((lead[field] for lead in absorbed if lead.get(field)), None)
+            if value and not survivor.get(field):
+                fill[field] = value
+        update["$set"] = fill
+        return update, status
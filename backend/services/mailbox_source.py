@@ -0,0 +1,149 @@
+# services/mailbox_source.py
+import imaplib
+import logging
+import mailbox
+from typing import Iterator, List, Optional, Tuple
+
+from config import settings
+
+class MboxSource:
+    """Reads raw messages from an mbox file one at a time"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mbox = mailbox.mbox(path, create=False)
+
+    def iter_messages(self) -> Iterator[Tuple[str, bytes]]:
+        for key in self._mbox.iterkeys():
+            yield str(key), self._mbox.get_bytes(key)
+
+    def acknowledge(self, keys: List[str]):
+        # mbox files are append-only drops; callers rotate them after processing
+        pass
+
+    def close(self):
+        self._mbox.close()
+
+class MaildirSource:
+    """Reads raw messages from a Maildir, optionally removing processed ones"""
+
+    def __init__(self, path: str, remove_processed: bool = True):
+        self.path = path
+        self.remove_processed = remove_processed
+        self._maildir = mailbox.Maildir(path, factory=None, create=False)
+
+    def iter_messages(self) -> Iterator[Tuple[str, bytes]]:
+        for key in self._maildir.iterkeys():
+            yield key, self._maildir.get_bytes(key)
+
+    def acknowledge(self, keys: List[str]):
+        if not self.remove_processed:
+            return
+        for key in keys:
+            try:
+                self._maildir.discard(key)
+            except OSError:
+                pass
+
+    def close(self):
+        self._maildir.close()
+
+class IMAPSource:
+    """Fetches messages over IMAP in UID batches.
+
+    With ``since_uid`` only messages with a higher UID are fetched, which is
+    what incremental sync uses; otherwise ``criteria`` (default UNSEEN) picks
+    the messages. Bodies are fetched with BODY.PEEK so nothing is marked read
+    until ``acknowledge`` is called; ``fetch_spec`` can narrow the fetch to
+    selected header fields.
+    """
+
+    FETCH_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        folder: Optional[str] = None,
+        use_ssl: Optional[bool] = None,
+        criteria: str = "UNSEEN",
+        since_uid: Optional[int] = None,
+        mark_seen: bool = True,
+        fetch_spec: str = "BODY.PEEK[]"
+    ):
+        self.host = host or settings.imap_server
+        self.port = port or settings.imap_port
+        self.user = user or settings.imap_user
+        self.password = password or settings.imap_password
+        self.folder = folder or settings.imap_folder
+        self.use_ssl = settings.imap_use_ssl if use_ssl is None else use_ssl
+        self.criteria = criteria
+        self.since_uid = since_uid
+        self.mark_seen = mark_seen
+        self.fetch_spec = fetch_spec
+        self.uid_validity: Optional[int] = None
+        self.logger = logging.getLogger(__name__)
+        self._conn = self._connect()
+
+    def _connect(self) -> imaplib.IMAP4:
+        conn = imaplib.IMAP4_SSL(self.host, self.port) if self.use_ssl else imaplib.IMAP4(self.host, self.port)
+        conn.login(self.user, self.password)
+        status, _ = conn.select(self.folder)
+        if status != "OK":
+            raise Exception(f"Cannot select IMAP folder {self.folder}")
+        _, data = conn.response("UIDVALIDITY")
+        if data and data[0]:
+            self.uid_validity = int(data[0])
+        return conn
+
+    def _search(self) -> List[int]:
+        if self.since_uid is not None:
+            # "N:*" always returns the highest UID even when it is <= N, so filter again
+            status, data = self._conn.uid("SEARCH", None, f"UID {self.since_uid + 1}:*")
+        else:
+            status, data = self._conn.uid("SEARCH", None, self.criteria)
+        if status != "OK" or not data or not data[0]:
+            return []
+        uids = [int(uid) for uid in data[0].split()]
+        if self.since_uid is not None:
+            uids = [uid for uid in uids if uid > self.since_uid]
+        return sorted(uids)
+
+    def iter_messages(self) -> Iterator[Tuple[str, bytes]]:
+        uids = self._search()
+        for start in range(0, len(uids), self.FETCH_BATCH_SIZE):
+            batch = uids[start:start + self.FETCH_BATCH_SIZE]
+            status, data = self._conn.uid("FETCH", ",".join(str(uid) for uid in batch), f"(UID {self.fetch_spec})")
+            if status != "OK":
+                self.logger.error(f"IMAP fetch failed for UIDs {batch[0]}-{batch[-1]}")
+                continue
+            for item in data:
+                if not isinstance(item, tuple):
+                    continue
+                uid = self._parse_uid(item[0])
+                if uid is not None:
+                    yield str(uid), item[1]
+
+    @staticmethod
+    def _parse_uid(meta: bytes) -> Optional[int]:
+        parts = meta.decode("ascii", "replace").replace("(", " ").split()
+        for index, token in enumerate(parts):
+            if token.upper() == "UID" and index + 1 < len(parts):
+                try:
+                    return int(parts[index + 1])
+                except ValueError:
+                    return None
+        return None
+
+    def acknowledge(self, keys: List[str]):
+        if self.mark_seen and keys:
+            self._conn.uid("STORE", ",".join(keys), "+FLAGS", "(\\Seen)")
+
+    def close(self):
+        try:
+            self._conn.close()
+            self._conn.logout()
+        except (imaplib.IMAP4.error, OSError):
+            pass
@@ -0,0 +1,208 @@
+# services/reply_sync_service.py
+import logging
+import re
+from email import policy
+from email.parser import BytesHeaderParser
+from email.utils import parseaddr, parsedate_to_datetime
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+
+from config import settings, db
+from utils.lead_scoring import ScoringWeights, promoted_status, score_lead
+from .mailbox_source import IMAPSource
+from .suppression_service import normalize_email
+from .stats_service import StatsService, lead_transition_deltas
+from .rollup_service import RollupService, LeadTransition
+
+_MESSAGE_ID_PATTERN = re.compile(r'<[^<>\s]+>')
+
+# Only the headers needed for matching are fetched, never bodies
+REPLY_FETCH_SPEC = (
+    "BODY.PEEK[HEADER.FIELDS (MESSAGE-ID IN-REPLY-TO REFERENCES FROM DATE AUTO-SUBMITTED PRECEDENCE)]"
+)
+
+# Precedence values used by mailing lists and auto-responders rather than people
+AUTOMATED_PRECEDENCE = {"bulk", "junk", "list"}
+
+def referenced_message_ids(headers) -> List[str]:
+    """Message-IDs a message replies to, In-Reply-To first"""
+    ids: List[str] = []
+    for name in ("In-Reply-To", "References"):
+        value = headers.get(name)
+        if value:
+            ids.extend(match for match in _MESSAGE_ID_PATTERN.findall(str(value)) if match not in ids)
+    return ids
+
+def is_automated(headers) -> bool:
+    """True for auto-replies and bulk mail (RFC 3834 Auto-Submitted, Precedence)"""
+    auto_submitted = str(headers.get("Auto-Submitted") or "").strip().lower()
+    if auto_submitted and not auto_submitted.startswith("no"):
+        return True
+    return str(headers.get("Precedence") or "").strip().lower() in AUTOMATED_PRECEDENCE
+
+class ReplySyncService:
+    """Marks leads as replied by scanning new inbox messages over IMAP.
+
+    Each cycle fetches only UIDs above the persisted high-water mark in
+    ``mailbox_sync_state`` (reset if the folder's UIDVALIDITY changes) and
+    only the threading headers. Replies are matched to leads through the
+    Message-ID EmailService stamps on every campaign email, and only when
+    the reply comes from the lead's own address; auto-replies and bulk mail
+    are skipped. Matched leads are updated with one ``bulk_write`` per batch.
+    Each lead keeps the ids of the replies it has counted, so a batch
+    re-read after a crash before the high-water mark was saved is not
+    counted twice.
+    """
+
+    REPLY_IDS_KEPT = 50  # per lead; replays only re-read recent mail
+
+    def __init__(self, database=None, batch_size: int = 500):
+        self.db = database if database is not None else db
+        self.batch_size = batch_size
+        self.parser = BytesHeaderParser(policy=policy.compat32)
+        self.scoring_weights = ScoringWeights.from_settings()
+        self.stats_service = StatsService(self.db)
+        self.rollup_service = RollupService(self.db)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def mailbox_key(source: IMAPSource) -> str:
+        return f"{source.user}@{source.host}/{source.folder}"
+
+    async def sync(self, source: Optional[IMAPSource] = None) -> Dict[str, Any]:
+        """Run one incremental sync cycle"""
+        source = source or IMAPSource(mark_seen=False, fetch_spec=REPLY_FETCH_SPEC)
+        key = self.mailbox_key(source)
+        stats = {"messages": 0, "automated": 0, "replies": 0, "leads_updated": 0, "last_uid": None}
+
+        try:
+            state = await self.db.mailbox_sync_state.find_one({"mailbox": key})
+            if state and state.get("uid_validity") == source.uid_validity:
+                source.since_uid = state.get("last_uid", 0)
+            else:
+                # First run, or the server renumbered the folder: bounded lookback instead of a full rescan
+                since = datetime.utcnow() - timedelta(days=settings.reply_sync_lookback_days)
+                source.since_uid = None
+                source.criteria = f"SINCE {since.strftime('%d-%b-%Y')}"
+
+            last_uid = source.since_uid or 0
+            pending: List[Dict[str, Any]] = []
+            for uid, raw in source.iter_messages():
+                stats["messages"] += 1
+                last_uid = max(last_uid, int(uid))
+                headers = self.parser.parsebytes(raw)
+                if is_automated(headers):
+                    stats["automated"] += 1
+                    continue
+                references = referenced_message_ids(headers)
+                sender = normalize_email(parseaddr(str(headers.get("From") or ""))[1])
+                if not references or not sender:
+                    continue
+                pending.append({
+                    # Messages without a Message-ID are told apart by their place in the mailbox
+                    "reply_id": str(headers.get("Message-ID") or "").strip() or f"{key}:{source.uid_validity}:{uid}",
+                    "sender": sender,
+                    "references": references,
+                    "received_at": self._message_date(headers)
+                })
+
+                if len(pending) >= self.batch_size:
+                    await self._apply_batch(pending, stats)
+                    await self._save_state(key, source.uid_validity, last_uid)
+                    pending = []
+
+            await self._apply_batch(pending, stats)
+            await self._save_state(key, source.uid_validity, last_uid)
+            stats["last_uid"] = last_uid
+        finally:
+            source.close()
+
+        self.logger.info(f"Reply sync complete for {key}: {stats}")
+        return stats
+
+    @staticmethod
+    def _message_date(headers) -> datetime:
+        try:
+            parsed = parsedate_to_datetime(headers.get("Date"))
+            if parsed.tzinfo is not None:
+                parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+            return parsed
+        except (TypeError, ValueError):
+            return datetime.utcnow()
+
+    async def _apply_batch(self, pending: List[Dict[str, Any]], stats: Dict[str, Any]):
+        if not pending:
+            return
+
+        by_reference: Dict[str, List[Dict[str, Any]]] = {}
+        for reply in pending:
+            for message_id in reply["references"]:
+                by_reference.setdefault(message_id, []).append(reply)
+        leads = await self.db.leads.find(
+            {"message_id": {"$in": list(by_reference)}},
+            {
+                "id": 1, "user_id": 1, "campaign_id": 1, "email": 1, "message_id": 1, "interaction_type": 1, "status": 1,
+                "open_count": 1, "click_count": 1, "reply_count": 1, "reply_ids": 1, "_id": 0
+            }
+        ).to_list(None)
+        if not leads:
+            return
+
+        lead_ops = []
+        campaign_replies: Dict[str, int] = {}
+        transitions: List[LeadTransition] = []
+        for lead in leads:
+            # Only the lead's own address counts; a forward or a colleague answering does not
+            email = normalize_email(lead.get("email") or "")
+            counted = set(lead.get("reply_ids") or [])
+            replies: Dict[str, datetime] = {
+                reply["reply_id"]: reply["received_at"]
+                for reply in by_reference.get(lead["message_id"], [])
+                if reply["sender"] == email and reply["reply_id"] not in counted
+            }
+            if not replies:
+                continue
+
+            first_reply = lead.get("interaction_type") != "replied"
+            replied_at = max(replies.values())
+            scored = score_lead(
+                {**lead, "reply_count": (lead.get("reply_count") or 0) + len(replies), "last_interaction_at": replied_at},
+                self.scoring_weights, now=replied_at
+            )
+            status = promoted_status(lead.get("status"), scored["status"])
+            lead_ops.append(UpdateOne(
+                # Skipped if another run has counted any of these replies in the meantime
+                {"id": lead["id"], "reply_ids": {"$nin": list(replies)}},
+                {
+                    "$set": {"interaction_type": "replied", "status": status, "score": scored["score"], "scored_at": replied_at},
+                    "$max": {"replied_at": replied_at, "last_interaction_at": replied_at},
+                    "$inc": {"reply_count": len(replies)},
+                    "$push": {"reply_ids": {"$each": list(replies), "$slice": -self.REPLY_IDS_KEPT}}
+                }
+            ))
+            stats["replies"] += len(replies)
+            transitions.append((lead["user_id"], lead["campaign_id"], lead.get("status"), status))
+            if first_reply:
+                campaign_replies[lead["campaign_id"]] = campaign_replies.get(lead["campaign_id"], 0) + 1
+
+        if not lead_ops:
+            return
+        result = await self.db.leads.bulk_write(lead_ops, ordered=False)
+        stats["leads_updated"] += result.modified_count
+        await self.stats_service.increment_many(lead_transition_deltas(transitions))
+        await self.rollup_service.record_transitions(transitions)
+
+        if campaign_replies:
+            await self.db.campaigns.bulk_write([
+                UpdateOne({"id": campaign_id}, {"$inc": {"performance.reply_count": count}})
+                for campaign_id, count in campaign_replies.items()
+            ], ordered=False)
+
+    async def _save_state(self, key: str, uid_validity: Optional[int], last_uid: int):
+        await self.db.mailbox_sync_state.update_one(
+            {"mailbox": key},
+            {"$set": {"uid_validity": uid_validity, "last_uid": last_uid, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
@@ -0,0 +1,185 @@
+# services/revision_service.py
+import difflib
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+from config import settings, db
+from utils.content_codec import pack_content, unpack_content
+
+# Line-level delta: ["=", n] keeps n lines, ["-", n] drops n lines, ["+", [lines]] inserts lines
+Delta = List[list]
+
+def _lines(text: str) -> List[str]:
+    return text.splitlines(keepends=True)
+
+def line_delta(old: str, new: str) -> Delta:
+    """Ops turning old into new, line by line"""
+    old_lines, new_lines = _lines(old), _lines(new)
+    ops: Delta = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i2 - i1])
+            continue
+        if tag in ("delete", "replace"):
+            ops.append(["-", i2 - i1])
+        if tag in ("insert", "replace"):
+            ops.append(["+", new_lines[j1:j2]])
+    return ops
+
+def apply_delta(old: str, ops: Delta) -> str:
+    lines = _lines(old)
+    result: List[str] = []
+    position = 0
+    for op, arg in ops:
+        if op == "=":
+            result.extend(lines[position:position + arg])
+            position += arg
+        elif op == "-":
+            position += arg
+        elif op == "+":
+            result.extend(arg)
+        else:
+            raise ValueError(f"Unknown delta op: {op}")
+    return "".join(result)
+
+def delta_stats(ops: Delta) -> Tuple[int, int]:
+    """(lines added, lines removed)"""
+    added = sum(len(arg) for op, arg in ops if op == "+")
+    removed = sum(arg for op, arg in ops if op == "-")
+    return added, removed
+
+class RevisionConflict(ValueError):
+    """Another edit created the same revision first"""
+
+class RevisionService:
+    """Campaign content history as line deltas with periodic snapshots.
+
+    Revision 1 is the generated content. Each edit stores the delta from
+    the previous revision, except every ``content_snapshot_interval``-th
+    revision, which stores the full (packed) content, so rebuilding any
+    revision applies at most that many deltas to the nearest snapshot.
+    """
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def is_snapshot(revision: int) -> bool:
+        interval = max(1, settings.content_snapshot_interval)
+        return revision == 1 or (revision - 1) % interval == 0
+
+    async def record(
+        self,
+        campaign_id: str,
+        user_id: str,
+        revision: int,
+        content: str,
+        previous_content: Optional[str] = None,
+        source: str = "edit"
+    ):
+        """Store revision ``revision``; raises RevisionConflict if it already exists"""
+        doc: Dict[str, Any] = {
+            "campaign_id": campaign_id,
+            "user_id": user_id,
+            "revision": revision,
+            "source": source,
+            "size": len(content),
+            "created_at": datetime.utcnow()
+        }
+        if previous_content is None or self.is_snapshot(revision):
+            doc["kind"] = "snapshot"
+            doc["content"] = pack_content(content)
+            doc["lines_added"], doc["lines_removed"] = delta_stats(line_delta(previous_content or "", content))
+        else:
+            ops = line_delta(previous_content, content)
+            doc["kind"] = "delta"
+            doc["ops"] = ops
+            doc["lines_added"], doc["lines_removed"] = delta_stats(ops)
+        try:
+            await self.db.campaign_revisions.insert_one(doc)
+        except DuplicateKeyError:
+            raise RevisionConflict("Campaign was edited concurrently; reload and try again")
+
+    async def ensure_base(self, campaign_id: str, user_id: str, revision: int, content: str):
+        """Snapshot the current content of a campaign created before history was kept"""
+        await self.db.campaign_revisions.update_one(
+            {"campaign_id": campaign_id, "revision": revision},
+            {"$setOnInsert": {
+                "user_id": user_id,
+                "source": "generated" if revision == 1 else "edit",
+                "kind": "snapshot",
+                "content": pack_content(content),
+                "size": len(content),
+                "lines_added": len(_lines(content)),
+                "lines_removed": 0,
+                "created_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    async def discard(self, campaign_id: str, revision: int):
+        await self.db.campaign_revisions.delete_one({"campaign_id": campaign_id, "revision": revision})
+
+    async def delete_history(self, campaign_id: str):
+        await self.db.campaign_revisions.delete_many({"campaign_id": campaign_id})
+
+    async def list_revisions(self, campaign_id: str, user_id: str) -> List[Dict[str, Any]]:
+        """Revision metadata, newest first"""
+        try:
+            return await self.db.campaign_revisions.find(
+                {"campaign_id": campaign_id, "user_id": user_id},
+                {"revision": 1, "kind": 1, "source": 1, "size": 1, "lines_added": 1, "lines_removed": 1, "created_at": 1, "_id": 0}
+            ).sort("revision", -1).to_list(None)
+        except Exception as e:
+            self.logger.error(f"List revisions error: {str(e)}")
+            raise Exception("Failed to fetch revisions")
+
+    async def get_content(self, campaign_id: str, user_id: str, revision: int) -> Optional[str]:
+        """Content as of a revision: nearest snapshot plus the deltas after it"""
+        snapshot = await self.db.campaign_revisions.find_one(
+            {"campaign_id": campaign_id, "user_id": user_id, "kind": "snapshot", "revision": {"$lte": revision}},
+            sort=[("revision", -1)]
+        )
+        if snapshot is None:
+            return None
+        content = unpack_content(snapshot["content"])
+        if snapshot["revision"] == revision:
+            return content
+
+        deltas = await self.db.campaign_revisions.find(
+            {"campaign_id": campaign_id, "revision": {"$gt": snapshot["revision"], "$lte": revision}},
+            {"revision": 1, "kind": 1, "ops": 1, "content": 1, "_id": 0}
+        ).sort("revision", 1).to_list(None)
+        expected = snapshot["revision"] + 1
+        for doc in deltas:
+            if doc["revision"] != expected:
+                break
+            content = unpack_content(doc["content"]) if doc["kind"] == "snapshot" else apply_delta(content, doc["ops"])
+            expected += 1
+        if expected != revision + 1:
+            self.logger.error(f"Revision chain for campaign {campaign_id} is broken before revision {expected}")
+            return None
+        return content
+
+    async def diff(self, campaign_id: str, user_id: str, from_revision: int, to_revision: int) -> Optional[Dict[str, Any]]:
+        """Unified diff between two revisions"""
+        old = await self.get_content(campaign_id, user_id, from_revision)
+        new = await self.get_content(campaign_id, user_id, to_revision)
+        if old is None or new is None:
+            return None
+        added, removed = delta_stats(line_delta(old, new))
+        diff = difflib.unified_diff(
+            _lines(old), _lines(new),
+            fromfile=f"revision {from_revision}", tofile=f"revision {to_revision}"
+        )
+        return {
+            "from_revision": from_revision,
+            "to_revision": to_revision,
+            "lines_added": added,
+            "lines_removed": removed,
+            "diff": "".join(line if line.endswith("\n") else line + "\n" for line in diff)
+        }
@@ -0,0 +1,214 @@
+# services/rollup_service.py
+import logging
+import uuid
+from typing import Dict, Any, Optional, Iterable, Tuple
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config import settings, db
+
+# (user_id, campaign_id, old_status, new_status)
+LeadTransition = Tuple[str, Optional[str], Optional[str], str]
+
+BASE_METRICS = ("emails_sent", "leads_created")
+
+def transition_metric(old_status: Optional[str], new_status: str) -> str:
+    """Counter name for a lead status transition, e.g. cold_to_warm"""
+    return f"{old_status or 'none'}_to_{new_status}"
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+def _day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+class RollupService:
+    """Hourly and daily analytics buckets per user and per campaign.
+
+    Write paths ``$inc`` counters into the current hourly bucket of the
+    user and of the campaign (one upsert each). ``compact`` folds hourly
+    buckets older than ``rollup_hourly_retention_hours`` into daily buckets,
+    so trend reads touch one small document per day. Compaction tags the
+    hourly documents with a run id before folding them and daily documents
+    record the runs already applied, so an interrupted run can be resumed
+    without double counting.
+    """
+
+    COLLECTION = "analytics_rollups"
+    MAX_TREND_DAYS = 366
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.collection = self.db[self.COLLECTION]
+        self.logger = logging.getLogger(__name__)
+
+    # ===== Write side =====
+
+    async def record(self, user_id: str, campaign_id: Optional[str], counts: Dict[str, int], at: Optional[datetime] = None):
+        """Add counters to the current hourly buckets of a user and a campaign"""
+        await self.record_many([(user_id, campaign_id, counts)], at)
+
+    async def record_many(self, events: Iterable[Tuple[str, Optional[str], Dict[str, int]]], at: Optional[datetime] = None):
+        """Coalesce events per bucket and apply them in one bulk write; failures are logged"""
+        bucket = _hour(at or datetime.utcnow())
+        pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for user_id, campaign_id, counts in events:
+            scopes = [("user", user_id)]
+            if campaign_id:
+                scopes.append(("campaign", campaign_id))
+            for scope, scope_id in scopes:
+                entry = pending.setdefault((scope, scope_id), {"user_id": user_id, "counts": {}})
+                for metric, value in counts.items():
+                    if value:
+                        entry["counts"][metric] = entry["counts"].get(metric, 0) + value
+
+        operations = [
+            UpdateOne(
+                {"scope": scope, "scope_id": scope_id, "granularity": "hour", "bucket": bucket},
+                {
+                    "$inc": {f"counts.{metric}": value for metric, value in entry["counts"].items()},
+                    "$setOnInsert": {"user_id": entry["user_id"], "day": _day(bucket)}
+                },
+                upsert=True
+            )
+            for (scope, scope_id), entry in pending.items() if entry["counts"]
+        ]
+        if not operations:
+            return
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            self.logger.error(f"Analytics rollup write error: {str(e)}")
+
+    async def record_transitions(self, transitions: Iterable[LeadTransition], at: Optional[datetime] = None):
+        """Record lead status transitions"""
+        await self.record_many(
+            ((user_id, campaign_id, {transition_metric(old, new): 1}) for user_id, campaign_id, old, new in transitions if old != new),
+            at
+        )
+
+    # ===== Compaction =====
+
+    async def compact(self, retention_hours: Optional[int] = None) -> Dict[str, Any]:
+        """Fold hourly buckets of whole days older than the retention window into daily buckets"""
+        retention = retention_hours if retention_hours is not None else settings.rollup_hourly_retention_hours
+        cutoff = _day(datetime.utcnow() - timedelta(hours=retention))
+        run_id = str(uuid.uuid4())
+
+        # Runs tagged earlier but interrupted before their hourly documents were removed
+        unfinished = await self.collection.distinct("compaction_run", {"granularity": "hour", "compaction_run": {"$ne": None}})
+        await self.collection.update_many(
+            {"granularity": "hour", "bucket": {"$lt": cutoff}, "compaction_run": None},
+            {"$set": {"compaction_run": run_id}}
+        )
+
+        stats = {"cutoff": cutoff.isoformat(), "runs": 0, "hourly_buckets": 0, "daily_buckets": 0}
+        for run in [*unfinished, run_id]:
+            hourly, daily = await self._apply_compaction(run)
+            if hourly:
+                stats["runs"] += 1
+                stats["hourly_buckets"] += hourly
+                stats["daily_buckets"] += daily
+        self.logger.info(f"Analytics rollup compaction complete: {stats}")
+        return stats
+
+    async def _apply_compaction(self, run_id: str) -> Tuple[int, int]:
+        folded: Dict[Tuple[str, str, datetime], Dict[str, Any]] = {}
+        hourly = 0
+        cursor = self.collection.find({"granularity": "hour", "compaction_run": run_id})
+        async for doc in cursor:
+            hourly += 1
+            entry = folded.setdefault(
+                (doc["scope"], doc["scope_id"], doc.get("day") or _day(doc["bucket"])),
+                {"user_id": doc.get("user_id"), "counts": {}}
+            )
+            for metric, value in doc.get("counts", {}).items():
+                entry["counts"][metric] = entry["counts"].get(metric, 0) + value
+        if not hourly:
+            return 0, 0
+
+        operations = [
+            UpdateOne(
+                {"scope": scope, "scope_id": scope_id, "granularity": "day", "bucket": day, "compaction_runs": {"$ne": run_id}},
+                {
+                    "$inc": {f"counts.{metric}": value for metric, value in entry["counts"].items()},
+                    "$addToSet": {"compaction_runs": run_id},
+                    "$setOnInsert": {"user_id": entry["user_id"]}
+                },
+                upsert=True
+            )
+            for (scope, scope_id, day), entry in folded.items() if entry["counts"]
+        ]
+        if operations:
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                # A duplicate key means the daily bucket already contains this run
+                if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                    raise
+
+        await self.collection.delete_many({"granularity": "hour", "compaction_run": run_id})
+        return hourly, len(operations)
+
+    # ===== Read side =====
+
+    async def get_trend(
+        self,
+        user_id: str,
+        campaign_id: Optional[str] = None,
+        days: int = 30,
+        granularity: str = "day"
+    ) -> Dict[str, Any]:
+        """Counters per bucket for the last ``days`` days, zero-filled and oldest first"""
+        if granularity not in ("day", "hour"):
+            raise ValueError("Granularity must be 'day' or 'hour'")
+        days = max(1, min(days, self.MAX_TREND_DAYS))
+        now = datetime.utcnow()
+        if granularity == "hour":
+            # Hourly detail only exists inside the retention window
+            hours = min(days * 24, settings.rollup_hourly_retention_hours)
+            start = _hour(now) - timedelta(hours=hours - 1)
+            step, floor = timedelta(hours=1), _hour
+        else:
+            start = _day(now) - timedelta(days=days - 1)
+            step, floor = timedelta(days=1), _day
+
+        query = {
+            "scope": "campaign" if campaign_id else "user",
+            "scope_id": campaign_id or user_id,
+            "user_id": user_id,
+            "bucket": {"$gte": start}
+        }
+        if granularity == "hour":
+            query["granularity"] = "hour"
+        documents = await self.collection.find(
+            query,
+            {"granularity": 1, "bucket": 1, "counts": 1, "compaction_run": 1, "compaction_runs": 1, "_id": 0}
+        ).to_list(None)
+
+        # Hourly buckets whose run is already in the daily bucket are mid-compaction duplicates
+        applied_runs = set()
+        for doc in documents:
+            applied_runs.update(doc.get("compaction_runs", []))
+
+        buckets: Dict[datetime, Dict[str, int]] = {}
+        metrics = set(BASE_METRICS)
+        for doc in documents:
+            if doc["granularity"] == "hour" and doc.get("compaction_run") in applied_runs:
+                continue
+            counts = buckets.setdefault(floor(doc["bucket"]), {})
+            for metric, value in doc.get("counts", {}).items():
+                counts[metric] = counts.get(metric, 0) + value
+                metrics.add(metric)
+
+        series = []
+        bucket = start
+        while bucket <= now:
+            counts = buckets.get(bucket, {})
+            series.append({"bucket": bucket.isoformat(), **{metric: counts.get(metric, 0) for metric in sorted(metrics)}})
+            bucket += step
+
+        totals = {metric: sum(point[metric] for point in series) for metric in sorted(metrics)}
+        return {"granularity": granularity, "start": start.isoformat(), "series": series, "totals": totals}
@@ -0,0 +1,152 @@
+# services/scoring_service.py
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from pymongo import UpdateOne
+
+from config import settings, db
+from utils.lead_scoring import SCORED_STATUSES, ScoringWeights, compute_scores, status_codes
+from utils.response_cache import response_cache
+from .stats_service import StatsService, lead_transition_deltas
+from .rollup_service import RollupService, LeadTransition
+
+class ScoringService:
+    """Batch lead rescoring with NumPy.
+
+    Interaction events rescore their lead as they are flushed (tracking and
+    reply sync call ``utils.lead_scoring.score_lead``), which only ever
+    promotes. Recency decay and weight changes are applied here instead:
+    the counters of every scored lead of a user (or one campaign) are read
+    into arrays once, all scores and statuses are computed in a single
+    vectorized pass, and only leads whose status changed are written back,
+    ``lead_score_write_batch_size`` updates per ``bulk_write``. Leads whose
+    status a user set by hand (``status_source`` "manual") are not rescored.
+    """
+
+    FEATURE_PROJECTION = {
+        "id": 1, "campaign_id": 1, "status": 1, "open_count": 1, "click_count": 1,
+        "reply_count": 1, "last_interaction_at": 1, "created_at": 1, "_id": 0
+    }
+    READ_BATCH_SIZE = 10000
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.stats_service = StatsService(self.db)
+        self.rollup_service = RollupService(self.db)
+        self.logger = logging.getLogger(__name__)
+
+    async def load_features(self, user_id: str, campaign_id: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Counters of a user's (or campaign's) scored leads as parallel arrays"""
+        query: Dict[str, Any] = {
+            "user_id": user_id,
+            "status": {"$in": list(SCORED_STATUSES)},
+            "status_source": {"$ne": "manual"},
+            "interaction_type": {"$ne": "bounced"}
+        }
+        if campaign_id:
+            query["campaign_id"] = campaign_id
+        ids, campaign_ids, statuses, opens, clicks, replies, last_at = [], [], [], [], [], [], []
+        cursor = self.db.leads.find(query, self.FEATURE_PROJECTION).batch_size(self.READ_BATCH_SIZE)
+        async for lead in cursor:
+            ids.append(lead["id"])
+            campaign_ids.append(lead.get("campaign_id"))
+            statuses.append(SCORED_STATUSES.index(lead["status"]))
+            opens.append(lead.get("open_count") or 0)
+            clicks.append(lead.get("click_count") or 0)
+            replies.append(lead.get("reply_count") or 0)
+            last_at.append(lead.get("last_interaction_at") or lead.get("created_at"))
+        return {
+            "id": np.array(ids, dtype=object),
+            "campaign_id": np.array(campaign_ids, dtype=object),
+            "status": np.array(statuses, dtype=np.int8),
+            "open_count": np.array(opens, dtype=np.float64),
+            "click_count": np.array(clicks, dtype=np.float64),
+            "reply_count": np.array(replies, dtype=np.float64),
+            "last_interaction_at": np.array(last_at, dtype="datetime64[ms]")
+        }
+
+    @staticmethod
+    def score_features(features: Dict[str, np.ndarray], weights: ScoringWeights, now: np.datetime64) -> Dict[str, np.ndarray]:
+        """Scores and status codes for every lead in one pass"""
+        age_days = (now - features["last_interaction_at"]) / np.timedelta64(1, "D")
+        scores = compute_scores(
+            features["open_count"], features["click_count"], features["reply_count"],
+            np.nan_to_num(age_days, nan=0.0), weights
+        )
+        return {"score": scores, "status": status_codes(scores, weights)}
+
+    async def rescore(
+        self,
+        user_id: str,
+        campaign_id: Optional[str] = None,
+        weights: Optional[ScoringWeights] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Recompute all scores of a user or campaign and write back the status changes"""
+        weights = weights or ScoringWeights.from_settings()
+        scored_at = datetime.utcnow()
+        now = np.datetime64(scored_at, "ms")
+        try:
+            features = await self.load_features(user_id, campaign_id)
+        except Exception as e:
+            self.logger.error(f"Lead score load error: {str(e)}")
+            raise Exception("Failed to load lead features")
+
+        scored = self.score_features(features, weights, now)
+        changed = np.flatnonzero(scored["status"] != features["status"])
+        new_counts = np.bincount(scored["status"], minlength=len(SCORED_STATUSES))
+        stats = {
+            "scanned": int(features["id"].size),
+            "changed": int(changed.size),
+            "updated": 0,
+            "conflicts": 0,
+            "by_status": {status: int(count) for status, count in zip(SCORED_STATUSES, new_counts)}
+        }
+        if dry_run or not changed.size:
+            return stats
+
+        transitions: List[LeadTransition] = []
+        batch_size = max(1, settings.lead_score_write_batch_size)
+        for start in range(0, changed.size, batch_size):
+            chunk = changed[start:start + batch_size]
+            # Conditional on the status read above, so a concurrent change is never overwritten
+            operations = [
+                UpdateOne(
+                    {
+                        "id": features["id"][i], "user_id": user_id,
+                        "status": SCORED_STATUSES[features["status"][i]], "status_source": {"$ne": "manual"}
+                    },
+                    {"$set": {"status": SCORED_STATUSES[scored["status"][i]], "score": float(scored["score"][i]), "scored_at": scored_at}}
+                )
+                for i in chunk
+            ]
+            try:
+                result = await self.db.leads.bulk_write(operations, ordered=False)
+            except Exception as e:
+                self.logger.error(f"Lead score write error: {str(e)}")
+                raise Exception("Failed to write lead scores")
+
+            landed = chunk
+            if result.modified_count != len(chunk):
+                current = await self._current_status(user_id, features["id"][chunk].tolist())
+                landed = [i for i in chunk if current.get(features["id"][i]) == SCORED_STATUSES[scored["status"][i]]]
+            stats["updated"] += len(landed)
+            stats["conflicts"] += len(chunk) - len(landed)
+            transitions.extend(
+                (user_id, features["campaign_id"][i], SCORED_STATUSES[features["status"][i]], SCORED_STATUSES[scored["status"][i]])
+                for i in landed
+            )
+
+        if transitions:
+            response_cache.bump(user_id, "leads")
+            await self.stats_service.increment_many(lead_transition_deltas(transitions))
+            await self.rollup_service.record_transitions(transitions)
+        return stats
+
+    async def _current_status(self, user_id: str, lead_ids: List[str]) -> Dict[str, Optional[str]]:
+        leads = await self.db.leads.find(
+            {"user_id": user_id, "id": {"$in": lead_ids}}, {"id": 1, "status": 1, "_id": 0}
+        ).to_list(None)
+        return {lead["id"]: lead.get("status") for lead in leads}
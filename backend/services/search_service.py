@@ -0,0 +1,90 @@
+# services/search_service.py
+import logging
+from typing import Dict, Any, Optional
+
+from config import db
+from models import CampaignSummary, Lead
+from utils.constants import VALIDATION_RULES
+from utils.helpers import clamp_page_size
+
+class SearchService:
+    """Relevance-ranked search over a user's campaigns and leads.
+
+    Both collections carry a text index prefixed by ``user_id``, so every
+    search is an indexed lookup inside one user's documents. Campaigns are
+    matched on title, hashtags and ``search_terms`` (the distinct words of
+    the content, written with every content change) because packed content
+    cannot be text-indexed. Leads are matched on email, name and notes.
+    """
+
+    MAX_QUERY_LENGTH = 200
+    MAX_PAGE = 50  # Text matches are ranked, not keyset-ordered, so deep pages cost a skip
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def text_query(cls, query: str) -> str:
+        """$search string; email addresses are quoted so they match as a phrase, not as separate words"""
+        query = (query or "").strip()
+        if not query:
+            raise ValueError("Search query is required")
+        if len(query) > cls.MAX_QUERY_LENGTH:
+            raise ValueError(f"Search query must be at most {cls.MAX_QUERY_LENGTH} characters")
+        return " ".join(f'"{term}"' if "@" in term else term for term in query.replace('"', " ").split())
+
+    def _page(self, page: int, limit: Optional[int]) -> Dict[str, int]:
+        if page < 1 or page > self.MAX_PAGE:
+            raise ValueError(f"Page must be between 1 and {self.MAX_PAGE}")
+        page_size = clamp_page_size(limit)
+        return {"page": page, "page_size": page_size, "skip": (page - 1) * page_size}
+
+    async def _search(self, collection, user_id: str, query: str, projection: Dict[str, Any], page: int, limit: Optional[int]) -> Dict[str, Any]:
+        paging = self._page(page, limit)
+        documents = await collection.find(
+            {"user_id": user_id, "$text": {"$search": self.text_query(query)}},
+            {**projection, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"}), ("created_at", -1)]).skip(paging["skip"]).limit(
+            paging["page_size"] + 1
+        ).to_list(paging["page_size"] + 1)
+
+        has_more = len(documents) > paging["page_size"]
+        return {
+            "items": documents[:paging["page_size"]],
+            "pagination": {
+                "page": paging["page"],
+                "page_size": paging["page_size"],
+                "has_more": has_more and paging["page"] < self.MAX_PAGE,
+                "next_page": paging["page"] + 1 if has_more and paging["page"] < self.MAX_PAGE else None
+            }
+        }
+
+    async def search_campaigns(self, user_id: str, query: str, page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Campaign summaries matching the query, best match first"""
+        try:
+            result = await self._search(
+                self.db.campaigns, user_id, query,
+                CampaignSummary.projection(VALIDATION_RULES["CAMPAIGN_PREVIEW_LENGTH"]), page, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Campaign search error: {str(e)}")
+            raise Exception("Failed to search campaigns")
+        result["items"] = [
+            {**CampaignSummary(**doc).dict(), "score": round(doc.get("score", 0), 4)} for doc in result["items"]
+        ]
+        return result
+
+    async def search_leads(self, user_id: str, query: str, page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Leads matching the query, best match first"""
+        try:
+            result = await self._search(self.db.leads, user_id, query, {"_id": 0}, page, limit)
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Lead search error: {str(e)}")
+            raise Exception("Failed to search leads")
+        result["items"] = [{**Lead(**doc).dict(), "score": round(doc.get("score", 0), 4)} for doc in result["items"]]
+        return result
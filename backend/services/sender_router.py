@@ -0,0 +1,188 @@
+# services/sender_router.py
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from config import settings, db
+
+@dataclass
+class SenderAccount:
+    """One SMTP identity in the sender pool"""
+    email: str
+    password: str
+    host: str = "smtp.gmail.com"
+    port: int = 587
+    use_tls: bool = True
+    weight: int = 1
+    daily_quota: int = 500
+
+@dataclass
+class SenderHealth:
+    consecutive_failures: int = 0
+    disabled_until: float = 0.0
+    total_sent: int = 0
+    total_failures: int = 0
+
+def load_sender_pool() -> List[SenderAccount]:
+    """Parse SENDER_POOL (a JSON array of SenderAccount fields)"""
+    if not settings.sender_pool:
+        return []
+    try:
+        entries = json.loads(settings.sender_pool)
+        return [
+            SenderAccount(**{"daily_quota": settings.sender_daily_quota, **entry})
+            for entry in entries
+        ]
+    except (ValueError, TypeError) as e:
+        logging.getLogger(__name__).error(f"Invalid SENDER_POOL configuration: {str(e)}")
+        return []
+
+class SenderRouter:
+    """Spreads sends across a pool of sender accounts.
+
+    Selection is smooth weighted round-robin where each sender's weight is
+    scaled by its remaining daily quota, so accounts drain in proportion to
+    their capacity. Senders that fail ``failure_threshold`` times in a row are
+    skipped for ``cooldown_seconds``. Daily usage is kept in the
+    ``sender_usage`` collection so quotas hold across workers and restarts;
+    concurrent campaigns may overshoot by at most one flush interval.
+    """
+
+    USAGE_FLUSH_EVERY = 100
+
+    def __init__(self, database=None, failure_threshold: int = 3, cooldown_seconds: int = 300):
+        self.db = database if database is not None else db
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._health: Dict[str, SenderHealth] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def health(self, sender: SenderAccount) -> SenderHealth:
+        return self._health.setdefault(sender.email, SenderHealth())
+
+    def is_healthy(self, sender: SenderAccount) -> bool:
+        return self.health(sender).disabled_until <= time.monotonic()
+
+    def report_success(self, sender: SenderAccount):
+        health = self.health(sender)
+        health.consecutive_failures = 0
+        health.total_sent += 1
+
+    def report_failure(self, sender: SenderAccount):
+        health = self.health(sender)
+        health.consecutive_failures += 1
+        health.total_failures += 1
+        if health.consecutive_failures >= self.failure_threshold:
+            health.disabled_until = time.monotonic() + self.cooldown_seconds
+            health.consecutive_failures = 0
+            self.logger.warning(f"Sender {sender.email} disabled for {self.cooldown_seconds}s after repeated failures")
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.utcnow().strftime("%Y-%m-%d")
+
+    async def open_dispatch(self, senders: List[SenderAccount]) -> "SenderDispatch":
+        """Load today's usage for the pool and return a per-campaign dispatcher"""
+        used: Dict[str, int] = {}
+        if senders:
+            cursor = self.db.sender_usage.find(
+                {"day": self._today(), "sender": {"$in": [sender.email for sender in senders]}},
+                {"sender": 1, "sent": 1, "_id": 0}
+            )
+            used = {doc["sender"]: doc.get("sent", 0) async for doc in cursor}
+        remaining = {sender.email: max(0, sender.daily_quota - used.get(sender.email, 0)) for sender in senders}
+        return SenderDispatch(self, senders, remaining)
+
+    async def record_usage(self, counts: Dict[str, int]):
+        """Add sent counts to today's per-sender usage documents"""
+        operations = [
+            UpdateOne(
+                {"sender": sender, "day": self._today()},
+                {"$inc": {"sent": count}, "$setOnInsert": {"created_at": datetime.utcnow()}},
+                upsert=True
+            )
+            for sender, count in counts.items() if count
+        ]
+        if operations:
+            await self.db.sender_usage.bulk_write(operations, ordered=False)
+
+    def get_status(self, senders: Iterable[SenderAccount]) -> List[Dict[str, Any]]:
+        status = []
+        for sender in senders:
+            health = self.health(sender)
+            status.append({
+                "sender_email": sender.email,
+                "smtp_server": sender.host,
+                "weight": sender.weight,
+                "daily_quota": sender.daily_quota,
+                "healthy": self.is_healthy(sender),
+                "total_sent": health.total_sent,
+                "total_failures": health.total_failures
+            })
+        return status
+
+class SenderDispatch:
+    """Per-campaign selection state on top of a SenderRouter"""
+
+    def __init__(self, router: SenderRouter, senders: List[SenderAccount], remaining: Dict[str, int]):
+        self.router = router
+        self.senders = senders
+        self.remaining = remaining
+        self.sent: Dict[str, int] = {sender.email: 0 for sender in senders}
+        self._unflushed: Dict[str, int] = {sender.email: 0 for sender in senders}
+        self._current: Dict[str, float] = {sender.email: 0.0 for sender in senders}
+
+    @property
+    def capacity(self) -> int:
+        return sum(self.remaining.values())
+
+    def choose(self, exclude: Iterable[str] = ()) -> Optional[SenderAccount]:
+        """Pick the next sender, or None when every sender is exhausted or unhealthy"""
+        excluded = set(exclude)
+        candidates = [
+            sender for sender in self.senders
+            if sender.email not in excluded
+            and self.remaining[sender.email] > 0
+            and self.router.is_healthy(sender)
+        ]
+        if not candidates:
+            return None
+
+        total = 0.0
+        best = None
+        for sender in candidates:
+            weight = float(sender.weight * self.remaining[sender.email])
+            self._current[sender.email] += weight
+            total += weight
+            if best is None or self._current[sender.email] > self._current[best.email]:
+                best = sender
+        self._current[best.email] -= total
+        return best
+
+    async def succeeded(self, sender: SenderAccount):
+        self.router.report_success(sender)
+        self.remaining[sender.email] -= 1
+        self.sent[sender.email] += 1
+        self._unflushed[sender.email] += 1
+        if sum(self._unflushed.values()) >= self.router.USAGE_FLUSH_EVERY:
+            await self.flush()
+
+    def failed(self, sender: SenderAccount):
+        self.router.report_failure(sender)
+
+    async def flush(self):
+        """Persist usage accumulated since the last flush"""
+        pending = {email: count for email, count in self._unflushed.items() if count}
+        if not pending:
+            return
+        for email in pending:
+            self._unflushed[email] = 0
+        try:
+            await self.router.record_usage(pending)
+        except Exception as e:
+            self.router.logger.error(f"Sender usage flush error: {str(e)}")
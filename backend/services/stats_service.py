@@ -0,0 +1,238 @@
+# services/stats_service.py
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from config import db
+from models import CampaignSummary
+from utils.constants import VALIDATION_RULES
+
+def campaign_counter_deltas(status: str, campaign_type: str, emails_sent: int = 0, sign: int = 1) -> Dict[str, int]:
+    """Counter changes for adding (sign=1) or removing (sign=-1) one campaign"""
+    deltas = {
+        "campaigns.total": sign,
+        f"campaigns.by_status.{status}": sign,
+        f"campaigns.by_type.{campaign_type}": sign
+    }
+    if status == "sent" and emails_sent:
+        deltas["total_sent"] = sign * emails_sent
+    return deltas
+
+def status_change_deltas(kind: str, old_status: Optional[str], new_status: str) -> Dict[str, int]:
+    """Counter changes for moving one campaign or lead between statuses"""
+    if old_status == new_status:
+        return {}
+    deltas = {f"{kind}.by_status.{new_status}": 1}
+    if old_status:
+        deltas[f"{kind}.by_status.{old_status}"] = -1
+    return deltas
+
+def lead_transition_deltas(transitions: Iterable[Tuple[str, Optional[str], Optional[str], str]]) -> Dict[str, Dict[str, int]]:
+    """Per-user counter changes for (user_id, campaign_id, old_status, new_status) transitions"""
+    deltas: Dict[str, Dict[str, int]] = {}
+    for user_id, _, old_status, new_status in transitions:
+        merge_deltas(deltas.setdefault(user_id, {}), status_change_deltas("leads", old_status, new_status))
+    return deltas
+
+def merge_deltas(target: Dict[str, int], deltas: Dict[str, int]) -> Dict[str, int]:
+    for field, value in deltas.items():
+        target[field] = target.get(field, 0) + value
+    return target
+
+def _flatten(doc: Dict[str, Any], prefix: str = "") -> Dict[str, int]:
+    flat = {}
+    for key, value in doc.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        elif isinstance(value, int):
+            flat[path] = value
+    return flat
+
+class StatsService:
+    """Per-user dashboard counters and the aggregations that rebuild them.
+
+    Every write path that creates, deletes or re-statuses a campaign or lead
+    applies an atomic ``$inc`` to the user's ``user_stats`` document, so reads
+    are a single indexed lookup regardless of history. Increments never
+    upsert: a user without a counters document gets one rebuilt from the
+    ``$facet``/``$group`` aggregations on first read, and ``reconcile``
+    rebuilds documents on a schedule and reports any drift it corrects.
+    """
+
+    RECENT_CAMPAIGNS = 5
+    LEAD_STATUSES = ("cold", "warm", "hot")
+    CAMPAIGN_TYPES = ("email", "social_media", "direct_message")
+    COUNTER_FIELDS = ("campaigns", "leads", "total_sent")
+    SUMMARY_PROJECTION = CampaignSummary.projection(VALIDATION_RULES["CAMPAIGN_PREVIEW_LENGTH"])
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.logger = logging.getLogger(__name__)
+
+    # ===== Incremental maintenance =====
+
+    async def increment(self, user_id: str, deltas: Dict[str, int]):
+        """Apply counter deltas for one user; failures are logged and left to reconciliation"""
+        await self.increment_many({user_id: deltas})
+
+    async def increment_many(self, deltas_by_user: Dict[str, Dict[str, int]]):
+        """Apply counter deltas for several users in one bulk write"""
+        now = datetime.utcnow()
+        operations = []
+        for user_id, deltas in deltas_by_user.items():
+            changes = {field: value for field, value in deltas.items() if value}
+            if changes:
+                operations.append(UpdateOne(
+                    {"user_id": user_id},
+                    {"$inc": changes, "$set": {"updated_at": now}}
+                ))
+        if not operations:
+            return
+        try:
+            await self.db.user_stats.bulk_write(operations, ordered=False)
+        except Exception as e:
+            self.logger.error(f"User stats increment error: {str(e)}")
+
+    # ===== Reads =====
+
+    async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
+        """Counters document for a user, rebuilt from scratch if it does not exist yet"""
+        stats = await self.db.user_stats.find_one({"user_id": user_id}, {"_id": 0})
+        if stats is None:
+            stats = await self.compute_user_stats(user_id)
+            await self.db.user_stats.update_one(
+                {"user_id": user_id},
+                {"$setOnInsert": stats},
+                upsert=True
+            )
+        return stats
+
+    async def get_campaign_stats(self, user_id: str) -> Dict[str, Any]:
+        """Campaign counts by status and type plus emails sent"""
+        stats = await self.get_user_stats(user_id)
+        campaigns = stats.get("campaigns", {})
+        by_type = campaigns.get("by_type", {})
+        return {
+            "total_campaigns": campaigns.get("total", 0),
+            "campaigns_by_status": {status: count for status, count in campaigns.get("by_status", {}).items() if count},
+            "total_emails_sent": stats.get("total_sent", 0),
+            "campaigns_by_type": {campaign_type: by_type.get(campaign_type, 0) for campaign_type in self.CAMPAIGN_TYPES}
+        }
+
+    async def get_dashboard(self, user_id: str) -> Dict[str, Any]:
+        """Everything the dashboard page shows: one counters lookup and one indexed find"""
+        try:
+            stats, recent_campaigns = await asyncio.gather(
+                self.get_user_stats(user_id),
+                self.db.campaigns.find({"user_id": user_id}, self.SUMMARY_PROJECTION)
+                    .sort("created_at", -1).limit(self.RECENT_CAMPAIGNS).to_list(self.RECENT_CAMPAIGNS)
+            )
+        except Exception as e:
+            self.logger.error(f"Dashboard stats error: {str(e)}")
+            raise Exception("Failed to fetch dashboard data")
+
+        leads = stats.get("leads", {})
+        return {
+            "campaigns_count": stats.get("campaigns", {}).get("total", 0),
+            "leads_count": leads.get("total", 0),
+            "total_sent": stats.get("total_sent", 0),
+            "leads_by_status": {status: leads.get("by_status", {}).get(status, 0) for status in self.LEAD_STATUSES},
+            "recent_campaigns": recent_campaigns
+        }
+
+    # ===== Rebuild and reconciliation =====
+
+    @staticmethod
+    def campaign_pipeline(user_id: str) -> List[Dict[str, Any]]:
+        return [
+            {"$match": {"user_id": user_id}},
+            {"$facet": {
+                "by_status": [
+                    {"$group": {
+                        "_id": "$status",
+                        "count": {"$sum": 1},
+                        "emails_sent": {"$sum": {"$ifNull": ["$performance.sent_count", 0]}}
+                    }}
+                ],
+                "by_type": [
+                    {"$group": {"_id": "$campaign_type", "count": {"$sum": 1}}}
+                ]
+            }}
+        ]
+
+    @staticmethod
+    def lead_pipeline(user_id: str) -> List[Dict[str, Any]]:
+        return [
+            {"$match": {"user_id": user_id}},
+            # Only indexed fields are referenced, so the scan is covered by (user_id, status)
+            {"$project": {"status": 1, "_id": 0}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]
+
+    async def compute_user_stats(self, user_id: str) -> Dict[str, Any]:
+        """Counters computed from the campaigns and leads collections"""
+        campaign_result, lead_groups = await asyncio.gather(
+            self.db.campaigns.aggregate(self.campaign_pipeline(user_id)).to_list(1),
+            self.db.leads.aggregate(self.lead_pipeline(user_id)).to_list(None)
+        )
+        facets = campaign_result[0] if campaign_result else {}
+        by_status = [doc for doc in facets.get("by_status", []) if doc["_id"]]
+        by_type = [doc for doc in facets.get("by_type", []) if doc["_id"]]
+
+        return {
+            "user_id": user_id,
+            "campaigns": {
+                "total": sum(doc["count"] for doc in facets.get("by_status", [])),
+                "by_status": {doc["_id"]: doc["count"] for doc in by_status},
+                "by_type": {doc["_id"]: doc["count"] for doc in by_type}
+            },
+            "leads": {
+                "total": sum(doc["count"] for doc in lead_groups),
+                "by_status": {doc["_id"]: doc["count"] for doc in lead_groups if doc["_id"]}
+            },
+            "total_sent": next((doc["emails_sent"] for doc in by_status if doc["_id"] == "sent"), 0),
+            "updated_at": datetime.utcnow()
+        }
+
+    async def rebuild_user_stats(self, user_id: str) -> List[Dict[str, Any]]:
+        """Recompute a user's counters, store them and return the fields that had drifted.
+
+        Writes landing between the aggregation and the replace are missed
+        until the next rebuild, so reconciliation is best run off-peak.
+        """
+        stored = await self.db.user_stats.find_one({"user_id": user_id}, {"_id": 0}) or {}
+        actual = await self.compute_user_stats(user_id)
+
+        stored_flat = _flatten({key: stored[key] for key in self.COUNTER_FIELDS if key in stored})
+        actual_flat = _flatten({key: actual[key] for key in self.COUNTER_FIELDS})
+        drift = [
+            {"field": field, "stored": stored_flat.get(field, 0), "actual": actual_flat.get(field, 0)}
+            for field in sorted(set(stored_flat) | set(actual_flat))
+            if stored_flat.get(field, 0) != actual_flat.get(field, 0)
+        ]
+
+        await self.db.user_stats.replace_one({"user_id": user_id}, actual, upsert=True)
+        return drift
+
+    async def reconcile(self, user_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Rebuild counters for the given users (default: every user) and report drift"""
+        if user_ids is None:
+            user_ids = [doc["id"] async for doc in self.db.users.find({}, {"id": 1, "_id": 0}) if doc.get("id")]
+
+        report = {"users": 0, "drifted_users": 0, "drift": {}}
+        for user_id in user_ids:
+            report["users"] += 1
+            try:
+                drift = await self.rebuild_user_stats(user_id)
+            except Exception as e:
+                self.logger.error(f"User stats rebuild failed for {user_id}: {str(e)}")
+                continue
+            if drift:
+                report["drifted_users"] += 1
+                report["drift"][user_id] = drift
+                self.logger.warning(f"User stats drift for {user_id}: {drift}")
+        return report
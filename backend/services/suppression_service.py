@@ -0,0 +1,124 @@
+# services/suppression_service.py
+import logging
+import uuid
+from typing import List, Dict, Any, Optional, Set, Iterable, Tuple
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from config import db
+from utils.constants import SUPPRESSION_REASONS
+
+def normalize_email(email: str) -> str:
+    """Canonical form used for every suppression and dedup comparison"""
+    return email.strip().lower()
+
+class SuppressionService:
+    """Per-user suppression list and per-campaign "already sent" index.
+
+    Both are read once per send into plain Python sets so that even very
+    large recipient lists are filtered with O(1) membership checks before
+    any SMTP connection is opened.
+    """
+
+    CURSOR_BATCH_SIZE = 5000
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.logger = logging.getLogger(__name__)
+
+    def validate_reason(self, reason: str) -> bool:
+        """Validate suppression reason"""
+        return reason in SUPPRESSION_REASONS.values()
+
+    async def add_suppressions(self, user_id: str, emails: Iterable[str], reason: str, source: Optional[str] = None) -> int:
+        """Suppress addresses for a user, returns how many were newly added"""
+        return await self.suppress_many(((user_id, email) for email in emails), reason, source)
+
+    async def suppress_many(self, entries: Iterable[Tuple[str, str]], reason: str, source: Optional[str] = None) -> int:
+        """Suppress (user_id, email) pairs across users in a single bulk write"""
+        if not self.validate_reason(reason):
+            raise ValueError(f"Invalid suppression reason: {reason}")
+
+        now = datetime.utcnow()
+        pairs = {(user_id, normalize_email(email)) for user_id, email in entries if email and email.strip()}
+        operations = [
+            UpdateOne(
+                {"user_id": user_id, "email": email},
+                {
+                    "$set": {"reason": reason, "source": source, "updated_at": now},
+                    "$setOnInsert": {"id": str(uuid.uuid4()), "user_id": user_id, "email": email, "created_at": now}
+                },
+                upsert=True
+            )
+            for user_id, email in pairs
+        ]
+        if not operations:
+            return 0
+
+        try:
+            result = await self.db.suppressions.bulk_write(operations, ordered=False)
+            return result.upserted_count
+        except Exception as e:
+            self.logger.error(f"Add suppressions error: {str(e)}")
+            raise Exception("Failed to update suppression list")
+
+    async def remove_suppression(self, user_id: str, email: str) -> bool:
+        """Remove an address from a user's suppression list"""
+        try:
+            result = await self.db.suppressions.delete_one({"user_id": user_id, "email": normalize_email(email)})
+            return result.deleted_count > 0
+        except Exception as e:
+            self.logger.error(f"Remove suppression error: {str(e)}")
+            raise Exception("Failed to update suppression list")
+
+    async def get_suppressions(self, user_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """List suppressed addresses for a user"""
+        return await self.db.suppressions.find(
+            {"user_id": user_id},
+            {"_id": 0}
+        ).sort("created_at", -1).limit(limit).to_list(limit)
+
+    async def _load_emails(self, collection, query: Dict[str, Any]) -> Set[str]:
+        # Covered by the (user_id, email) / (campaign_id, email) indexes
+        cursor = collection.find(query, {"email": 1, "_id": 0}).batch_size(self.CURSOR_BATCH_SIZE)
+        return {normalize_email(doc["email"]) async for doc in cursor if doc.get("email")}
+
+    async def load_suppressed(self, user_id: str) -> Set[str]:
+        """Load every suppressed address for a user"""
+        return await self._load_emails(self.db.suppressions, {"user_id": user_id})
+
+    async def load_already_sent(self, campaign_id: str) -> Set[str]:
+        """Load every address that already received a campaign"""
+        return await self._load_emails(self.db.leads, {"campaign_id": campaign_id})
+
+    async def filter_recipients(self, user_id: str, campaign_id: str, recipients: List[str]) -> Dict[str, Any]:
+        """Drop duplicates, suppressed addresses and prior recipients, preserving order"""
+        suppressed = await self.load_suppressed(user_id)
+        already_sent = await self.load_already_sent(campaign_id)
+
+        seen: Set[str] = set()
+        allowed = []
+        duplicates = 0
+        skipped_suppressed = []
+        skipped_already_sent = []
+
+        for recipient in recipients:
+            key = normalize_email(recipient)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            if key in suppressed:
+                skipped_suppressed.append(recipient)
+            elif key in already_sent:
+                skipped_already_sent.append(recipient)
+            else:
+                allowed.append(recipient)
+
+        return {
+            "recipients": allowed,
+            "skipped_duplicates": duplicates,
+            "skipped_suppressed": skipped_suppressed,
+            "skipped_already_sent": skipped_already_sent
+        }
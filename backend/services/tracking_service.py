@@ -0,0 +1,265 @@
+# services/tracking_service.py
+import asyncio
+import base64
+import hashlib
+import hmac
+import html as html_lib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Set, Tuple
+from datetime import datetime
+from urllib.parse import quote
+
+from pymongo import UpdateOne
+from pymongo.write_concern import WriteConcern
+
+from config import settings, db
+from utils.lead_scoring import ScoringWeights, promoted_status, score_lead
+from utils.response_cache import response_cache
+from .stats_service import StatsService, lead_transition_deltas
+from .rollup_service import RollupService, LeadTransition
+
+# Transparent 1x1 GIF served for every open, built once at import
+TRACKING_PIXEL = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# Only href attribute values: image sources and link text keep their URLs
+_LINK_PATTERN = re.compile(r'(?<![\w-])(href\s*=\s*)(["\'])(https?://[^\s<>"\']+)\2', re.IGNORECASE)
+
+def tracking_enabled() -> bool:
+    """Tracking needs a public base URL and its own signing secret"""
+    return bool(settings.tracking_base_url and settings.tracking_secret)
+
+def sign_tracking(campaign_id: str, lead_id: str, url: str = "") -> str:
+    """Short HMAC binding a tracking URL to its campaign, lead and target"""
+    message = f"{campaign_id}:{lead_id}:{url}".encode("utf-8")
+    return hmac.new(settings.tracking_secret.encode("utf-8"), message, hashlib.sha256).hexdigest()[:20]
+
+def verify_tracking(signature: str, campaign_id: str, lead_id: str, url: str = "") -> bool:
+    """Constant-time check of a tracking signature; nothing verifies without a secret"""
+    if not settings.tracking_secret:
+        return False
+    return hmac.compare_digest(signature, sign_tracking(campaign_id, lead_id, url))
+
+def instrument_html(html: str, campaign_id: str, lead_id: str) -> str:
+    """Rewrite links through the click redirect and append the open pixel"""
+    if not tracking_enabled():
+        return html
+    base = settings.tracking_base_url.rstrip("/")
+
+    def rewrite(match: re.Match) -> str:
+        attribute, quote_char = match.group(1), match.group(2)
+        url = html_lib.unescape(match.group(3))
+        tracked = f"{base}/track/click/{campaign_id}/{lead_id}?url={quote(url, safe='')}&amp;sig={sign_tracking(campaign_id, lead_id, url)}"
+        return f"{attribute}{quote_char}{tracked}{quote_char}"
+
+    pixel = f"{base}/track/open/{campaign_id}/{lead_id}/{sign_tracking(campaign_id, lead_id)}.gif"
+    return _LINK_PATTERN.sub(rewrite, html) + f'<img src="{pixel}" width="1" height="1" alt="" />'
+
+@dataclass
+class _PendingInteraction:
+    campaign_id: str
+    opens: int = 0
+    clicks: int = 0
+    last_at: Optional[datetime] = None
+
+class TrackingService:
+    """Buffers open/click events in memory and flushes them in bulk.
+
+    Recording an event is a dict update with no I/O. A background task
+    coalesces the buffer per lead and per campaign and applies it with one
+    ``bulk_write`` per collection every ``tracking_flush_interval`` seconds,
+    or sooner once ``tracking_max_buffer`` leads are pending.
+    """
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else db
+        self.flush_interval = settings.tracking_flush_interval
+        self.max_buffer = settings.tracking_max_buffer
+        self.write_concern = self._parse_write_concern(settings.tracking_write_concern)
+        self._buffer: Dict[str, _PendingInteraction] = {}
+        self._flush_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.scoring_weights = ScoringWeights.from_settings()
+        self.stats_service = StatsService(self.db)
+        self.rollup_service = RollupService(self.db)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _parse_write_concern(value: str) -> WriteConcern:
+        value = (value or "1").strip()
+        return WriteConcern(w=int(value) if value.isdigit() else value)
+
+    def record_open(self, campaign_id: str, lead_id: str):
+        """Buffer an open event"""
+        self._record(campaign_id, lead_id, opens=1)
+
+    def record_click(self, campaign_id: str, lead_id: str):
+        """Buffer a click event"""
+        self._record(campaign_id, lead_id, clicks=1)
+
+    def _record(self, campaign_id: str, lead_id: str, opens: int = 0, clicks: int = 0):
+        pending = self._buffer.get(lead_id)
+        if pending is None:
+            pending = self._buffer[lead_id] = _PendingInteraction(campaign_id=campaign_id)
+        pending.opens += opens
+        pending.clicks += clicks
+        pending.last_at = datetime.utcnow()
+        if len(self._buffer) >= self.max_buffer:
+            self._flush_requested.set()
+
+    def start(self):
+        """Start the periodic flush task on the running loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush task and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error(f"Tracking flush error: {str(e)}")
+
+    def _build_operations(
+        self,
+        batch: Dict[str, _PendingInteraction],
+        scores: Dict[str, Dict[str, Any]]
+    ) -> Tuple[List[UpdateOne], List[UpdateOne]]:
+        lead_ops: List[UpdateOne] = []
+        campaign_totals: Dict[str, Dict[str, int]] = {}
+
+        for lead_id, pending in batch.items():
+            update: Dict[str, Any] = {
+                "$inc": {"open_count": pending.opens, "click_count": pending.clicks},
+                "$max": {"last_interaction_at": pending.last_at}
+            }
+            scored = scores.get(lead_id)
+            if scored is not None:
+                update["$set"] = {"score": scored["score"], "scored_at": pending.last_at}
+            lead_ops.append(UpdateOne({"id": lead_id}, update))
+            # Promotions only move forward: sent -> opened -> clicked, cold -> warm -> hot
+            if pending.clicks:
+                lead_ops.append(UpdateOne(
+                    {"id": lead_id, "interaction_type": {"$in": ["sent", "opened"]}},
+                    {"$set": {"interaction_type": "clicked"}}
+                ))
+            elif pending.opens:
+                lead_ops.append(UpdateOne(
+                    {"id": lead_id, "interaction_type": "sent"},
+                    {"$set": {"interaction_type": "opened"}}
+                ))
+            if scored is not None and scored["status"] != scored["previous_status"]:
+                lead_ops.append(UpdateOne(
+                    {"id": lead_id, "status": scored["previous_status"]},
+                    {"$set": {"status": scored["status"]}}
+                ))
+
+            totals = campaign_totals.setdefault(pending.campaign_id, {"opens": 0, "clicks": 0})
+            totals["opens"] += pending.opens
+            totals["clicks"] += pending.clicks
+
+        campaign_ops = [
+            UpdateOne(
+                {"id": campaign_id},
+                {"$inc": {"performance.open_count": totals["opens"], "performance.click_count": totals["clicks"]}}
+            )
+            for campaign_id, totals in campaign_totals.items()
+        ]
+        return lead_ops, campaign_ops
+
+    async def flush(self) -> Dict[str, Any]:
+        """Write buffered events to Mongo, returns how many leads were flushed"""
+        if not self._buffer:
+            return {"leads": 0, "campaigns": 0}
+
+        batch, self._buffer = self._buffer, {}
+        try:
+            scores, transitions, user_ids = await self._score_batch(batch)
+            lead_ops, campaign_ops = self._build_operations(batch, scores)
+            leads = self.db.leads.with_options(write_concern=self.write_concern)
+            await leads.bulk_write(lead_ops, ordered=False)
+        except Exception:
+            self._requeue(batch)
+            raise
+
+        # Lead writes already landed, so each follow-up write is attempted on its own and failures are logged, not retried
+        try:
+            campaigns = self.db.campaigns.with_options(write_concern=self.write_concern)
+            await campaigns.bulk_write(campaign_ops, ordered=False)
+        except Exception as e:
+            self.logger.error(f"Tracking campaign counter flush error: {str(e)}")
+
+        try:
+            await self.stats_service.increment_many(lead_transition_deltas(transitions))
+        except Exception as e:
+            self.logger.error(f"Tracking stats flush error: {str(e)}")
+        try:
+            await self.rollup_service.record_transitions(transitions)
+        except Exception as e:
+            self.logger.error(f"Tracking rollup flush error: {str(e)}")
+
+        # Always, and only after every write above, so no request caches a half-applied flush
+        for user_id in user_ids:
+            response_cache.bump(user_id, "campaigns", "leads")
+        response_cache.invalidate_campaigns({pending.campaign_id for pending in batch.values()})
+        return {"leads": len(batch), "campaigns": len(campaign_ops)}
+
+    async def _score_batch(
+        self,
+        batch: Dict[str, _PendingInteraction]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[LeadTransition], Set[str]]:
+        """Scores after this batch, read before the write, the status promotions they make and the users touched"""
+        scores: Dict[str, Dict[str, Any]] = {}
+        transitions: List[LeadTransition] = []
+        user_ids: Set[str] = set()
+        cursor = self.db.leads.find(
+            {"id": {"$in": list(batch)}},
+            {"id": 1, "user_id": 1, "status": 1, "interaction_type": 1, "open_count": 1, "click_count": 1, "reply_count": 1, "_id": 0}
+        )
+        async for lead in cursor:
+            user_ids.add(lead["user_id"])
+            if lead.get("interaction_type") == "bounced":
+                continue
+            pending = batch[lead["id"]]
+            # The events just happened, so the score is taken with no decay
+            scored = score_lead({
+                "open_count": (lead.get("open_count") or 0) + pending.opens,
+                "click_count": (lead.get("click_count") or 0) + pending.clicks,
+                "reply_count": lead.get("reply_count") or 0,
+                "last_interaction_at": pending.last_at
+            }, self.scoring_weights, now=pending.last_at)
+            status = promoted_status(lead.get("status"), scored["status"])
+            scores[lead["id"]] = {"score": scored["score"], "status": status, "previous_status": lead.get("status")}
+            if status != lead.get("status"):
+                transitions.append((lead["user_id"], pending.campaign_id, lead.get("status"), status))
+        return scores, transitions, user_ids
+
+    def _requeue(self, batch: Dict[str, _PendingInteraction]):
+        # Keep failed events for the next cycle unless that would overflow the buffer
+        if len(self._buffer) + len(batch) > self.max_buffer * 2:
+            self.logger.error(f"Tracking buffer full, dropping {len(batch)} pending leads")
+            return
+        for lead_id, pending in batch.items():
+            current = self._buffer.get(lead_id)
+            if current is None:
+                self._buffer[lead_id] = pending
+            else:
+                current.opens += pending.opens
+                current.clicks += pending.clicks
+                current.last_at = max(current.last_at, pending.last_at)
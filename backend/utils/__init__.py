@@ -1,5 +1,9 @@
 from .security import generate_session_token, validate_email, hash_password, verify_password
-from .helpers import format_datetime, clean_string, paginate_results, build_response
+from .helpers import (
+    format_datetime, clean_string, paginate_results, build_response,
+    build_preview, clamp_page_size, encode_cursor, decode_cursor, keyset_filter, keyset_page
+)
+from .serialization import FastJSONResponse, MsgPackResponse, negotiated_response
 from .constants import CAMPAIGN_TYPES, CAMPAIGN_STYLES, LEAD_STATUSES, EMAIL_TEMPLATES
 from .validators import (
     validate_email_format, validate_password, validate_name,
@@ -20,6 +24,17 @@ __all__ = [
     "clean_string",
     "paginate_results",
     "build_response",
+    "build_preview",
+    "clamp_page_size",
+    "encode_cursor",
+    "decode_cursor",
+    "keyset_filter",
+    "keyset_page",
+
+    # Serialization
+    "FastJSONResponse",
+    "MsgPackResponse",
+    "negotiated_response",
 
     # Validators
     "validate_email_format",
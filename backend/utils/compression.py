@@ -0,0 +1,134 @@
+# utils/compression.py
+import gzip
+from typing import Dict, Optional
+
+import brotli
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+# Preferred first when the client accepts several with the same quality
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported content coding for an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.lower().startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a body with the configured level for its coding"""
+    if encoding == "br":
+        quality = settings.compression_brotli_quality if level is None else level
+        return brotli.compress(body, quality=quality)
+    if encoding == "gzip":
+        # mtime=0 keeps the output stable, so identical bodies compress to identical bytes
+        return gzip.compress(body, compresslevel=settings.compression_gzip_level if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+async def compress_async(body: bytes, encoding: str) -> bytes:
+    """compress(), moved off the event loop for bodies above compression_threadpool_min_size"""
+    if len(body) >= settings.compression_threadpool_min_size:
+        return await run_in_threadpool(compress, body, encoding)
+    return compress(body, encoding)
+
+def add_vary(headers: MutableHeaders, value: str):
+    existing = [item.strip() for item in headers.get("vary", "").split(",") if item.strip()]
+    if value.lower() not in (item.lower() for item in existing):
+        headers["Vary"] = ", ".join([*existing, value])
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression for complete response bodies.
+
+    Bodies under ``compression_min_size``, non-text types, responses that
+    already carry a Content-Encoding (such as precompressed cache hits) and
+    streaming responses are passed through untouched. Large bodies are
+    compressed in the thread pool. Register it inside any
+    ``@app.middleware("http")`` middleware: those re-stream the body in
+    chunks, which this middleware treats as a streaming response.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_size if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await compress_async(body, encoding)
+            headers = MutableHeaders(raw=start["headers"])
+            add_vary(headers, "Accept-Encoding")
+            if len(compressed) < len(body):
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                body = compressed
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -54,6 +54,13 @@ INTERACTION_TYPES = {
     "FORWARDED": "forwarded"
 }
 
+# Suppression Reasons
+SUPPRESSION_REASONS = {
+    "BOUNCE": "bounce",
+    "UNSUBSCRIBE": "unsubscribe",
+    "COMPLAINT": "complaint"
+}
+
 # Business Types
 BUSINESS_TYPES = [
     "E-commerce",
@@ -224,7 +231,7 @@ HTTP_STATUS_MESSAGES = {
 # File Upload Limits
 FILE_UPLOAD_LIMITS = {
     "MAX_FILE_SIZE": 10 * 1024 * 1024,  # 10MB
-    "ALLOWED_EXTENSIONS": [".csv", ".xlsx", ".txt", ".json"],
+    "ALLOWED_EXTENSIONS": [".csv", ".xlsx", ".txt", ".json", ".ndjson"],
     "MAX_FILES_PER_UPLOAD": 5
 }
 
@@ -242,6 +249,7 @@ VALIDATION_RULES = {
     "EMAIL_MAX_LENGTH": 254,
     "CAMPAIGN_TITLE_MAX_LENGTH": 200,
     "CAMPAIGN_CONTENT_MAX_LENGTH": 10000,
+    "CAMPAIGN_PREVIEW_LENGTH": 200,
     "BUSINESS_NAME_MAX_LENGTH": 100
 }
 
@@ -285,7 +293,8 @@ ERROR_MESSAGES = {
     "EMAIL_SEND_FAILED": "Failed to send email",
     "ONBOARDING_REQUIRED": "Please complete onboarding first",
     "INVALID_FILE_FORMAT": "Invalid file format",
-    "FILE_TOO_LARGE": "File size exceeds limit"
+    "FILE_TOO_LARGE": "File size exceeds limit",
+    "NO_VALID_RECIPIENTS": "No valid email addresses found in file"
 }
 
 class CampaignTypeEnum(str, Enum):
@@ -304,4 +313,17 @@ class LeadStatusEnum(str, Enum):
     COLD = "cold"
     WARM = "warm"
     HOT = "hot"
-    CONVERTED = "converted"
\ No newline at end of file
+    CONVERTED = "converted"
+
+
+# Character limits checked by content analytics (per generated post/message/email part)
+CONTENT_CHARACTER_LIMITS = {
+    "twitter": 280,
+    "linkedin": 3000,
+    "instagram": 2200,
+    "facebook": 63206,
+    "tiktok": 2200,
+    "youtube": 5000,
+    "email_subject": 60,  # Longer subjects are truncated by most inbox list views
+    "direct_message": 1000
+}
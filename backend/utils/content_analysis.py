@@ -0,0 +1,104 @@
+# utils/content_analysis.py
+import re
+from typing import Any, Dict, List, Optional
+
+from .constants import CONTENT_CHARACTER_LIMITS, SOCIAL_PLATFORMS
+from .helpers import build_preview, calculate_reading_time, count_words, extract_hashtags, extract_mentions
+
+# Bump when the analysis changes so the backfill recomputes stored results
+CONTENT_ANALYTICS_VERSION = 2
+
+# Cap on distinct terms kept for the campaign text index
+MAX_SEARCH_TERMS = 1000
+
+# Asset headers the AI prompts ask for, e.g. "EMAIL 2:", "POST 3 (Twitter/X):", "**MESSAGE 1 (Follow-up):**"
+_ASSET_HEADER = re.compile(
+    r'^[ \t*#_]*(EMAIL|POST|MESSAGE)\s+(\d+)\s*(?:\(([^)\n]*)\))?\s*:?[ \t*_]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+_SUBJECT_LINE = re.compile(r'^[ \t*_]*Subject:[ \t*_]*(.+?)[ \t*_]*$', re.IGNORECASE | re.MULTILINE)
+
+def _platform(label: Optional[str]) -> Optional[str]:
+    if not label:
+        return None
+    lowered = label.lower()
+    if "twitter" in lowered or lowered.strip() == "x":
+        return SOCIAL_PLATFORMS["TWITTER"]
+    return next((platform for platform in SOCIAL_PLATFORMS.values() if platform in lowered), None)
+
+def _unique(values: List[str]) -> List[str]:
+    return list(dict.fromkeys(values))
+
+def split_assets(content: str) -> List[Dict[str, Any]]:
+    """Individual emails/posts/messages in generated content; the whole text if there are no headers"""
+    headers = list(_ASSET_HEADER.finditer(content))
+    if not headers:
+        return [{"kind": None, "number": 1, "label": None, "text": content.strip()}]
+    assets = []
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(content)
+        assets.append({
+            "kind": header.group(1).lower(),
+            "number": int(header.group(2)),
+            "label": (header.group(3) or "").strip() or None,
+            "text": content[header.end():end].strip()
+        })
+    return assets
+
+def _asset_stats(asset: Dict[str, Any], campaign_type: str) -> Dict[str, Any]:
+    text = asset["text"]
+    stats: Dict[str, Any] = {"number": asset["number"], "label": asset["label"]}
+    limit = None
+    if asset["kind"] == "email" or (asset["kind"] is None and campaign_type == "email"):
+        subject = _SUBJECT_LINE.search(text)
+        if subject:
+            stats["subject_characters"] = len(subject.group(1))
+            stats["subject_limit"] = CONTENT_CHARACTER_LIMITS["email_subject"]
+            stats["subject_over_limit"] = stats["subject_characters"] > stats["subject_limit"]
+            text = (text[:subject.start()] + text[subject.end():]).strip()
+    elif asset["kind"] == "message" or campaign_type == "direct_message":
+        limit = CONTENT_CHARACTER_LIMITS["direct_message"]
+    else:
+        stats["platform"] = _platform(asset["label"])
+        limit = CONTENT_CHARACTER_LIMITS.get(stats["platform"])
+
+    stats["characters"] = len(text)
+    stats["words"] = count_words(text)
+    if limit is not None:
+        stats["limit"] = limit
+        stats["over_limit"] = len(text) > limit
+    return stats
+
+def analyze_content(content: Optional[str], campaign_type: str) -> Dict[str, Any]:
+    """Stats stored on a campaign whenever its content is written"""
+    content = content or ""
+    assets = [_asset_stats(asset, campaign_type) for asset in split_assets(content)]
+    return {
+        "version": CONTENT_ANALYTICS_VERSION,
+        "word_count": count_words(content),
+        "character_count": len(content),
+        "reading_time": calculate_reading_time(content),
+        "hashtags": _unique(extract_hashtags(content)),
+        "mentions": _unique(extract_mentions(content)),
+        "asset_count": len(assets),
+        "over_limit_count": sum(1 for asset in assets if asset.get("over_limit") or asset.get("subject_over_limit")),
+        "assets": assets
+    }
+
+def search_terms(content: Optional[str]) -> str:
+    """Distinct words of the content, in first-seen order, for the campaign text index.
+
+    Content may be stored packed (binary), which text indexes cannot read,
+    and repeated words add nothing to matching, so this is far smaller
+    than indexing the content itself.
+    """
+    words = (word for word in re.findall(r'[^\W_]+', (content or "").lower()) if len(word) > 1)
+    return " ".join(_unique(list(words))[:MAX_SEARCH_TERMS])
+
+def content_fields(content: Optional[str], campaign_type: str) -> Dict[str, Any]:
+    """Derived fields to $set alongside new content"""
+    return {
+        "preview": build_preview(content),
+        "analytics": analyze_content(content, campaign_type),
+        "search_terms": search_terms(content)
+    }
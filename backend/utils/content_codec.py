@@ -0,0 +1,42 @@
+# utils/content_codec.py
+import zlib
+from typing import Optional, Union
+
+from bson.binary import Binary
+
+from config import settings
+
+# User-defined BSON binary subtype marking packed campaign content
+CONTENT_BINARY_SUBTYPE = 0x80
+
+# First byte of every packed value; new codecs get a new version instead of replacing this one
+CODEC_ZLIB = 1
+
+StoredContent = Union[str, Binary]
+
+def pack_content(text: Optional[str], threshold: Optional[int] = None) -> Optional[StoredContent]:
+    """Value to store for campaign content: zlib-packed Binary above the threshold, else the text"""
+    if text is None:
+        return None
+    threshold = settings.content_compression_threshold if threshold is None else threshold
+    raw = text.encode("utf-8")
+    if threshold <= 0 or len(raw) < threshold:
+        return text
+    packed = bytes([CODEC_ZLIB]) + zlib.compress(raw, settings.content_compression_level)
+    if len(packed) >= len(raw):
+        return text
+    return Binary(packed, CONTENT_BINARY_SUBTYPE)
+
+def unpack_content(value: Optional[Union[StoredContent, bytes]]) -> Optional[str]:
+    """Text of a stored content value, whether packed or not"""
+    if value is None or isinstance(value, str):
+        return value
+    data = bytes(value)
+    if not data:
+        return ""
+    if data[0] == CODEC_ZLIB:
+        return zlib.decompress(data[1:]).decode("utf-8")
+    raise ValueError(f"Unknown campaign content codec: {data[0]}")
+
+def is_packed(value) -> bool:
+    return isinstance(value, (bytes, Binary))
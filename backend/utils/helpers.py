@@ -1,10 +1,13 @@
 # utils/helpers.py
 import re
 import json
+import base64
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional, Union
 from email.utils import parseaddr
 
+from .constants import DEFAULT_PAGINATION, VALIDATION_RULES
+
 def format_datetime(dt: datetime, format_string: str = "%Y-%m-%d %H:%M:%S") -> str:
     """Format datetime object to string"""
     if dt is None:
@@ -81,6 +84,68 @@ def paginate_results(items: List[Any], page: int = 1, page_size: int = 20) -> Di
         }
     }
 
+def build_preview(content: Optional[str], length: int = VALIDATION_RULES["CAMPAIGN_PREVIEW_LENGTH"]) -> str:
+    """Plain-text snippet of campaign content for list views, cut at a word boundary"""
+    text = clean_string(re.sub(r'[#*_`>]+', ' ', content or ""))
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,.;:-") + "…"
+
+def clamp_page_size(limit: Optional[int] = None) -> int:
+    """Requested page size bounded by DEFAULT_PAGINATION"""
+    if not limit or limit < 1:
+        return DEFAULT_PAGINATION["PAGE_SIZE"]
+    return min(limit, DEFAULT_PAGINATION["MAX_PAGE_SIZE"])
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of the last item on a page"""
+    raw = json.dumps({"c": created_at.isoformat(), "i": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Inverse of encode_cursor, raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {"created_at": datetime.fromisoformat(data["c"]), "id": str(data["i"])}
+    except (ValueError, KeyError, TypeError, UnicodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+def keyset_filter(query: Dict[str, Any], cursor: Optional[str], descending: bool = True) -> Dict[str, Any]:
+    """Add the "after cursor" condition for a (created_at, id) ordering, newest first by default"""
+    if not cursor:
+        return query
+    position = decode_cursor(cursor)
+    after, bound, tighter = ("$lt", "$lte", min) if descending else ("$gt", "$gte", max)
+    # The plain range on created_at gives the index scan a start bound; the $or only settles ties
+    created_at = dict(query.get("created_at") or {})
+    created_at[bound] = tighter(created_at[bound], position["created_at"]) if bound in created_at else position["created_at"]
+    return {
+        **query,
+        "created_at": created_at,
+        "$or": [
+            {"created_at": {after: position["created_at"]}},
+            {"created_at": position["created_at"], "id": {after: position["id"]}}
+        ]
+    }
+
+def keyset_page(items: List[Dict[str, Any]], page_size: int) -> Dict[str, Any]:
+    """Split a page_size + 1 fetch into the page and its pagination block"""
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"]) if has_more else None
+    return {
+        "items": items,
+        "pagination": {
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
+    }
+
 def build_response(success: bool, data: Any = None, message: str = "", errors: List[str] = None) -> Dict[str, Any]:
     """Build standardized API response"""
     response = {
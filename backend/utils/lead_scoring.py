@@ -0,0 +1,88 @@
+# utils/lead_scoring.py
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config import settings
+from .constants import LEAD_STATUSES
+
+# Statuses the scorer assigns, lowest first; the index is the status code used by the batch path.
+# Any other status (converted, unqualified, ...) was set by hand and is never rescored.
+SCORED_STATUSES = (LEAD_STATUSES["COLD"], LEAD_STATUSES["WARM"], LEAD_STATUSES["HOT"])
+
+MAX_SCORE = 100.0
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """Points per signal, the recency half-life and the status thresholds"""
+    sent: float
+    open: float
+    click: float
+    reply: float
+    half_life_days: float
+    warm_threshold: float
+    hot_threshold: float
+
+    @classmethod
+    def from_settings(cls, **overrides: Optional[float]) -> "ScoringWeights":
+        values = {
+            "sent": settings.lead_score_sent_weight,
+            "open": settings.lead_score_open_weight,
+            "click": settings.lead_score_click_weight,
+            "reply": settings.lead_score_reply_weight,
+            "half_life_days": settings.lead_score_half_life_days,
+            "warm_threshold": settings.lead_score_warm_threshold,
+            "hot_threshold": settings.lead_score_hot_threshold
+        }
+        values.update({name: float(value) for name, value in overrides.items() if value is not None})
+        weights = cls(**values)
+        weights.validate()
+        return weights
+
+    def validate(self):
+        if any(getattr(self, field.name) < 0 for field in fields(self)):
+            raise ValueError("Scoring weights and thresholds must not be negative")
+        if self.half_life_days <= 0:
+            raise ValueError("Scoring half-life must be positive")
+        if self.warm_threshold > self.hot_threshold:
+            raise ValueError("Warm threshold must not exceed hot threshold")
+
+def compute_scores(opens, clicks, replies, age_days, weights: ScoringWeights):
+    """Score for scalars or arrays of per-lead counters.
+
+    Every lead is one send. Repeated opens/clicks/replies count
+    logarithmically (the first of each is worth its full weight), and the
+    total halves every ``half_life_days`` since the last interaction.
+    """
+    engagement = (
+        weights.sent
+        + weights.open * np.log2(1 + np.asarray(opens, dtype=np.float64))
+        + weights.click * np.log2(1 + np.asarray(clicks, dtype=np.float64))
+        + weights.reply * np.log2(1 + np.asarray(replies, dtype=np.float64))
+    )
+    decay = np.exp2(-np.maximum(age_days, 0) / weights.half_life_days)
+    return np.round(np.minimum(engagement * decay, MAX_SCORE), 2)
+
+def status_codes(scores, weights: ScoringWeights):
+    """Index into SCORED_STATUSES for each score"""
+    return (np.asarray(scores) >= weights.warm_threshold).astype(np.int8) + (np.asarray(scores) >= weights.hot_threshold)
+
+def score_lead(lead: Dict[str, Any], weights: ScoringWeights, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Score and scored status of one lead document from its counters"""
+    now = now or datetime.utcnow()
+    reference = lead.get("last_interaction_at") or lead.get("created_at") or now
+    score = compute_scores(
+        lead.get("open_count") or 0, lead.get("click_count") or 0, lead.get("reply_count") or 0,
+        (now - reference).total_seconds() / 86400, weights
+    )
+    return {"score": float(score), "status": SCORED_STATUSES[int(status_codes(score, weights))]}
+
+def promoted_status(current: Optional[str], scored: str) -> Optional[str]:
+    """Status after an interaction: scoring only ever raises it, and manual statuses are left alone"""
+    if current is not None and current not in SCORED_STATUSES:
+        return current
+    if current is None:
+        return scored
+    return max(current, scored, key=SCORED_STATUSES.index)
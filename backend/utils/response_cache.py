@@ -0,0 +1,218 @@
+# utils/response_cache.py
+import hashlib
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from config import settings
+from .compression import choose_encoding, compress_async
+from .serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode, wants_msgpack
+
+class ResponseCache:
+    """Per-user version counters, content ETags and an LRU of serialized GET bodies.
+
+    Every in-process write bumps the affected user's ``campaigns`` and/or
+    ``leads`` version. Cached bodies are keyed by those versions, so the
+    read after a write rebuilds, and a hit whose ETag matches
+    ``If-None-Match`` is answered with 304 without running any query.
+    Writers in other processes (bounce and reply workers, other API
+    workers) cannot bump these counters, so bodies expire after ``ttl``
+    seconds; that bounds how stale a cached response can be. ETags are a
+    digest of the body, so a rebuild that finds nothing changed still
+    answers a client's old ETag with 304, however rarely it polls.
+
+    Sent campaigns cannot be edited, so their detail responses are kept
+    outside the TTL and only dropped when a write touches the campaign.
+    JSON and msgpack bodies are separate entries with separate ETags, and
+    each entry keeps its brotli/gzip variants once a client has asked for
+    them, so a cache hit is never compressed twice. Bodies, versions and
+    sent-campaign keys are all LRU-bounded.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None, max_versions: Optional[int] = None):
+        self.ttl = settings.response_cache_ttl if ttl is None else ttl
+        self.max_entries = settings.response_cache_max_entries if max_entries is None else max_entries
+        self.max_versions = settings.response_cache_max_versions if max_versions is None else max_versions
+        self._sequence = itertools.count(1)
+        self._evicted_version = 0
+        self._versions: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._entries: "OrderedDict[str, Tuple[str, bytes, float, Dict[str, bytes]]]" = OrderedDict()
+        self._immutable: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+
+    # ===== Versions =====
+
+    def bump(self, user_id: str, *resources: str, campaign_ids: Iterable[str] = ()):
+        """Invalidate a user's cached responses for the given resources"""
+        for resource in resources:
+            key = (user_id, resource)
+            self._versions[key] = next(self._sequence)
+            self._versions.move_to_end(key)
+        while len(self._versions) > max(1, self.max_versions):
+            self._versions.popitem(last=False)
+            # Users without a version read this one: newer than any evicted version, so no body keyed by one is served again
+            self._evicted_version = next(self._sequence)
+        self.invalidate_campaigns(campaign_ids)
+
+    def _version(self, user_id: str, resource: str) -> int:
+        version = self._versions.get((user_id, resource))
+        if version is None:
+            return self._evicted_version
+        self._versions.move_to_end((user_id, resource))
+        return version
+
+    def key(self, user_id: str, resources: Iterable[str], variant: str = "") -> str:
+        """Cache key of a response: the user, the request variant and the resource versions it reads"""
+        versions = ".".join(str(self._version(user_id, resource)) for resource in resources)
+        return f"{user_id}|{variant}|{versions}"
+
+    @staticmethod
+    def content_etag(body: bytes) -> str:
+        return f'"{hashlib.sha1(body).hexdigest()[:24]}"'
+
+    # ===== Bodies =====
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """ETag and body cached under a key, unless expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        etag, body, expires_at, _ = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return etag, body
+
+    def put(self, key: str, body: bytes, expires_at: Optional[float] = None) -> str:
+        """Cache a body under a key and return its ETag"""
+        etag = self.content_etag(body)
+        if self.max_entries <= 0:
+            return etag
+        self._entries[key] = (etag, body, time.monotonic() + self.ttl if expires_at is None else expires_at, {})
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return etag
+
+    def get_variant(self, key: str, encoding: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        return entry[3].get(encoding) if entry is not None else None
+
+    def put_variant(self, key: str, encoding: str, body: bytes):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[3][encoding] = body
+
+    # ===== Sent campaigns =====
+
+    def immutable_key(self, user_id: str, campaign_id: str, media_type: str = JSON_MEDIA_TYPE) -> Optional[str]:
+        index = (user_id, campaign_id, media_type)
+        key = self._immutable.get(index)
+        if key is not None and key not in self._entries:
+            # Evicted from the LRU, so the next request rebuilds it
+            del self._immutable[index]
+            return None
+        return key
+
+    def put_immutable(self, user_id: str, campaign_id: str, body: bytes, media_type: str = JSON_MEDIA_TYPE) -> Tuple[str, str]:
+        """Cache a sent campaign's body until the campaign is touched; returns its key and ETag"""
+        index = (user_id, campaign_id, media_type)
+        key = f"sent|{user_id}|{campaign_id}|{media_type}"
+        etag = self.put(key, body, expires_at=float("inf"))
+        if self.max_entries > 0:
+            self._immutable[index] = key
+            self._immutable.move_to_end(index)
+            while len(self._immutable) > self.max_entries:
+                self._immutable.popitem(last=False)
+        return key, etag
+
+    def invalidate_campaigns(self, campaign_ids: Iterable[str]):
+        campaign_ids = set(campaign_ids)
+        if not campaign_ids:
+            return
+        for index in [index for index in self._immutable if index[1] in campaign_ids]:
+            self._entries.pop(self._immutable.pop(index), None)
+
+response_cache = ResponseCache()
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+def _media_type(request: Request) -> str:
+    return MSGPACK_MEDIA_TYPE if wants_msgpack(request) else JSON_MEDIA_TYPE
+
+async def _respond(request: Request, etag: str, body: Optional[bytes], media_type: str = JSON_MEDIA_TYPE, key: Optional[str] = None) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept, Accept-Encoding"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+
+    # Compress here rather than in CompressionMiddleware so the variant is cached with the body
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding and len(body) >= settings.compression_min_size:
+        compressed = response_cache.get_variant(key, encoding) if key else None
+        if compressed is None:
+            compressed = await compress_async(body, encoding)
+            if key:
+                response_cache.put_variant(key, encoding, compressed)
+        if len(compressed) < len(body):
+            headers["Content-Encoding"] = encoding
+            body = compressed
+    return Response(content=body, media_type=media_type, headers=headers)
+
+def serialize(payload: Any, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    # Pydantic models and Mongo values are encoded directly, without a jsonable_encoder pass
+    return encode(payload, msgpack_format=media_type == MSGPACK_MEDIA_TYPE)
+
+async def cached_json_response(
+    request: Request,
+    user_id: str,
+    resources: Iterable[str],
+    build: Callable[[], Awaitable[Any]],
+    variant: str = ""
+) -> Response:
+    """Serve a per-user GET payload with ETag revalidation and the LRU"""
+    media_type = _media_type(request)
+    variant = variant or request.url.path + "?" + request.url.query
+    key = response_cache.key(user_id, tuple(resources), f"{variant}|{media_type}")
+    cached = response_cache.get(key)
+    if cached is None:
+        body = serialize(await build(), media_type)
+        etag = response_cache.put(key, body)
+    else:
+        etag, body = cached
+    if _matches(request, etag):
+        return await _respond(request, etag, None)
+    return await _respond(request, etag, body, media_type, key)
+
+async def cached_campaign_response(
+    request: Request,
+    user_id: str,
+    campaign_id: str,
+    build: Callable[[], Awaitable[Tuple[Any, bool]]]
+) -> Response:
+    """Like cached_json_response, but sent campaigns stay cached until touched"""
+    media_type = _media_type(request)
+    key = response_cache.immutable_key(user_id, campaign_id, media_type)
+    cached = response_cache.get(key) if key is not None else None
+    if cached is None:
+        key = response_cache.key(user_id, ("campaigns",), f"campaign:{campaign_id}|{media_type}")
+        cached = response_cache.get(key)
+
+    if cached is None:
+        payload, immutable = await build()
+        body = serialize(payload, media_type)
+        if immutable:
+            key, etag = response_cache.put_immutable(user_id, campaign_id, body, media_type)
+        else:
+            etag = response_cache.put(key, body)
+    else:
+        etag, body = cached
+    if _matches(request, etag):
+        return await _respond(request, etag, None)
+    return await _respond(request, etag, body, media_type, key)
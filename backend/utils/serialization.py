@@ -0,0 +1,89 @@
+# utils/serialization.py
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Optional
+
+import msgpack
+import orjson
+from bson import ObjectId
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _default(obj: Any) -> Any:
+    """Types neither encoder handles natively, converted the way jsonable_encoder would"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        # Only reached from msgpack; orjson writes these itself in the same ISO format
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8")
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+def dumps_json(payload: Any) -> bytes:
+    """Encode a payload (dicts, lists, Pydantic models, Mongo values) to JSON in one pass"""
+    return orjson.dumps(payload, default=_default, option=_ORJSON_OPTIONS)
+
+def dumps_msgpack(payload: Any) -> bytes:
+    """Encode a payload to msgpack with the same value conversions as dumps_json"""
+    return msgpack.packb(payload, default=_default, use_bin_type=True, datetime=False)
+
+def wants_msgpack(request: Request) -> bool:
+    """True when the client asked for msgpack in its Accept header"""
+    for part in request.headers.get("accept", "").split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        if media_type.lower() not in MSGPACK_MEDIA_TYPES:
+            continue
+        quality = next((param[2:] for param in params if param.lower().startswith("q=")), "1")
+        try:
+            return float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+def encode(payload: Any, msgpack_format: bool = False) -> bytes:
+    return dumps_msgpack(payload) if msgpack_format else dumps_json(payload)
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; used as the app's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return dumps_msgpack(content)
+
+def negotiated_response(
+    request: Request,
+    payload: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Encode a route payload once, as msgpack or JSON depending on the Accept header.
+
+    Returning this from a route bypasses FastAPI's jsonable_encoder pass, so
+    payloads should already hold validated models or plain Mongo values.
+    """
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if wants_msgpack(request):
+        return MsgPackResponse(payload, status_code=status_code, headers=headers)
+    return FastJSONResponse(payload, status_code=status_code, headers=headers)
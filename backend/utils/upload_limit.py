@@ -0,0 +1,71 @@
+# utils/upload_limit.py
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .constants import FILE_UPLOAD_LIMITS, ERROR_MESSAGES
+
+class UploadTooLarge(Exception):
+    pass
+
+class UploadLimitMiddleware:
+    """Rejects multipart bodies over ``max_size`` with a 413 before they are spooled.
+
+    A declared Content-Length over the limit is refused without reading the
+    body. Otherwise the received bytes are counted, and the request is cut
+    off as soon as they pass the limit, which also covers chunked uploads.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: Optional[int] = None):
+        self.app = app
+        self.max_size = FILE_UPLOAD_LIMITS["MAX_FILE_SIZE"] if max_size is None else max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").lower().startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_size:
+            await self.reject(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            # Whatever the app made of the aborted body, the client gets the 413
+            if exceeded:
+                return
+            response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not response_started:
+            await self.reject(scope, receive, send)
+
+    async def reject(self, scope: Scope, receive: Receive, send: Send):
+        response = JSONResponse({"detail": ERROR_MESSAGES["FILE_TOO_LARGE"]}, status_code=413)
+        await response(scope, receive, send)
@@ -7,6 +7,9 @@ from .constants import (
     VALIDATION_RULES
 )
 
+# Compiled once at import; validate_email_format runs per recipient on large lists
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 class ValidationError(Exception):
     """Custom validation error"""
     pass
@@ -16,8 +19,7 @@ def validate_email_format(email: str) -> bool:
     if not email:
         return False
     
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(email_pattern, email)) and len(email) <= VALIDATION_RULES["EMAIL_MAX_LENGTH"]
+    return len(email) <= VALIDATION_RULES["EMAIL_MAX_LENGTH"] and EMAIL_PATTERN.match(email) is not None
 
 def validate_password(password: str) -> Dict[str, Any]:
     """Validate password strength"""
@@ -7,20 +7,32 @@ const API = process.env.REACT_APP_BACKEND_URL || 'https://marketing-app-1.onrend
 
 const CampaignComponent = () => {
   const [campaigns, setCampaigns] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showModal, setShowModal] = useState(false);
 
-  const fetchCampaigns = async () => {
+  // The list is paginated: a cursor fetches the page after it, none starts over
+  const fetchCampaigns = async (cursor = null) => {
     try {
       const token = localStorage.getItem('token');
       const res = await axios.get(`${API}/api/campaigns`, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}` },
+        params: cursor ? { cursor } : {}
       });
-      setCampaigns(res.data || []);
+      const page = Array.isArray(res.data?.data) ? res.data.data : [];
+      setCampaigns((previous) => (cursor ? [...previous, ...page] : page));
+      setNextCursor(res.data?.pagination?.next_cursor || null);
     } catch (error) {
       console.error('Failed to fetch campaigns:', error);
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    await fetchCampaigns(nextCursor);
+    setLoadingMore(false);
+  };
+
   const handleModalClose = () => setShowModal(false);
 
   const handleModalSuccess = () => {
@@ -49,18 +61,30 @@ const CampaignComponent = () => {
       ) : (
         <div className="grid gap-4 sm:grid-cols-2 lg:grid-cols-3">
           {campaigns.map((campaign, index) => (
-            <div key={index} className="border rounded-lg p-4 bg-white shadow-sm">
+            <div key={campaign.id || index} className="border rounded-lg p-4 bg-white shadow-sm">
               <h3 className="text-lg font-semibold text-indigo-800 mb-2">
                 {campaign.title || 'Untitled Campaign'}
               </h3>
               <p className="text-sm text-gray-700 whitespace-pre-wrap overflow-hidden line-clamp-4">
-                {campaign.content}
+                {campaign.preview || campaign.content}
               </p>
             </div>
           ))}
         </div>
       )}
 
+      {nextCursor && (
+        <div className="mt-6 text-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-4 py-2 rounded-lg border border-indigo-600 text-indigo-600 hover:bg-indigo-50 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {showModal && (
         <CampaignModal onClose={handleModalClose} onSuccess={handleModalSuccess} />
       )}
@@ -4,6 +4,7 @@ import { useAuth } from './AuthComponent';
 import { CampaignModal } from './CampaignModal';
 
 const API = process.env.REACT_APP_BACKEND_URL || 'https://marketing-app-1.onrender.com';
+const RECENT_CAMPAIGNS = 5;
 
 export const DashboardComponent = () => {
   const { user, logout } = useAuth();
@@ -34,8 +35,10 @@ export const DashboardComponent = () => {
     setLoading(true);
     try {
       const token = localStorage.getItem('token');
+      // Only the most recent campaigns are shown here, so one page of them is enough
       const resp = await axios.get(`${API}/api/campaigns`, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}` },
+        params: { limit: RECENT_CAMPAIGNS }
       });
 
       const data = resp.data;
@@ -102,7 +105,7 @@ export const DashboardComponent = () => {
             {campaigns.length === 0 ? (
               <p className="text-center text-gray-600">No campaigns yet. Create your first campaign!</p>
             ) : (
-              campaigns.slice(0, 5).map((c) => (
+              campaigns.slice(0, RECENT_CAMPAIGNS).map((c) => (
                 <div key={c.id || c._id} className="p-4 border rounded-lg shadow-sm bg-gray-50">
                   <div className="mb-2">
                     <h3 className="text-lg font-bold text-gray-900">{c.title || 'Untitled Campaign'}</h3>
@@ -110,7 +113,7 @@ export const DashboardComponent = () => {
                   </div>
                   <div className="mb-2">
                     <p className="text-gray-700 whitespace-pre-wrap">
-                      {c.content || c.description || 'No generated content available.'}
+                      {c.preview || c.content || c.description || 'No generated content available.'}
                     </p>
                   </div>
                   <span className="inline-block mt-2 px-3 py-1 text-xs rounded-full bg-indigo-100 text-indigo-800">
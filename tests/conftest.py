@@ -0,0 +1,69 @@
+# tests/conftest.py - Shared fixtures for the backend tests
+"""
+Backend modules are imported from ../backend, the same way the app runs.
+Tests that need MongoDB get the ``mongo`` fixture: a scratch database on
+TEST_MONGO_URL (default mongodb://localhost:27017), dropped afterwards.
+They are skipped when no server answers there.
+
+Usage (from the repository root):
+    python -m pytest -q tests
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017")
+
+# config.settings and utils.hf_api require these at import; no test talks to Google, Hugging Face or the app's database
+for name, value in {
+    "MONGO_URL": TEST_MONGO_URL,
+    "DB_NAME": "marketing_test",
+    "GOOGLE_CLIENT_ID": "test-client",
+    "GOOGLE_CLIENT_SECRET": "test-secret",
+    "GOOGLE_REDIRECT_URI": "http://localhost/auth/callback",
+    "FRONTEND_URL": "http://localhost:3000",
+    "TRACKING_SECRET": "test-tracking-secret",
+    "HF_TOKEN": "test-hf-token"
+}.items():
+    os.environ.setdefault(name, value)
+
+
+class MongoHarness:
+    """A scratch database plus the event loop its client is bound to"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, database):
+        self.loop = loop
+        self.db = database
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+
+@pytest.fixture
+def mongo():
+    motor_asyncio = pytest.importorskip("motor.motor_asyncio")
+    loop = asyncio.new_event_loop()
+    client = motor_asyncio.AsyncIOMotorClient(TEST_MONGO_URL, serverSelectionTimeoutMS=1500, io_loop=loop)
+    try:
+        loop.run_until_complete(client.admin.command("ping"))
+    except Exception as e:
+        client.close()
+        loop.close()
+        pytest.skip(f"MongoDB not reachable at {TEST_MONGO_URL}: {e}")
+
+    db_name = f"marketing_test_{uuid.uuid4().hex[:8]}"
+    harness = MongoHarness(loop, client[db_name])
+    try:
+        yield harness
+    finally:
+        loop.run_until_complete(client.drop_database(db_name))
+        client.close()
+        loop.close()
@@ -0,0 +1,77 @@
+# tests/test_audience_service.py - Streaming audience list imports
+import io
+
+import pytest
+
+from services.audience_service import AudienceService
+
+
+@pytest.fixture
+def service(mongo):
+    return AudienceService(database=mongo.db)
+
+
+def import_file(mongo, service, filename: str, content: str):
+    return mongo.run(service.import_list("user-1", "Imported", filename, io.BytesIO(content.encode("utf-8"))))
+
+
+def members(mongo, service, audience):
+    return mongo.run(service.get_members(audience["id"], "user-1"))
+
+
+def test_csv_quoted_fields_may_span_lines(mongo, service):
+    content = (
+        "name,email,notes\r\n"
+        "Ann,ann@example.test,\"Met at the fair,\r\nask about bob@example.test\"\r\n"
+        "Carl,CARL@example.test,\"\"\r\n"
+    )
+
+    audience = import_file(mongo, service, "contacts.csv", content)
+
+    assert audience["status"] == "ready"
+    assert audience["member_count"] == 2 and audience["invalid_count"] == 0
+    assert members(mongo, service, audience) == ["ann@example.test", "carl@example.test"]
+
+
+def test_csv_without_header_uses_first_address_cell(mongo, service):
+    content = "\nAnn,ann@example.test\nno address here\nann@example.test\n"
+
+    audience = import_file(mongo, service, "contacts.txt", content)
+
+    assert audience["member_count"] == 1
+    assert audience["invalid_count"] == 1 and audience["duplicate_count"] == 1
+    assert members(mongo, service, audience) == ["ann@example.test"]
+
+
+@pytest.mark.parametrize("read_size", [7, 64 * 1024])
+def test_json_array_is_decoded_element_by_element(mongo, service, monkeypatch, read_size):
+    # A tiny read size makes elements straddle chunk boundaries
+    monkeypatch.setattr("services.audience_service.AudienceParser.READ_SIZE", read_size)
+    content = ' [ "ann@example.test", {"Email": "bob@example.test", "name": "Bob"},\n 42, {"name": "no address"}, "ann@example.test" ]'
+
+    audience = import_file(mongo, service, "contacts.json", content)
+
+    assert audience["member_count"] == 2
+    assert audience["invalid_count"] == 2 and audience["duplicate_count"] == 1
+    assert members(mongo, service, audience) == ["ann@example.test", "bob@example.test"]
+
+
+def test_json_file_of_lines_is_read_as_ndjson(mongo, service):
+    content = '{"email": "ann@example.test"}\n"bob@example.test"\nnot json\n'
+
+    audience = import_file(mongo, service, "contacts.json", content)
+
+    assert audience["member_count"] == 2 and audience["invalid_count"] == 1
+
+
+@pytest.mark.parametrize("filename, content", [
+    ("contacts.json", '{"people": [{"email": "ann@example.test"}]}'),
+    ("contacts.csv", "name,email\nAnn,not-an-address\n"),
+    ("contacts.ndjson", "")
+])
+def test_import_without_members_is_rejected(mongo, service, filename, content):
+    with pytest.raises(ValueError):
+        import_file(mongo, service, filename, content)
+
+    assert mongo.run(mongo.db.audience_lists.count_documents({})) == 0
+    assert mongo.run(mongo.db.audience_list_chunks.count_documents({})) == 0
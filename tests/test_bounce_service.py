@@ -0,0 +1,109 @@
+# tests/test_bounce_service.py - DSN bounces applied to leads and suppressions
+import mailbox
+import uuid
+from datetime import datetime
+
+from services.bounce_service import BounceProcessor
+from services.mailbox_source import MboxSource
+
+
+def dsn(recipient: str, status: str, message_id: str, sender: str = "outreach@sender.test") -> str:
+    """A minimal RFC 3464 report quoting the headers of the bounced message"""
+    action = "failed" if status.startswith("5") else "delayed"
+    return (
+        f"From: MAILER-DAEMON@mx.test\n"
+        f"To: {sender}\n"
+        f"Subject: Delivery Status Notification\n"
+        f"Content-Type: multipart/report; report-type=delivery-status; boundary=\"REPORT\"\n"
+        f"\n"
+        f"--REPORT\n"
+        f"Content-Type: text/plain\n"
+        f"\n"
+        f"Delivery to {recipient} failed.\n"
+        f"--REPORT\n"
+        f"Content-Type: message/delivery-status\n"
+        f"\n"
+        f"Reporting-MTA: dns; mx.test\n"
+        f"\n"
+        f"Final-Recipient: rfc822; {recipient}\n"
+        f"Action: {action}\n"
+        f"Status: {status}\n"
+        f"\n"
+        f"--REPORT\n"
+        f"Content-Type: text/rfc822-headers\n"
+        f"\n"
+        f"From: {sender}\n"
+        f"To: {recipient}\n"
+        f"Message-ID: {message_id}\n"
+        f"\n"
+        f"--REPORT--\n"
+    )
+
+
+def lead(user_id: str, campaign_id: str, email: str) -> dict:
+    lead_id = str(uuid.uuid4())
+    return {
+        "id": lead_id,
+        "user_id": user_id,
+        "campaign_id": campaign_id,
+        "email": email,
+        "interaction_type": "sent",
+        "status": "cold",
+        "message_id": f"<{lead_id}@sender.test>",
+        "sender": "outreach@sender.test",
+        "created_at": datetime.utcnow()
+    }
+
+
+def process(mongo, tmp_path, messages, soft_threshold=3):
+    path = str(tmp_path / f"bounces-{uuid.uuid4().hex[:6]}.mbox")
+    box = mailbox.mbox(path)
+    for message in messages:
+        box.add(message)
+    box.close()
+    processor = BounceProcessor(database=mongo.db, soft_threshold=soft_threshold)
+    return mongo.run(processor.process_source(MboxSource(path)))
+
+
+def suppressed(mongo):
+    return {(doc["user_id"], doc["email"]) for doc in mongo.run(mongo.db.suppressions.find({}).to_list(None))}
+
+
+def test_soft_bounces_add_up_across_campaigns(mongo, tmp_path):
+    leads = [lead("user-1", f"campaign-{n}", "Reader@Example.test") for n in range(3)]
+    mongo.run(mongo.db.leads.insert_many([dict(doc) for doc in leads]))
+
+    # One soft bounce per campaign: below the threshold until the third
+    process(mongo, tmp_path, [dsn("reader@example.test", "4.2.2", leads[0]["message_id"])])
+    process(mongo, tmp_path, [dsn("reader@example.test", "4.2.2", leads[1]["message_id"])])
+    assert suppressed(mongo) == set()
+
+    stats = process(mongo, tmp_path, [dsn("reader@example.test", "4.2.2", leads[2]["message_id"])])
+
+    assert stats["soft"] == 1
+    assert suppressed(mongo) == {("user-1", "reader@example.test")}
+
+
+def test_soft_bounces_are_not_summed_across_users(mongo, tmp_path):
+    mine = [lead("user-1", f"campaign-{n}", "reader@example.test") for n in range(2)]
+    theirs = [lead("user-2", f"other-{n}", "reader@example.test") for n in range(2)]
+    mongo.run(mongo.db.leads.insert_many([dict(doc) for doc in mine + theirs]))
+
+    process(mongo, tmp_path, [dsn("reader@example.test", "4.2.2", doc["message_id"]) for doc in mine + theirs])
+
+    assert suppressed(mongo) == set()
+    counts = {doc["id"]: doc.get("soft_bounce_count") for doc in mongo.run(mongo.db.leads.find({}).to_list(None))}
+    assert set(counts.values()) == {1}
+
+
+def test_hard_bounce_only_touches_the_quoted_lead(mongo, tmp_path):
+    mine = lead("user-1", "campaign-1", "reader@example.test")
+    theirs = lead("user-2", "campaign-2", "reader@example.test")
+    mongo.run(mongo.db.leads.insert_many([dict(mine), dict(theirs)]))
+
+    stats = process(mongo, tmp_path, [dsn("reader@example.test", "5.1.1", mine["message_id"])])
+
+    assert stats["hard"] == 1 and stats["unmatched"] == 0
+    assert suppressed(mongo) == {("user-1", "reader@example.test")}
+    stored = {doc["user_id"]: doc["interaction_type"] for doc in mongo.run(mongo.db.leads.find({}).to_list(None))}
+    assert stored == {"user-1": "bounced", "user-2": "sent"}
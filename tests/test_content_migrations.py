@@ -0,0 +1,72 @@
+# tests/test_content_migrations.py - Content packing and analytics backfill over stored campaigns
+import uuid
+from datetime import datetime
+
+import pytest
+
+import services.campaign_service as campaign_module
+from services.campaign_service import CampaignService
+from utils.content_analysis import CONTENT_ANALYTICS_VERSION
+
+
+@pytest.fixture
+def service(mongo, monkeypatch):
+    # CampaignService works on the module's configured database
+    monkeypatch.setattr(campaign_module, "db", mongo.db)
+    return CampaignService()
+
+
+def archived_stub(**fields):
+    """A campaign as ArchiveService leaves it: summary fields only, no content or search terms"""
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": "user-1",
+        "title": "Spring sale",
+        "campaign_type": "email",
+        "status": "sent",
+        "created_at": datetime(2024, 3, 1),
+        "preview": "Our spring sale starts Monday",
+        "analytics": {"version": CONTENT_ANALYTICS_VERSION - 1, "word_count": 120, "character_count": 700},
+        "archived": True,
+        "archived_at": datetime(2025, 3, 1),
+        **fields
+    }
+
+
+def test_backfill_skips_archived_stubs(mongo, service):
+    stub = archived_stub()
+    mongo.run(mongo.db.campaigns.insert_one(dict(stub)))
+
+    stats = mongo.run(service.backfill_content_analytics())
+    stored = mongo.run(mongo.db.campaigns.find_one({"id": stub["id"]}))
+
+    assert stats == {"scanned": 0, "updated": 0}
+    assert stored["preview"] == stub["preview"]
+    assert stored["analytics"] == stub["analytics"]
+    assert "content" not in stored and "search_terms" not in stored
+
+
+def test_forced_backfill_skips_archived_stubs_but_updates_live_campaigns(mongo, service):
+    stub = archived_stub()
+    live = {**archived_stub(), "id": str(uuid.uuid4()), "archived": False, "content": "Fresh copy for the live campaign"}
+    mongo.run(mongo.db.campaigns.insert_many([dict(stub), dict(live)]))
+
+    stats = mongo.run(service.backfill_content_analytics(force=True))
+    stored_stub = mongo.run(mongo.db.campaigns.find_one({"id": stub["id"]}))
+    stored_live = mongo.run(mongo.db.campaigns.find_one({"id": live["id"]}))
+
+    assert stats == {"scanned": 1, "updated": 1}
+    assert stored_stub["analytics"] == stub["analytics"]
+    assert stored_live["analytics"]["version"] == CONTENT_ANALYTICS_VERSION
+    assert stored_live["preview"].startswith("Fresh copy")
+
+
+def test_pack_stored_content_skips_archived_stubs(mongo, service):
+    # A stub restored by hand could carry content again; the migration still leaves archived rows alone
+    stub = archived_stub(content="x" * 50000)
+    mongo.run(mongo.db.campaigns.insert_one(dict(stub)))
+
+    stats = mongo.run(service.pack_stored_content())
+
+    assert stats["scanned"] == 0
+    assert mongo.run(mongo.db.campaigns.find_one({"id": stub["id"]}))["content"] == stub["content"]
@@ -0,0 +1,40 @@
+# tests/test_database_indexes.py - Startup index creation with legacy duplicate leads
+import uuid
+from datetime import datetime, timedelta
+
+import config.database as database_module
+from config.database import LEAD_IDENTITY_INDEX
+
+
+def lead(email: str, minutes: int, **fields) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": "user-1",
+        "campaign_id": "campaign-1",
+        "email": email,
+        "interaction_type": "sent",
+        "status": "cold",
+        "created_at": datetime(2025, 6, 1) + timedelta(minutes=minutes),
+        **fields
+    }
+
+
+def test_duplicate_leads_are_merged_and_the_identity_index_created(mongo, monkeypatch):
+    monkeypatch.setattr(database_module, "db", mongo.db)
+    oldest = lead("reader@example.test", 0, open_count=1)
+    mongo.run(mongo.db.leads.insert_many([
+        dict(oldest),
+        lead("reader@example.test", 5, open_count=2, interaction_type="opened"),
+        lead("other@example.test", 1)
+    ]))
+
+    mongo.run(database_module.create_indexes())
+
+    leads = mongo.run(mongo.db.leads.find({}).to_list(None))
+    survivor = next(doc for doc in leads if doc["email"] == "reader@example.test")
+    assert len(leads) == 2
+    assert survivor["id"] == oldest["id"]
+    assert survivor["open_count"] == 3 and survivor["interaction_type"] == "opened"
+    assert LEAD_IDENTITY_INDEX in mongo.run(mongo.db.leads.index_information())
+    # Indexes created after the lead ones are not skipped
+    assert "user_id_1" in mongo.run(mongo.db.user_stats.index_information())
@@ -0,0 +1,133 @@
+# tests/test_lead_list_plans.py - Index plans the optimizer picks for filtered lead lists
+"""
+Every lead list query LeadService can build is explained WITHOUT its index
+hint, so the test fails when the indexes in LEAD_LIST_INDEXES stop being the
+ones MongoDB would choose on its own: a COLLSCAN, an in-memory SORT, another
+index than the planned one, or documents fetched and then filtered out (one
+boundary document is allowed on cursor pages, where ties on created_at are
+settled after the fetch). Needs a real server; mongomock has no planner.
+"""
+
+import itertools
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytest
+
+import config.database as database_module
+from services.lead_service import LeadService
+
+LEADS = 3000
+CAMPAIGNS = 10
+PAGE_SIZE = 50
+STATUSES = ["cold", "warm", "hot"]
+INTERACTIONS = ["sent", "opened", "clicked", "replied"]
+FILTER_VALUES = {"status": "warm", "interaction_type": "opened"}
+
+
+async def seed(database, user_id: str, campaigns: List[str]) -> datetime:
+    """Leads one second apart, newest first; returns the newest creation time"""
+    now = datetime.utcnow().replace(microsecond=0)
+    rng = random.Random(7)
+    await database.leads.insert_many([
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "campaign_id": rng.choice(campaigns),
+            "email": f"lead{i}@example.test",
+            "status": rng.choice(STATUSES),
+            "interaction_type": rng.choice(INTERACTIONS),
+            "created_at": now - timedelta(seconds=i)
+        }
+        for i in range(LEADS)
+    ])
+    # Another user's leads, so a scan that ignores user_id would show up in docsExamined
+    await database.leads.insert_many([
+        {"id": str(uuid.uuid4()), "user_id": "other", "campaign_id": campaigns[0], "email": f"other{i}@example.test",
+         "status": "warm", "interaction_type": "opened", "created_at": now - timedelta(seconds=i)}
+        for i in range(LEADS // 2)
+    ])
+    return now
+
+
+def stages(node: Any, found: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if isinstance(node, dict):
+        if "stage" in node:
+            found.append(node)
+        for value in node.values():
+            stages(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            stages(value, found)
+    return found
+
+
+def plan_problems(result: Dict[str, Any], plan: Dict[str, Any], has_cursor: bool) -> List[str]:
+    problems = []
+    winning = stages(result["queryPlanner"]["winningPlan"], [])
+    names = [stage["stage"] for stage in winning]
+    if "COLLSCAN" in names:
+        problems.append("COLLSCAN")
+    if "SORT" in names:
+        problems.append("in-memory SORT")
+    planned = dict(plan["hint"])
+    scans = [stage for stage in winning if stage["stage"] == "IXSCAN"]
+    if not scans or any(dict(stage["keyPattern"]) != planned for stage in scans):
+        problems.append(f"index scans {[stage.get('indexName') for stage in scans]} instead of {list(planned)}")
+    stats = result["executionStats"]
+    allowed = stats["nReturned"] + (1 if has_cursor else 0)
+    if stats["totalDocsExamined"] > allowed:
+        problems.append(f"fetched {stats['totalDocsExamined']} documents for {stats['nReturned']} results")
+    return problems
+
+
+@pytest.mark.parametrize("fields", [
+    fields
+    for size in range(len(LeadService.LIST_FILTERS) + 1)
+    for fields in itertools.combinations(LeadService.LIST_FILTERS, size)
+], ids=lambda fields: "+".join(fields) or "no-filter")
+def test_optimizer_picks_the_planned_index(mongo, monkeypatch, fields):
+    # create_indexes works on the configured database
+    monkeypatch.setattr(database_module, "db", mongo.db)
+    mongo.run(database_module.create_indexes())
+
+    user_id = f"user-{uuid.uuid4()}"
+    campaigns = [str(uuid.uuid4()) for _ in range(CAMPAIGNS)]
+    newest = mongo.run(seed(mongo.db, user_id, campaigns))
+    service = LeadService(mongo.db)
+    values = {**FILTER_VALUES, "campaign_id": campaigns[0]}
+    filters = {field: values[field] for field in fields}
+    ranges = {
+        "no range": {},
+        "after": {"created_after": newest - timedelta(seconds=LEADS // 2)},
+        "before": {"created_before": newest - timedelta(seconds=LEADS // 4)},
+        "between": {
+            "created_after": newest - timedelta(seconds=LEADS // 2),
+            "created_before": newest - timedelta(seconds=LEADS // 4)
+        }
+    }
+
+    failures = []
+    for (range_name, created), sort in itertools.product(ranges.items(), LeadService.LIST_SORTS):
+        criteria = {"filters": filters, "sort": sort, **created}
+        first = mongo.run(service.list_leads(user_id, limit=PAGE_SIZE, **criteria))
+        next_cursor = first["pagination"]["next_cursor"]
+        for cursor in [None] + ([next_cursor] if next_cursor else []):
+            plan = service.list_query(user_id, cursor=cursor, **criteria)
+            result = mongo.run(mongo.db.command(
+                "explain",
+                {
+                    "find": "leads",
+                    "filter": plan["filter"],
+                    "projection": {"_id": 0},
+                    "sort": dict(plan["sort"]),
+                    "limit": PAGE_SIZE + 1
+                },
+                verbosity="executionStats"
+            ))
+            label = f"{range_name}, {sort}, {'cursor page' if cursor else 'first page'}"
+            failures.extend(f"{label}: {problem}" for problem in plan_problems(result, plan, bool(cursor)))
+
+    assert not failures, "\n".join(failures)
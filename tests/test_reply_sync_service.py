@@ -0,0 +1,110 @@
+# tests/test_reply_sync_service.py - Replies matched to leads from inbox headers
+import uuid
+from datetime import datetime
+from email.utils import format_datetime
+from typing import List, Tuple
+
+import pytest
+
+from services.reply_sync_service import ReplySyncService
+
+SENT_ID = "<campaign-mail-1@sender.test>"
+
+
+class FakeSource:
+    """The parts of IMAPSource that sync uses, over a fixed list of messages"""
+
+    user = "inbox"
+    host = "imap.test"
+    folder = "INBOX"
+    uid_validity = 7
+
+    def __init__(self, messages: List[Tuple[int, bytes]]):
+        self.messages = messages
+        self.since_uid = None
+        self.criteria = "UNSEEN"
+
+    def iter_messages(self):
+        for uid, raw in self.messages:
+            if self.since_uid is None or uid > self.since_uid:
+                yield str(uid), raw
+
+    def close(self):
+        pass
+
+
+def reply(sender: str, message_id: str, **headers) -> bytes:
+    lines = {
+        "Message-ID": message_id,
+        "From": sender,
+        "In-Reply-To": SENT_ID,
+        "Date": format_datetime(datetime(2025, 6, 2, 9, 30)),
+        **{name.replace("_", "-"): value for name, value in headers.items()}
+    }
+    return "".join(f"{name}: {value}\r\n" for name, value in lines.items()).encode() + b"\r\n"
+
+
+@pytest.fixture
+def lead(mongo):
+    doc = {
+        "id": str(uuid.uuid4()),
+        "user_id": "user-1",
+        "campaign_id": "campaign-1",
+        "email": "Reader@Example.test",
+        "interaction_type": "sent",
+        "status": "cold",
+        "message_id": SENT_ID,
+        "created_at": datetime(2025, 6, 1)
+    }
+    mongo.run(mongo.db.leads.insert_one(dict(doc)))
+    mongo.run(mongo.db.campaigns.insert_one({"id": "campaign-1", "user_id": "user-1", "performance": {}}))
+    return doc
+
+
+def stored(mongo, lead):
+    return mongo.run(mongo.db.leads.find_one({"id": lead["id"]}))
+
+
+def test_only_replies_from_the_lead_count(mongo, lead):
+    source = FakeSource([
+        (1, reply("Colleague <colleague@example.test>", "<r1@example.test>")),
+        (2, reply("Out of office <reader@example.test>", "<r2@example.test>", Auto_Submitted="auto-replied")),
+        (3, reply("reader@example.test", "<r3@example.test>", Precedence="bulk")),
+        (4, reply("Reader <READER@example.test>", "<r4@example.test>", Auto_Submitted="no"))
+    ])
+
+    stats = mongo.run(ReplySyncService(database=mongo.db).sync(source))
+
+    assert stats["messages"] == 4 and stats["automated"] == 2
+    assert stats["replies"] == 1 and stats["leads_updated"] == 1
+    updated = stored(mongo, lead)
+    assert updated["interaction_type"] == "replied"
+    assert updated["reply_count"] == 1
+    assert updated["reply_ids"] == ["<r4@example.test>"]
+
+
+def test_unmatched_sender_leaves_the_lead_alone(mongo, lead):
+    source = FakeSource([(1, reply("someone@else.test", "<r1@example.test>"))])
+
+    stats = mongo.run(ReplySyncService(database=mongo.db).sync(source))
+
+    assert stats["replies"] == 0
+    assert stored(mongo, lead)["interaction_type"] == "sent"
+    assert mongo.run(mongo.db.mailbox_sync_state.find_one({}))["last_uid"] == 1
+
+
+def test_replayed_batch_is_not_counted_twice(mongo, lead):
+    messages = [(1, reply("reader@example.test", "<r1@example.test>")), (2, reply("reader@example.test", "<r2@example.test>"))]
+    service = ReplySyncService(database=mongo.db)
+    mongo.run(service.sync(FakeSource(messages)))
+
+    # A crash after the lead writes but before the high-water mark was saved re-reads the same messages
+    mongo.run(mongo.db.mailbox_sync_state.delete_many({}))
+    stats = mongo.run(service.sync(FakeSource(messages + [(3, reply("reader@example.test", "<r3@example.test>"))])))
+
+    assert stats["replies"] == 1
+    updated = stored(mongo, lead)
+    assert updated["reply_count"] == 3
+    assert updated["reply_ids"] == ["<r1@example.test>", "<r2@example.test>", "<r3@example.test>"]
+    campaign = mongo.run(mongo.db.campaigns.find_one({"id": "campaign-1"}))
+    assert campaign["performance"]["reply_count"] == 1
@@ -0,0 +1,160 @@
+# tests/test_stats_service.py - Dashboard figures from the $facet/$group aggregations
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import config.database as database_module
+from services.stats_service import StatsService
+
+USER_ID = "user-1"
+
+
+def campaign(minutes_ago: int, status: str, campaign_type=None, performance=None, user_id: str = USER_ID) -> dict:
+    doc = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "title": f"Campaign {minutes_ago}",
+        "content": "Fixture content",
+        "status": status,
+        "created_at": datetime(2025, 6, 1) - timedelta(minutes=minutes_ago)
+    }
+    if campaign_type is not None:
+        doc["campaign_type"] = campaign_type
+    if performance is not None:
+        doc["performance"] = performance
+    return doc
+
+
+def lead(status=None, user_id: str = USER_ID) -> dict:
+    doc = {"id": str(uuid.uuid4()), "user_id": user_id, "email": f"{uuid.uuid4().hex[:8]}@example.test"}
+    if status is not None:
+        doc["status"] = status
+    return doc
+
+
+@pytest.fixture
+def seeded(mongo):
+    campaigns = [
+        campaign(1, "sent", "email", {"sent_count": 120}),
+        campaign(2, "sent", "email", {"sent_count": 30, "open_count": 12}),
+        campaign(3, "sent", "social_media", {}),  # sent without a count
+        campaign(4, "sent", "direct_message"),  # no performance at all
+        campaign(5, "draft", "email", {"sent_count": 999}),  # only sent campaigns count towards total_sent
+        campaign(6, "scheduled", "social_media"),
+        campaign(7, "draft"),  # no type
+        campaign(8, "sent", "email", {"sent_count": 5000}, user_id="other")
+    ]
+    leads = (
+        [lead("cold") for _ in range(4)] + [lead("warm") for _ in range(3)] + [lead("hot")]
+        + [lead(), lead("unsubscribed")]  # counted in the total, not in leads_by_status
+        + [lead("hot", user_id="other") for _ in range(5)]
+    )
+    mongo.run(mongo.db.campaigns.insert_many(campaigns))
+    mongo.run(mongo.db.leads.insert_many(leads))
+    return StatsService(mongo.db)
+
+
+async def per_metric_dashboard(database, user_id: str) -> dict:
+    """The figures as the dashboard used to compute them, one query per metric"""
+    sent_campaigns = await database.campaigns.find({"user_id": user_id, "status": "sent"}).to_list(None)
+    return {
+        "campaigns_count": await database.campaigns.count_documents({"user_id": user_id}),
+        "leads_count": await database.leads.count_documents({"user_id": user_id}),
+        "total_sent": sum(campaign.get("performance", {}).get("sent_count", 0) for campaign in sent_campaigns),
+        "leads_by_status": {
+            status: await database.leads.count_documents({"user_id": user_id, "status": status})
+            for status in ("cold", "warm", "hot")
+        }
+    }
+
+
+async def per_metric_campaign_stats(database, user_id: str) -> dict:
+    sent_campaigns = await database.campaigns.find({"user_id": user_id, "status": "sent"}).to_list(None)
+    return {
+        "total_campaigns": await database.campaigns.count_documents({"user_id": user_id}),
+        "draft_campaigns": await database.campaigns.count_documents({"user_id": user_id, "status": "draft"}),
+        "sent_campaigns": await database.campaigns.count_documents({"user_id": user_id, "status": "sent"}),
+        "total_emails_sent": sum(campaign.get("performance", {}).get("sent_count", 0) for campaign in sent_campaigns),
+        "campaigns_by_type": {
+            campaign_type: await database.campaigns.count_documents({"user_id": user_id, "campaign_type": campaign_type})
+            for campaign_type in ("email", "social_media", "direct_message")
+        }
+    }
+
+
+def test_dashboard_matches_per_metric_queries(mongo, seeded):
+    dashboard = mongo.run(seeded.get_dashboard(USER_ID))
+    expected = mongo.run(per_metric_dashboard(mongo.db, USER_ID))
+
+    assert {key: dashboard[key] for key in expected} == expected
+    assert expected == {
+        "campaigns_count": 7,
+        "leads_count": 10,
+        "total_sent": 150,
+        "leads_by_status": {"cold": 4, "warm": 3, "hot": 1}
+    }
+
+    newest = mongo.run(
+        mongo.db.campaigns.find({"user_id": USER_ID}).sort("created_at", -1).limit(StatsService.RECENT_CAMPAIGNS).to_list(None)
+    )
+    assert [doc["id"] for doc in dashboard["recent_campaigns"]] == [doc["id"] for doc in newest]
+
+
+def test_campaign_stats_match_per_metric_queries(mongo, seeded):
+    stats = mongo.run(seeded.get_campaign_stats(USER_ID))
+    expected = mongo.run(per_metric_campaign_stats(mongo.db, USER_ID))
+
+    assert stats["total_campaigns"] == expected["total_campaigns"]
+    assert stats["campaigns_by_status"].get("draft", 0) == expected["draft_campaigns"]
+    assert stats["campaigns_by_status"].get("sent", 0) == expected["sent_campaigns"]
+    assert stats["total_emails_sent"] == expected["total_emails_sent"]
+    assert stats["campaigns_by_type"] == expected["campaigns_by_type"]
+
+
+def test_rebuild_reports_no_drift_for_fresh_counters(mongo, seeded):
+    mongo.run(seeded.get_user_stats(USER_ID))
+
+    assert mongo.run(seeded.rebuild_user_stats(USER_ID)) == []
+
+
+def test_user_without_data_gets_zeroes(mongo, seeded):
+    dashboard = mongo.run(seeded.get_dashboard("nobody"))
+
+    assert dashboard == {
+        "campaigns_count": 0,
+        "leads_count": 0,
+        "total_sent": 0,
+        "leads_by_status": {"cold": 0, "warm": 0, "hot": 0},
+        "recent_campaigns": []
+    }
+
+
+def test_lead_aggregation_is_covered_by_the_status_index(mongo, seeded, monkeypatch):
+    # create_indexes works on the configured database
+    monkeypatch.setattr(database_module, "db", mongo.db)
+    mongo.run(database_module.create_indexes())
+    explain = mongo.run(mongo.db.command(
+        "explain",
+        {"aggregate": "leads", "pipeline": StatsService.lead_pipeline(USER_ID), "cursor": {}},
+        verbosity="queryPlanner"
+    ))
+
+    # Older servers nest the find plan under a $cursor stage; newer ones push the whole pipeline down
+    stages = explain.get("stages") or [{"$cursor": explain}]
+    cursor_stage = stages[0].get("$cursor", explain)
+    planned = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            if "stage" in node:
+                planned.append(node["stage"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(cursor_stage["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in planned
+    assert "FETCH" not in planned and "COLLSCAN" not in planned
@@ -0,0 +1,54 @@
+# tests/test_upload_limit.py - Multipart size limit enforced before the body is spooled
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from utils.upload_limit import UploadLimitMiddleware
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_size=1024)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    @app.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    return TestClient(app)
+
+
+def test_upload_under_the_limit_passes(client):
+    response = client.post("/upload", files={"file": ("list.csv", b"x" * 500)})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 500}
+
+
+def test_declared_length_over_the_limit_is_refused(client):
+    response = client.post("/upload", files={"file": ("list.csv", b"x" * 4096)})
+
+    assert response.status_code == 413
+
+
+def test_streamed_body_over_the_limit_is_cut_off(client):
+    # No Content-Length: the bytes are counted as they arrive
+    def body():
+        yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"list.csv\"\r\n\r\n"
+        for _ in range(8):
+            yield b"x" * 512
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=body(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+
+    assert response.status_code == 413
+
+
+def test_other_bodies_are_not_limited(client):
+    response = client.post("/echo", json={"notes": "x" * 4096})
+
+    assert response.status_code == 200